@@ -2,7 +2,7 @@
 
 import asyncio
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from logging import getLogger
 from typing import Any
 
@@ -15,19 +15,18 @@ from custom_components.hubitat.services import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ACCESS_TOKEN, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Event, HomeAssistant
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
 
 from .const import DOMAIN, H_CONF_HUB_ID, H_CONF_HUBITAT_EVENT, PLATFORMS
 from .hub import Hub, get_domain_data, get_hub
+from .hubitatmaker import ConnectionError as HubitatConnectionError
+from .hubitatmaker import RequestError as HubitatRequestError
 
 _LOGGER = getLogger(__name__)
 
 # Time to attempt initial hub connection during startup
 STARTUP_CONNECT_TIMEOUT = 60  # seconds
 
-# Interval for retrying hub connection after startup failure
-RETRY_CONNECT_INTERVAL = timedelta(seconds=90)
-
 CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 
 
@@ -76,62 +75,95 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     # if the connection attempt times out
     hub = await Hub.create_offline(hass, config_entry, len(domain_data) + 1)
 
-    try:
-        # Try to connect with timeout
-        await asyncio.wait_for(hub.async_connect(), timeout=STARTUP_CONNECT_TIMEOUT)
-
-        hub.async_update_device_registry()
-
-        _LOGGER.info("Successfully connected to Hubitat hub")
-
-    except (asyncio.TimeoutError, ConnectionError) as e:
-        _LOGGER.warning(
-            "Unable to connect to Hubitat hub during startup (will retry): %s", e
-        )
-
-        # Schedule periodic connection attempts
-        async def retry_connection(_now: datetime | None = None) -> None:
-            """Attempt to reconnect to the hub."""
-            if not hub.is_connected:
-                _LOGGER.debug("Attempting to reconnect to Hubitat hub...")
-                try:
-                    await asyncio.wait_for(
-                        hub.async_connect(), timeout=STARTUP_CONNECT_TIMEOUT
+    # Schedule connection attempts, backing off while the hub keeps failing
+    async def retry_connection(_now: datetime | None = None) -> None:
+        """Attempt to reconnect to the hub."""
+        if not hub.is_connected:
+            _LOGGER.debug("Attempting to reconnect to Hubitat hub...")
+            try:
+                await asyncio.wait_for(
+                    hub.async_connect(), timeout=STARTUP_CONNECT_TIMEOUT
+                )
+                _LOGGER.info("Successfully reconnected to Hubitat hub")
+                hub.async_update_device_registry()
+
+                # Cancel the retry task now that we're connected
+                hub.cancel_retry_task()
+
+                # Fire ready event now that we're connected
+                hass.bus.fire(H_CONF_HUBITAT_EVENT, {"name": "ready"})
+
+                # Update hub state
+                if re.match(r"Hubitat \(\w{2}(:\w{2}){5}\)", config_entry.title):
+                    _ = hass.config_entries.async_update_entry(
+                        config_entry, title=f"Hubitat ({hub.id})"
                     )
-                    _LOGGER.info("Successfully reconnected to Hubitat hub")
-                    hub.async_update_device_registry()
-
-                    # Cancel the retry task now that we're connected
-                    hub.cancel_retry_task()
 
-                    # Fire ready event now that we're connected
-                    hass.bus.fire(H_CONF_HUBITAT_EVENT, {"name": "ready"})
-
-                    # Update hub state
-                    if re.match(r"Hubitat \(\w{2}(:\w{2}){5}\)", config_entry.title):
-                        _ = hass.config_entries.async_update_entry(
-                            config_entry, title=f"Hubitat ({hub.id})"
-                        )
+                hass.states.async_set(
+                    hub.entity_id,
+                    "connected",
+                    hub.get_state_attributes(),
+                )
+            except (
+                asyncio.TimeoutError,
+                ConnectionError,
+                HubitatConnectionError,
+                HubitatRequestError,
+            ) as e:
+                _LOGGER.debug(
+                    "Reconnection attempt failed (retrying in %.1fs): %s",
+                    hub.reconnect_delay,
+                    e,
+                )
+                retry_later()
+            except Exception:
+                # Any failure must schedule another attempt, or reconnection
+                # would stop for good
+                _LOGGER.exception(
+                    "Unexpected error reconnecting to Hubitat hub (retrying in %.1fs)",
+                    hub.reconnect_delay,
+                )
+                retry_later()
+
+    def retry_later() -> None:
+        hass.states.async_set(
+            hub.entity_id,
+            "unavailable",
+            hub.get_state_attributes(),
+        )
+        schedule_retry(hub.reconnect_delay)
 
-                    hass.states.async_set(
-                        hub.entity_id,
-                        "connected",
-                        hub.get_state_attributes(),
-                    )
-                except (asyncio.TimeoutError, ConnectionError) as e:
-                    _LOGGER.debug("Reconnection attempt failed: %s", e)
-                    hass.states.async_set(
-                        hub.entity_id,
-                        "unavailable",
-                        hub.get_state_attributes(),
-                    )
+    def schedule_retry(delay: float) -> None:
+        hub.set_retry_task_unsub(async_call_later(hass, delay, retry_connection))
 
-        # Retry immediately once, then periodically
+    def schedule_retries() -> None:
+        # Retry immediately once, then as the hub's circuit allows
         _ = hass.async_create_task(retry_connection())
-        unsub = async_track_time_interval(
-            hass, retry_connection, RETRY_CONNECT_INTERVAL
-        )
-        hub.set_retry_task_unsub(unsub)
+
+    if await hub.async_setup_from_cache():
+        # Entities were created from cached device data, so connect in the
+        # background rather than blocking startup on the hub
+        _LOGGER.info("Loaded Hubitat devices from cache; connecting in background")
+        schedule_retries()
+    else:
+        try:
+            # Try to connect with timeout
+            await asyncio.wait_for(hub.async_connect(), timeout=STARTUP_CONNECT_TIMEOUT)
+
+            hub.async_update_device_registry()
+
+            _LOGGER.info("Successfully connected to Hubitat hub")
+
+        except (
+            asyncio.TimeoutError,
+            ConnectionError,
+            HubitatConnectionError,
+            HubitatRequestError,
+        ) as e:
+            _LOGGER.warning(
+                "Unable to connect to Hubitat hub during startup (will retry): %s", e
+            )
+            schedule_retries()
 
     async_register_services(hass, config_entry)
 
@@ -172,7 +204,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
     hub = get_hub(hass, config_entry.entry_id)
 
-    hub.stop()
+    await hub.async_stop()
     _LOGGER.debug(f"Stopped event server for {config_entry.entry_id}")
 
     await hub.unload()
@@ -87,9 +87,9 @@ class HubitatSecurityKeypad(AlarmControlPanelEntity, HubitatEntity):
             AlarmControlPanelEntityFeature.ARM_AWAY
             | AlarmControlPanelEntityFeature.ARM_HOME
         )
-        if DeviceCommand.ARM_NIGHT in self._device.commands:
+        if DeviceCommand.ARM_NIGHT in self._device.command_set:
             self._attr_supported_features |= AlarmControlPanelEntityFeature.ARM_NIGHT
-        if DeviceCapability.ALARM in self._device.capabilities:
+        if DeviceCapability.ALARM in self._device.capability_set:
             self._attr_supported_features |= AlarmControlPanelEntityFeature.TRIGGER
 
         self.load_state()
@@ -218,7 +218,7 @@ def is_security_keypad(
     device: Device, _overrides: dict[str, str] | None = None
 ) -> bool:
     """Return True if device looks like a security keypad."""
-    return DeviceCapability.SECURITY_KEYPAD in device.capabilities
+    return DeviceCapability.SECURITY_KEYPAD in device.capability_set
 
 
 async def async_setup_entry(
@@ -234,6 +234,7 @@ async def async_setup_entry(
         "alarm_control_panel",
         HubitatSecurityKeypad,
         is_security_keypad,
+        capabilities=(DeviceCapability.SECURITY_KEYPAD,),
     )
 
 
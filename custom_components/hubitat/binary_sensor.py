@@ -284,6 +284,7 @@ async def async_setup_entry(
             "binary_sensor",
             attr[1],
             is_sensor,
+            attribute=attr[0],
         )
 
 
@@ -1,5 +1,7 @@
 """Support for Hubitat thermostats."""
 
+import asyncio
+from collections.abc import Coroutine
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any, Unpack, cast, override
 
@@ -241,21 +243,39 @@ class HubitatThermostat(ClimateEntity, HubitatEntity):
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new target fan mode."""
         if fan_mode == FAN_ON:
-            await self.send_command(DeviceCommand.FAN_ON)
+            await self.send_command(
+                DeviceCommand.FAN_ON,
+                expected={DeviceAttribute.FAN_MODE: ClimateFanMode.ON},
+            )
         elif fan_mode == FAN_AUTO:
-            await self.send_command(DeviceCommand.FAN_AUTO)
+            await self.send_command(
+                DeviceCommand.FAN_AUTO,
+                expected={DeviceAttribute.FAN_MODE: ClimateFanMode.AUTO},
+            )
 
     @override
     async def async_set_hvac_mode(self, hvac_mode: str) -> None:
         """Set new target hvac mode."""
         if hvac_mode == HVACMode.COOL:
-            await self.send_command(DeviceCommand.COOL)
+            await self.send_command(
+                DeviceCommand.COOL,
+                expected={DeviceAttribute.THERMOSTAT_MODE: ClimateMode.COOL},
+            )
         elif hvac_mode == HVACMode.HEAT:
-            await self.send_command(DeviceCommand.HEAT)
+            await self.send_command(
+                DeviceCommand.HEAT,
+                expected={DeviceAttribute.THERMOSTAT_MODE: ClimateMode.HEAT},
+            )
         elif hvac_mode == HVACMode.HEAT_COOL or hvac_mode == HVACMode.AUTO:
-            await self.send_command(DeviceCommand.AUTO)
+            await self.send_command(
+                DeviceCommand.AUTO,
+                expected={DeviceAttribute.THERMOSTAT_MODE: ClimateMode.AUTO},
+            )
         elif hvac_mode == HVACMode.OFF:
-            await self.send_command(DeviceCommand.OFF)
+            await self.send_command(
+                DeviceCommand.OFF,
+                expected={DeviceAttribute.THERMOSTAT_MODE: ClimateMode.OFF},
+            )
 
     @override
     async def async_set_preset_mode(self, preset_mode: str) -> None:
@@ -267,8 +287,12 @@ class HubitatThermostat(ClimateEntity, HubitatEntity):
         if preset_mode == PRESET_ECO:
             await self.send_command(DeviceCommand.ECO)
         if preset_mode == PRESET_AWAY_AND_ECO:
-            await self.send_command(DeviceCommand.AWAY)
-            await self.send_command(DeviceCommand.ECO)
+            # The hub sends a device's commands in order, so both can be
+            # queued at once
+            _ = await asyncio.gather(
+                self.send_command(DeviceCommand.AWAY),
+                self.send_command(DeviceCommand.ECO),
+            )
 
     @override
     async def async_set_temperature(self, **kwargs: Any) -> None:  # pyright: ignore[reportAny]
@@ -276,17 +300,39 @@ class HubitatThermostat(ClimateEntity, HubitatEntity):
         if self.hvac_mode == HVACMode.HEAT_COOL or self.hvac_mode == HVACMode.AUTO:
             temp_low = cast(float | None, kwargs.get(ATTR_TARGET_TEMP_LOW))
             temp_high = cast(float | None, kwargs.get(ATTR_TARGET_TEMP_HIGH))
+            commands: list[Coroutine[Any, Any, None]] = []
             if temp_low is not None:
-                await self.send_command(DeviceCommand.SET_HEATING_SETPOINT, temp_low)
+                commands.append(
+                    self.send_command(
+                        DeviceCommand.SET_HEATING_SETPOINT,
+                        temp_low,
+                        expected={DeviceAttribute.HEATING_SETPOINT: temp_low},
+                    )
+                )
             if temp_high is not None:
-                await self.send_command(DeviceCommand.SET_COOLING_SETPOINT, temp_high)
+                commands.append(
+                    self.send_command(
+                        DeviceCommand.SET_COOLING_SETPOINT,
+                        temp_high,
+                        expected={DeviceAttribute.COOLING_SETPOINT: temp_high},
+                    )
+                )
+            _ = await asyncio.gather(*commands)
         else:
             temp = cast(float | None, kwargs.get(ATTR_TEMPERATURE))
             if temp is not None:
                 if self.hvac_mode == HVACMode.COOL:
-                    await self.send_command(DeviceCommand.SET_COOLING_SETPOINT, temp)
+                    await self.send_command(
+                        DeviceCommand.SET_COOLING_SETPOINT,
+                        temp,
+                        expected={DeviceAttribute.COOLING_SETPOINT: temp},
+                    )
                 elif self.hvac_mode == HVACMode.HEAT:
-                    await self.send_command(DeviceCommand.SET_HEATING_SETPOINT, temp)
+                    await self.send_command(
+                        DeviceCommand.SET_HEATING_SETPOINT,
+                        temp,
+                        expected={DeviceAttribute.HEATING_SETPOINT: temp},
+                    )
 
     @override
     async def async_turn_off(self, **kwargs: Any) -> None:  # pyright: ignore[reportAny]
@@ -296,7 +342,7 @@ class HubitatThermostat(ClimateEntity, HubitatEntity):
 
 def is_thermostat(device: Device, _overrides: dict[str, str] | None = None) -> bool:
     """Return True if device looks like a thermostat."""
-    return DeviceCapability.THERMOSTAT in device.capabilities
+    return DeviceCapability.THERMOSTAT in device.capability_set
 
 
 async def async_setup_entry(
@@ -312,6 +358,7 @@ async def async_setup_entry(
         "climate",
         HubitatThermostat,
         is_thermostat,
+        capabilities=(DeviceCapability.THERMOSTAT,),
     )
 
 
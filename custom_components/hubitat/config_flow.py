@@ -32,7 +32,11 @@ from .const import (
     H_CONF_DEVICE_LIST,
     H_CONF_DEVICE_TYPE_OVERRIDES,
     H_CONF_DEVICES,
+    H_CONF_EVENT_BATCH_WINDOW,
     H_CONF_HUB_ID,
+    H_CONF_LOAD_CONCURRENCY,
+    H_CONF_OPTIMISTIC,
+    H_CONF_SERVER_MODE,
     H_CONF_SERVER_PORT,
     H_CONF_SERVER_SSL_CERT,
     H_CONF_SERVER_SSL_KEY,
@@ -42,8 +46,10 @@ from .const import (
     TEMP_F,
     ConfigStep,
     Platform,
+    ServerMode,
 )
 from .hubitatmaker import (
+    DEFAULT_LOAD_CONCURRENCY,
     ConnectionError,
     Hub as HubitatHub,
     InvalidConfig,
@@ -62,12 +68,22 @@ CONFIG_SCHEMA = vol.Schema(
         vol.Required(CONF_HOST): str,
         vol.Required(H_CONF_APP_ID): str,
         vol.Required(CONF_ACCESS_TOKEN): str,
+        vol.Optional(H_CONF_SERVER_MODE, default=ServerMode.THREAD): vol.In(
+            [m.value for m in ServerMode]
+        ),
         vol.Optional(H_CONF_SERVER_URL): str,
         vol.Optional(H_CONF_SERVER_PORT): int,
         vol.Optional(H_CONF_SERVER_SSL_CERT): str,
         vol.Optional(H_CONF_SERVER_SSL_KEY): str,
         vol.Optional(CONF_TEMPERATURE_UNIT, default=TEMP_F): vol.In([TEMP_F, TEMP_C]),
         vol.Optional(H_CONF_SYNC_AREAS, default=False): bool,
+        vol.Optional(
+            H_CONF_LOAD_CONCURRENCY, default=DEFAULT_LOAD_CONCURRENCY
+        ): vol.All(int, vol.Range(min=1, max=8)),
+        vol.Optional(H_CONF_EVENT_BATCH_WINDOW, default=0): vol.All(
+            int, vol.Range(min=0, max=1000)
+        ),
+        vol.Optional(H_CONF_OPTIMISTIC, default=False): bool,
     }
 )
 
@@ -191,17 +207,24 @@ class HubitatOptionsFlow(OptionsFlowWithConfigEntry):
                     CONF_HOST: user_input[CONF_HOST],
                     H_CONF_APP_ID: app_id,
                     CONF_ACCESS_TOKEN: access_token,
+                    H_CONF_SERVER_MODE: user_input.get(H_CONF_SERVER_MODE),
                     H_CONF_SERVER_PORT: user_input.get(H_CONF_SERVER_PORT),
                     H_CONF_SERVER_URL: user_input.get(H_CONF_SERVER_URL),
                     H_CONF_SERVER_SSL_CERT: user_input.get(H_CONF_SERVER_SSL_CERT),
                     H_CONF_SERVER_SSL_KEY: user_input.get(H_CONF_SERVER_SSL_KEY),
                     H_CONF_SYNC_AREAS: user_input.get(H_CONF_SYNC_AREAS),
+                    H_CONF_LOAD_CONCURRENCY: user_input.get(H_CONF_LOAD_CONCURRENCY),
+                    H_CONF_EVENT_BATCH_WINDOW: user_input.get(
+                        H_CONF_EVENT_BATCH_WINDOW
+                    ),
+                    H_CONF_OPTIMISTIC: user_input.get(H_CONF_OPTIMISTIC),
                 }
 
                 info = await _validate_input(check_input)
                 self.hub = info["hub"]
 
                 self.options[CONF_HOST] = user_input[CONF_HOST]
+                self.options[H_CONF_SERVER_MODE] = user_input.get(H_CONF_SERVER_MODE)
                 self.options[H_CONF_SERVER_PORT] = user_input.get(H_CONF_SERVER_PORT)
                 self.options[H_CONF_SERVER_URL] = user_input.get(H_CONF_SERVER_URL)
                 self.options[H_CONF_SERVER_SSL_CERT] = user_input.get(
@@ -212,6 +235,13 @@ class HubitatOptionsFlow(OptionsFlowWithConfigEntry):
                 )
                 self.options[CONF_TEMPERATURE_UNIT] = user_input[CONF_TEMPERATURE_UNIT]
                 self.options[H_CONF_SYNC_AREAS] = user_input.get(H_CONF_SYNC_AREAS)
+                self.options[H_CONF_LOAD_CONCURRENCY] = user_input.get(
+                    H_CONF_LOAD_CONCURRENCY
+                )
+                self.options[H_CONF_EVENT_BATCH_WINDOW] = user_input.get(
+                    H_CONF_EVENT_BATCH_WINDOW
+                )
+                self.options[H_CONF_OPTIMISTIC] = user_input.get(H_CONF_OPTIMISTIC)
 
                 # Track if connection values changed (to update entry.data later)
                 if user_input.get(H_CONF_APP_ID):
@@ -274,6 +304,14 @@ class HubitatOptionsFlow(OptionsFlowWithConfigEntry):
                             or ""
                         },
                     ): str,
+                    vol.Optional(
+                        H_CONF_SERVER_MODE,
+                        default=entry.options.get(
+                            H_CONF_SERVER_MODE,
+                            entry.data.get(H_CONF_SERVER_MODE),
+                        )
+                        or ServerMode.THREAD,
+                    ): vol.In([m.value for m in ServerMode]),
                     vol.Optional(
                         H_CONF_SERVER_URL,
                         description={
@@ -330,6 +368,30 @@ class HubitatOptionsFlow(OptionsFlowWithConfigEntry):
                         )
                         or False,
                     ): bool,
+                    vol.Optional(
+                        H_CONF_LOAD_CONCURRENCY,
+                        default=entry.options.get(
+                            H_CONF_LOAD_CONCURRENCY,
+                            entry.data.get(H_CONF_LOAD_CONCURRENCY),
+                        )
+                        or DEFAULT_LOAD_CONCURRENCY,
+                    ): vol.All(int, vol.Range(min=1, max=8)),
+                    vol.Optional(
+                        H_CONF_EVENT_BATCH_WINDOW,
+                        default=entry.options.get(
+                            H_CONF_EVENT_BATCH_WINDOW,
+                            entry.data.get(H_CONF_EVENT_BATCH_WINDOW),
+                        )
+                        or 0,
+                    ): vol.All(int, vol.Range(min=0, max=1000)),
+                    vol.Optional(
+                        H_CONF_OPTIMISTIC,
+                        default=entry.options.get(
+                            H_CONF_OPTIMISTIC,
+                            entry.data.get(H_CONF_OPTIMISTIC),
+                        )
+                        or False,
+                    ): bool,
                 }
             ),
             errors=form_errors,
@@ -427,6 +489,9 @@ class HubitatOptionsFlow(OptionsFlowWithConfigEntry):
                 self.hass.config_entries.async_update_entry(entry, data=new_data)
                 _LOGGER.debug("Updated entry.data with new connection values")
 
+            if self.hub:
+                self.hub.stop()
+
             _LOGGER.debug("Creating entry")
             return self.async_create_entry(title="", data=self.options)
 
@@ -545,11 +610,24 @@ async def _validate_input(user_input: dict[str, Any]) -> ValidatedInput:
     token = cast(str, user_input[CONF_ACCESS_TOKEN])
     port: int | None = user_input.get(H_CONF_SERVER_PORT)
     event_url: str | None = user_input.get(H_CONF_SERVER_URL)
+    load_concurrency: int | None = user_input.get(H_CONF_LOAD_CONCURRENCY)
 
     if event_url:
         event_url = cv.url(event_url)
 
-    hub = HubitatHub(host, app_id, token, port=port, event_url=event_url)
-    await hub.check_config()
+    hub = HubitatHub(
+        host,
+        app_id,
+        token,
+        port=port,
+        event_url=event_url,
+        load_concurrency=load_concurrency or DEFAULT_LOAD_CONCURRENCY,
+    )
+    try:
+        await hub.check_config()
+    finally:
+        # The validation hub only needs its Maker API session for this check;
+        # a flow that uses the hub again will open a new one
+        hub.stop()
 
     return {"label": f"Hubitat ({get_hub_short_id(hub)})", "hub": hub}
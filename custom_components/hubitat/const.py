@@ -54,12 +54,16 @@ H_CONF_HUB = "hub"
 H_CONF_HUBITAT_EVENT = "hubitat_event"
 H_CONF_DEVICE_LIST = "device_list"
 H_CONF_DEVICE_TYPE_OVERRIDES = "device_type_overrides"
+H_CONF_SERVER_MODE = "server_mode"
 H_CONF_SERVER_PORT = "server_port"
 H_CONF_SERVER_URL = "server_url"
 H_CONF_SERVER_SSL_CERT = "server_ssl_cert"
 H_CONF_SERVER_SSL_KEY = "server_ssl_key"
 H_CONF_SYNC_AREAS = "sync_areas"
 H_CONF_HUB_ID = "hub_id"
+H_CONF_LOAD_CONCURRENCY = "load_concurrency"
+H_CONF_OPTIMISTIC = "optimistic"
+H_CONF_EVENT_BATCH_WINDOW = "event_batch_window"
 H_CONF_BUTTON = "button"
 H_CONF_DOUBLE_TAPPED = "double_tapped"
 H_CONF_HELD = "held"
@@ -74,6 +78,17 @@ class DeviceType(StrEnum):
     HUB_HSM_STATUS = "hub_hsm_status"
 
 
+class ServerMode(StrEnum):
+    """Ways of receiving events from the hub."""
+
+    # The event server runs in its own thread
+    THREAD = "thread"
+    # The event server runs on Home Assistant's event loop
+    LOOP = "loop"
+    # Events are posted to a Home Assistant webhook
+    WEBHOOK = "webhook"
+
+
 ICON_ALARM = "mdi:alarm-bell"
 
 Platform = Literal[
@@ -206,29 +206,35 @@ async def async_setup_entry(
             return _is_cover_type(device, cap[0])
 
         _ = create_and_add_entities(
-            hass, entry, async_add_entities, "cover", cap[1], is_cover
+            hass,
+            entry,
+            async_add_entities,
+            "cover",
+            cap[1],
+            is_cover,
+            capabilities=(cap[0],),
         )
 
 
 def is_cover(dev: Device, _overrides: dict[str, str] | None = None) -> bool:
     return (
-        DeviceCapability.WINDOW_SHADE in dev.capabilities
-        or DeviceCapability.WINDOW_BLIND in dev.capabilities
-        or DeviceCapability.GARAGE_DOOR_CONTROL in dev.capabilities
-        or DeviceCapability.DOOR_CONTROL in dev.capabilities
+        DeviceCapability.WINDOW_SHADE in dev.capability_set
+        or DeviceCapability.WINDOW_BLIND in dev.capability_set
+        or DeviceCapability.GARAGE_DOOR_CONTROL in dev.capability_set
+        or DeviceCapability.DOOR_CONTROL in dev.capability_set
     )
 
 
 def _is_cover_type(dev: Device, cap: DeviceCapability) -> bool:
     cover_type: DeviceCapability | None = None
 
-    if DeviceCapability.WINDOW_SHADE in dev.capabilities:
+    if DeviceCapability.WINDOW_SHADE in dev.capability_set:
         cover_type = DeviceCapability.WINDOW_SHADE
-    elif DeviceCapability.WINDOW_BLIND in dev.capabilities:
+    elif DeviceCapability.WINDOW_BLIND in dev.capability_set:
         cover_type = DeviceCapability.WINDOW_BLIND
-    elif DeviceCapability.GARAGE_DOOR_CONTROL in dev.capabilities:
+    elif DeviceCapability.GARAGE_DOOR_CONTROL in dev.capability_set:
         cover_type = DeviceCapability.GARAGE_DOOR_CONTROL
-    elif DeviceCapability.DOOR_CONTROL in dev.capabilities:
+    elif DeviceCapability.DOOR_CONTROL in dev.capability_set:
         cover_type = DeviceCapability.DOOR_CONTROL
 
     if cover_type is None:
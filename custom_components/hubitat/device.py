@@ -1,6 +1,7 @@
 """Classes for managing Hubitat devices."""
 
 from abc import ABC
+from collections.abc import Mapping
 from datetime import datetime
 from functools import cached_property
 from logging import getLogger
@@ -57,46 +58,44 @@ class HubitatBase(Removable):
     @callback
     def get_attr(self, attr: DeviceAttribute) -> float | int | str | datetime | None:
         """Get the current value of an attribute."""
-        if attr in self._device.attributes:
-            return self._device.attributes[attr].value
-        return None
+        attribute = self._device.attributes.get(attr)
+        return attribute.value if attribute is not None else None
 
     @callback
     def get_attr_unit(self, attr: DeviceAttribute) -> str | None:
         """Get the unit of an attribute."""
-        if attr in self._device.attributes:
-            return self._device.attributes[attr].unit
-        return None
+        attribute = self._device.attributes.get(attr)
+        return attribute.unit if attribute is not None else None
 
     @callback
     def get_float_attr(self, attr: DeviceAttribute) -> float | None:
         """Get the current value of an attribute as a float."""
-        if attr in self._device.attributes:
-            return self._device.attributes[attr].float_value
+        attribute = self._device.attributes.get(attr)
+        return attribute.float_value if attribute is not None else None
 
     @callback
     def get_int_attr(self, attr: DeviceAttribute) -> int | None:
         """Get the current value of an attribute as an int."""
-        if attr in self._device.attributes:
-            return self._device.attributes[attr].int_value
+        attribute = self._device.attributes.get(attr)
+        return attribute.int_value if attribute is not None else None
 
     @callback
     def get_list_attr(self, attr: DeviceAttribute) -> list[Any] | None:
         """Get the current value of an attribute as a list."""
-        if attr in self._device.attributes:
-            return self._device.attributes[attr].list_value
+        attribute = self._device.attributes.get(attr)
+        return attribute.list_value if attribute is not None else None
 
     @callback
     def get_dict_attr(self, attr: DeviceAttribute) -> dict[str, Any] | None:
         """Get the current value of an attribute as a dict."""
-        if attr in self._device.attributes:
-            return self._device.attributes[attr].dict_value
+        attribute = self._device.attributes.get(attr)
+        return attribute.dict_value if attribute is not None else None
 
     @callback
     def get_str_attr(self, attr: DeviceAttribute) -> str | None:
         """Get the current value of an attribute as a string."""
-        if attr in self._device.attributes:
-            return self._device.attributes[attr].str_value
+        attribute = self._device.attributes.get(attr)
+        return attribute.str_value if attribute is not None else None
 
 
 class HubitatEntityArgs(TypedDict):
@@ -109,10 +108,13 @@ class HubitatEntity(HubitatBase, UpdateableEntity, ABC):
 
     hass: HomeAssistant
 
+    # If False, events that repeat an attribute's current value don't cause
+    # a state write
+    _write_unchanged: bool = False
+
     def __init__(
         self,
         device_class: str | None = None,
-        temp: bool = False,
         **kwargs: Unpack[HubitatEntityArgs],
     ):
         """
@@ -122,8 +124,6 @@ class HubitatEntity(HubitatBase, UpdateableEntity, ABC):
         ----------
         device_class : str | None
             The device class for this entity; default is None.
-        temp : bool
-            If true, this is a temporary entity; default is False
         """
         HubitatBase.__init__(self, **kwargs)
         UpdateableEntity.__init__(self)
@@ -134,13 +134,6 @@ class HubitatEntity(HubitatBase, UpdateableEntity, ABC):
         self._attr_device_info: device_registry.DeviceInfo | None = get_device_info(
             self._hub, self._device
         )
-        if not temp:
-            self._hub.add_device_listener(self._device.id, self.handle_event)
-            _LOGGER.debug(
-                "Added device listener for %s (%s)",
-                self._device.id,
-                self.__class__,
-            )
 
     def __del__(self):
         self._hub.remove_device_listener(self._device.id, self.handle_event)
@@ -155,6 +148,15 @@ class HubitatEntity(HubitatBase, UpdateableEntity, ABC):
     def device_attrs(self) -> tuple[DeviceAttribute, ...] | None:
         return None
 
+    @property
+    @override
+    def event_attrs(self) -> tuple[DeviceAttribute, ...] | None:
+        """Return the attributes whose events affect this entity's state.
+
+        If None, the entity is updated for every event from its device.
+        """
+        return self.device_attrs
+
     def async_schedule_update_ha_state(self): ...
 
     @cached_property
@@ -174,12 +176,22 @@ class HubitatEntity(HubitatBase, UpdateableEntity, ABC):
         """Fetch new data for this device."""
         await self._hub.refresh_device(self.device_id)
 
-    async def send_command(self, command: str, *args: float | str | None) -> None:
-        """Send a command to this device."""
+    async def send_command(
+        self,
+        command: str,
+        *args: float | str | None,
+        expected: Mapping[DeviceAttribute, str | float] | None = None,
+    ) -> None:
+        """Send a command to this device.
+
+        expected holds the attribute values the command should produce, which
+        are shown optimistically if the hub is configured to.
+        """
         arg = ",".join([str(a) for a in args]) if args else None
-        await self._hub.send_command(self.device_id, command, arg)
+        await self._hub.send_command(self.device_id, command, arg, expected)
         _LOGGER.debug("sent %s to %s", command, self.device_id)
 
+    @override
     def handle_event(self, event: Event) -> None:
         """
         Handle a device event.
@@ -188,9 +200,11 @@ class HubitatEntity(HubitatBase, UpdateableEntity, ABC):
         device and tell HA that the state has updated.
         """
         _LOGGER.debug(f"handling event for {self} ({self.name}, {self.__class__})")
+        if not event.changed and not self._write_unchanged:
+            return
         if self.enabled:
             self.load_state()
-            self.async_schedule_update_ha_state()
+            self._hub.async_schedule_state_write(self)
 
 
 class HubitatEventEmitter(HubitatBase):
@@ -215,16 +215,16 @@ def get_trigger_types(device: Device) -> list[str]:
     """Return the list of trigger types for a device."""
     types: list[str] = []
 
-    if DeviceCapability.DOUBLE_TAPABLE_BUTTON in device.capabilities:
+    if DeviceCapability.DOUBLE_TAPABLE_BUTTON in device.capability_set:
         types.append(H_CONF_DOUBLE_TAPPED)
 
-    if DeviceCapability.HOLDABLE_BUTTON in device.capabilities:
+    if DeviceCapability.HOLDABLE_BUTTON in device.capability_set:
         types.append(H_CONF_HELD)
 
-    if DeviceCapability.PUSHABLE_BUTTON in device.capabilities:
+    if DeviceCapability.PUSHABLE_BUTTON in device.capability_set:
         types.append(H_CONF_PUSHED)
 
-    if DeviceCapability.LOCK in device.capabilities:
+    if DeviceCapability.LOCK in device.capability_set:
         types.append(H_CONF_UNLOCKED_WITH_CODE)
 
     return types
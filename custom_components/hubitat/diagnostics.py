@@ -0,0 +1,36 @@
+"""Diagnostics support for Hubitat."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .hub import get_hub
+
+TO_REDACT = {CONF_ACCESS_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hub = get_hub(hass, entry.entry_id)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "hub": {
+            "connected": hub.is_connected,
+            "devices": len(hub.devices),
+            "entities": len(hub.entities),
+            "mode_supported": hub.mode_supported,
+            "hsm_supported": hub.hsm_supported,
+            "state_attributes": hub.get_state_attributes(),
+        },
+        "metrics": hub.metrics,
+        "event_queue": hub.event_stats,
+    }
@@ -1,7 +1,8 @@
+from collections.abc import Iterable
 from logging import getLogger
 from typing import Callable, TypeVar, cast
 
-from custom_components.hubitat.const import Platform
+from custom_components.hubitat.const import DOMAIN, Platform
 from custom_components.hubitat.util import get_device_overrides
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -25,16 +26,25 @@ def create_and_add_entities(
     platform: Platform,
     EntityClass: type[E],
     is_type: Callable[[Device, dict[str, str] | None], bool],
+    capabilities: Iterable[str] = (),
+    attribute: str | None = None,
 ) -> list[E]:
-    """Create entities and add them to the entity registry."""
+    """Create entities and add them to the entity registry.
+
+    If capabilities or an attribute are given, only devices with one of the
+    capabilities or the attribute, and devices with type overrides, are
+    checked with is_type.
+    """
     hub = get_hub(hass, config_entry.entry_id)
-    devices = hub.devices
     overrides = get_device_overrides(config_entry)
 
+    if capabilities or attribute is not None:
+        devices = hub.device_index.get_devices(capabilities, attribute, overrides)
+    else:
+        devices = list(hub.devices.values())
+
     # Devices that have this entity type
-    devices_with_entity = [
-        devices[id] for id in devices if is_type(devices[id], overrides)
-    ]
+    devices_with_entity = [d for d in devices if is_type(d, overrides)]
 
     entities: list[E] = [
         EntityClass(hub=hub, device=device) for device in devices_with_entity
@@ -44,26 +54,30 @@ def create_and_add_entities(
         hub.add_entities(entities)
         async_add_entities(cast(list[Entity], entities))
 
-    # Devices that have this entity type when not overridden
-    original_devices_with_entity = [
-        devices[id] for id in devices if is_type(devices[id], None)
+    # Devices that would have this entity type if they weren't overridden.
+    # Only devices with overrides can be classified differently without them.
+    has_entity = {d.id for d in devices_with_entity}
+    overridden_devices = [
+        d
+        for d in devices
+        if d.id in overrides and d.id not in has_entity and is_type(d, None)
     ]
 
     # Remove any existing entities that were overridden
     entity_unique_ids_to_remove = [
-        EntityClass(hub=hub, device=d, temp=True).unique_id
-        for d in original_devices_with_entity
-        if d not in devices_with_entity
+        EntityClass(hub=hub, device=d).unique_id for d in overridden_devices
     ]
 
     if len(entity_unique_ids_to_remove) > 0:
         _LOGGER.debug(f"Removing overridden {platform} entities...")
         ereg = entity_registry.async_get(hass)
-        entity_ids = {ereg.entities[id].unique_id: id for id in ereg.entities}
-        for unique_id in entity_ids:
-            if unique_id in entity_unique_ids_to_remove:
-                ereg.async_remove(entity_ids[unique_id])
-                _LOGGER.debug(f"Removed overridden entity {entity_ids[unique_id]}")
+        for unique_id in entity_unique_ids_to_remove:
+            if unique_id is None:
+                continue
+            entity_id = ereg.async_get_entity_id(platform, DOMAIN, unique_id)
+            if entity_id is not None:
+                ereg.async_remove(entity_id)
+                _LOGGER.debug(f"Removed overridden entity {entity_id}")
 
     return entities
 
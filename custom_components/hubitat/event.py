@@ -47,6 +47,12 @@ class HubitatButtonEventEntity(EventEntity, HubitatEntity):
     def load_state(self):
         pass
 
+    @property
+    @override
+    def event_attrs(self) -> tuple[DeviceAttribute, ...] | None:
+        """Return the attributes whose events affect this entity's state"""
+        return tuple(ATTR_EVENTS)
+
     @override
     def handle_event(self, event: Event) -> None:
         if not self.enabled:
@@ -62,7 +62,7 @@ class HubitatFan(FanEntity, HubitatEntity):
 
     def _get_is_on(self) -> bool:
         """Return true if the entity is on."""
-        if DeviceCapability.SWITCH in self._device.capabilities:
+        if DeviceCapability.SWITCH in self._device.capability_set:
             return self.get_str_attr(DeviceAttribute.SWITCH) == DeviceState.ON
         return self.get_str_attr(DeviceAttribute.SPEED) != DeviceState.OFF
 
@@ -117,6 +117,12 @@ class HubitatFan(FanEntity, HubitatEntity):
         """Return this entity's associated attributes"""
         return _device_attrs
 
+    @property
+    @override
+    def event_attrs(self) -> tuple[DeviceAttribute, ...] | None:
+        """Return the attributes whose events affect this entity's state"""
+        return (*_device_attrs, DeviceAttribute.SUPPORTED_FAN_SPEEDS)
+
     @property
     def speeds(self) -> list[str]:
         """Return the list of speeds for this fan."""
@@ -154,7 +160,7 @@ class HubitatFan(FanEntity, HubitatEntity):
             await self.send_command(DeviceCommand.SET_SPEED, preset_mode)
         elif percentage is not None:
             await self.async_set_percentage(percentage)
-        elif DeviceCapability.SWITCH in self._device.capabilities:
+        elif DeviceCapability.SWITCH in self._device.capability_set:
             await self.send_command(DeviceCommand.ON)
         else:
             await self.send_command(DeviceCommand.SET_SPEED, DeviceState.ON)
@@ -163,7 +169,7 @@ class HubitatFan(FanEntity, HubitatEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:  # pyright: ignore[reportAny]
         """Turn off the switch."""
         _LOGGER.debug("Turning off %s", self.name)
-        if DeviceCapability.SWITCH in self._device.capabilities:
+        if DeviceCapability.SWITCH in self._device.capability_set:
             await self.send_command(DeviceCommand.OFF)
         else:
             await self.send_command(DeviceCommand.SET_SPEED, DeviceState.OFF)
@@ -190,7 +196,7 @@ def is_fan(device: Device, overrides: dict[str, str] | None = None) -> bool:
     """Return True if device looks like a fan."""
     if overrides and device.id in overrides and overrides[device.id] != "fan":
         return False
-    return DeviceCapability.FAN_CONTROL in device.capabilities
+    return DeviceCapability.FAN_CONTROL in device.capability_set
 
 
 async def async_setup_entry(
@@ -200,7 +206,13 @@ async def async_setup_entry(
 ) -> None:
     """Initialize fan devices."""
     _ = create_and_add_entities(
-        hass, entry, async_add_entities, "fan", HubitatFan, is_fan
+        hass,
+        entry,
+        async_add_entities,
+        "fan",
+        HubitatFan,
+        is_fan,
+        capabilities=(DeviceCapability.FAN_CONTROL,),
     )
 
 
@@ -1,12 +1,19 @@
+import json
 import os
 import ssl
-from collections.abc import Mapping
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Set as AbstractSet
+from functools import partial
+from hashlib import sha256
 from logging import getLogger
 from ssl import SSLContext
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Callable, TypeVar, cast, override
 
+from aiohttp import ClientError, web
 from custom_components.hubitat.hubitatmaker.const import DeviceAttribute
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_HIDDEN,
@@ -16,9 +23,14 @@ from homeassistant.const import (
     CONF_TEMPERATURE_UNIT,
     UnitOfTemperature,
 )
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.core import Event as HassEvent
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import area_registry, device_registry, entity_registry
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.helpers.storage import Store
 
 try:
     from homeassistant.helpers.discovery_flow import (
@@ -36,8 +48,12 @@ from .const import (
     ATTR_HUB,
     DOMAIN,
     H_CONF_APP_ID,
+    H_CONF_EVENT_BATCH_WINDOW,
     H_CONF_HUB_ID,
     H_CONF_HUBITAT_EVENT,
+    H_CONF_LOAD_CONCURRENCY,
+    H_CONF_OPTIMISTIC,
+    H_CONF_SERVER_MODE,
     H_CONF_SERVER_PORT,
     H_CONF_SERVER_SSL_CERT,
     H_CONF_SERVER_SSL_KEY,
@@ -46,11 +62,19 @@ from .const import (
     PLATFORMS,
     TEMP_F,
     TRIGGER_CAPABILITIES,
+    ServerMode,
 )
 from .hubitatmaker import (
+    DEFAULT_LOAD_CONCURRENCY,
+    EVENT_TYPE_REFRESH,
+    CircuitState,
+    ConnectionError as HubitatConnectionError,
     Device,
     Event,
+    EventServerMode,
     Hub as HubitatHub,
+    RequestError,
+    decode_json,
 )
 from .types import Removable, UpdateableEntity
 from .util import (
@@ -65,9 +89,39 @@ _LOGGER = getLogger(__name__)
 
 Listener = Callable[[Event], None]
 
+# Device listener key for listeners that receive events for every attribute
+_ANY_ATTRIBUTE = "*"
+
 HUB_DEVICE_NAME = "Hub"
 HUB_NAME = "Hubitat Elevation"
 
+# Storage for the last known device data, used to create entities before the
+# hub has been contacted
+DEVICE_CACHE_VERSION = 1
+DEVICE_CACHE_SAVE_DELAY = 10  # seconds
+
+# Storage for the state of registry migrations and synchronization
+REGISTRY_STATE_VERSION = 1
+
+REGISTRY_STATE_SAVE_DELAY = 10  # seconds
+
+# The version of the device identifier and entity unique ID formats. Registry
+# migrations only run for hubs whose stored version is older than this.
+REGISTRY_MIGRATION_VERSION = 1
+
+# How long an optimistic attribute value waits for the hub to confirm it
+# before it's rolled back
+OPTIMISTIC_CONFIRM_TIMEOUT = 10  # seconds
+
+# The shortest time between attempts to connect to an unreachable hub
+MIN_RECONNECT_DELAY = 1  # seconds
+
+_EVENT_SERVER_MODES = {
+    ServerMode.THREAD: EventServerMode.THREAD,
+    ServerMode.LOOP: EventServerMode.LOOP,
+    ServerMode.WEBHOOK: EventServerMode.EXTERNAL,
+}
+
 # Hubitat attributes that should be emitted as HA events
 _TRIGGER_ATTRS = tuple([v.attr for v in TRIGGER_CAPABILITIES.values()])
 # A mapping from Hubitat attribute names to the attribute names that should be
@@ -85,16 +139,34 @@ class Hub(HasId):
     config_entry: ConfigEntry
     token: str
     unsub_config_listener: CALLBACK_TYPE
+    _unsub_entity_registry_listener: CALLBACK_TYPE
     device: Device
 
     _temperature_unit: str
     _hub_entity_id: str
     _hub_device_listeners: list[Listener]
-    _device_listeners: dict[str, list[Listener]]
+    _device_listeners: dict[str, dict[str, list[Listener]]]
     _hub: HubitatHub
     _is_connected: bool
     _retry_task_unsub: CALLBACK_TYPE | None
+    _probe_unsub: CALLBACK_TYPE | None
     _platforms_setup: bool
+    _device_cache: Store[dict[str, Any]]
+    _registry_store: Store[dict[str, Any]]
+    _registry_state: dict[str, Any] | None
+    _sync_rooms: bool
+    _cached_device_ids: set[str] | None
+    _webhook_id: str | None
+    _pending_writes: dict[str, UpdateableEntity]
+    _optimistic: bool
+    _pending_confirmations: dict[tuple[str, str], "_PendingConfirmation"]
+    _confirmation_stats: "_ConfirmationStats"
+    _device_index: "DeviceIndex | None"
+    _device_entities: dict[str, list[UpdateableEntity]]
+    _device_covered_attrs: dict[str, set[str]]
+    _entities_by_id: dict[str, UpdateableEntity]
+    _entity_ids_stale: bool
+    _unindexed_entities: list[UpdateableEntity]
 
     def __init__(
         self,
@@ -117,6 +189,11 @@ class Hub(HasId):
         self.token = cast(str, self.config_entry.data.get(CONF_ACCESS_TOKEN))
         self.entities: list[UpdateableEntity] = []
         self.event_emitters: list[Removable] = []
+        self._device_entities = {}
+        self._device_covered_attrs = {}
+        self._entities_by_id = {}
+        self._entity_ids_stale = False
+        self._unindexed_entities = []
 
         self._temperature_unit = (
             entry.options.get(
@@ -131,13 +208,50 @@ class Hub(HasId):
             self._hub_entity_id = f"hubitat.hub_{index}"
 
         self.unsub_config_listener = entry.add_update_listener(_update_entry)
+        self._unsub_entity_registry_listener = hass.bus.async_listen(
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+            self._handle_entity_registry_update,
+        )
         self._hub_device_listeners = []
         self._device_listeners = {}
         self._hub = hub
         self.device = device
         self._is_connected = False
         self._retry_task_unsub = None
+        self._probe_unsub = None
         self._platforms_setup = False
+        self._device_cache = Store(
+            hass, DEVICE_CACHE_VERSION, f"{DOMAIN}.{entry.entry_id}.devices"
+        )
+        self._registry_store = Store(
+            hass, REGISTRY_STATE_VERSION, f"{DOMAIN}.{entry.entry_id}.registry"
+        )
+        self._registry_state = None
+        self._sync_rooms = bool(
+            entry.options.get(H_CONF_SYNC_AREAS, entry.data.get(H_CONF_SYNC_AREAS))
+        )
+        self._cached_device_ids = None
+        self._device_index = None
+
+        self._pending_writes = {}
+
+        self._optimistic = bool(
+            entry.options.get(H_CONF_OPTIMISTIC, entry.data.get(H_CONF_OPTIMISTIC))
+        )
+        self._pending_confirmations = {}
+        self._confirmation_stats = _ConfirmationStats()
+
+        self._webhook_id = None
+        if _get_server_mode(entry) == ServerMode.WEBHOOK:
+            self._webhook_id = _get_webhook_id(entry)
+            webhook.async_register(
+                hass,
+                DOMAIN,
+                f"{HUB_NAME} ({self.host})",
+                self._webhook_id,
+                self._handle_webhook,
+                local_only=True,
+            )
 
     @property
     def app_id(self) -> str:
@@ -149,11 +263,43 @@ class Hub(HasId):
         """Return whether the hub is currently connected."""
         return self._is_connected
 
+    @property
+    def is_cached(self) -> bool:
+        """Return whether entities were created from cached device data."""
+        return self._cached_device_ids is not None
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Maker API request and event metrics."""
+        return self._hub.metrics
+
+    @property
+    def metrics_summary(self) -> dict[str, int | float | None]:
+        """Maker API request and event totals."""
+        return self._hub.metrics_summary
+
+    @property
+    def event_stats(self) -> dict[str, int]:
+        """Counters for the hub's event server queue."""
+        return self._hub.event_stats
+
+    @property
+    def reconnect_delay(self) -> float:
+        """Seconds to wait before the next attempt to connect to the hub."""
+        return max(MIN_RECONNECT_DELAY, self._hub.circuit_retry_in)
+
     @property
     def devices(self) -> Mapping[str, Device]:
         """The Hubitat devices known to this hub."""
         return self._hub.devices
 
+    @property
+    def device_index(self) -> "DeviceIndex":
+        """The hub's devices grouped by capability and attribute."""
+        if self._device_index is None:
+            self._device_index = DeviceIndex(self.devices)
+        return self._device_index
+
     @property
     def entity_id(self) -> str:
         """The entity ID of this hub."""
@@ -228,14 +374,23 @@ class Hub(HasId):
             else UnitOfTemperature.CELSIUS
         )
 
-    def add_device_listener(self, device_id: str, listener: Listener) -> None:
-        """Add a listener for events for a specific device."""
+    def add_device_listener(
+        self,
+        device_id: str,
+        listener: Listener,
+        attrs: Iterable[str] | None = None,
+    ) -> None:
+        """Add a listener for events for a specific device.
+
+        If attrs is provided, the listener will only be called for events for
+        those attributes. Otherwise it will be called for every event.
+        """
         if device_id == self.id:
             self._hub_device_listeners.append(listener)
         else:
-            if device_id not in self._device_listeners:
-                self._device_listeners[device_id] = []
-            self._device_listeners[device_id].append(listener)
+            listeners = self._device_listeners.setdefault(device_id, {})
+            for attr in attrs if attrs is not None else (_ANY_ATTRIBUTE,):
+                listeners.setdefault(attr, []).append(listener)
 
     def remove_device_listener(self, device_id: str, listener: Listener) -> None:
         """Remove a listener for events for a specific device."""
@@ -243,15 +398,44 @@ class Hub(HasId):
             if listener in self._hub_device_listeners:
                 self._hub_device_listeners.remove(listener)
         else:
-            if (
-                device_id in self._device_listeners
-                and listener in self._device_listeners[device_id]
-            ):
-                self._device_listeners[device_id].remove(listener)
+            for listeners in self._device_listeners.get(device_id, {}).values():
+                if listener in listeners:
+                    listeners.remove(listener)
 
     def add_entities(self, entities: list[E]) -> None:
-        """Add entities to this hub."""
+        """Add entities to this hub and listen for their devices' events."""
         self.entities.extend(entities)
+        # Entity IDs are assigned when the entities are added to Home
+        # Assistant, so they're indexed on first lookup
+        self._unindexed_entities.extend(entities)
+        for entity in entities:
+            device_id = entity.device_id
+            self._device_entities.setdefault(device_id, []).append(entity)
+            if entity.device_attrs is not None:
+                self._device_covered_attrs.setdefault(device_id, set()).update(
+                    entity.device_attrs
+                )
+            self.add_device_listener(device_id, entity.handle_event, entity.event_attrs)
+
+    def get_device_entities(self, device_id: str) -> Sequence[UpdateableEntity]:
+        """Return the entities added for a device."""
+        return self._device_entities.get(device_id, ())
+
+    def get_entity(self, entity_id: str) -> UpdateableEntity | None:
+        """Return the entity with a given entity ID."""
+        if self._entity_ids_stale:
+            self._index_entity_ids()
+
+        entity = self._entities_by_id.get(entity_id)
+        if entity is None and self._unindexed_entities:
+            # The entity may have been assigned its ID since the map was built
+            self._index_entity_ids(self._unindexed_entities)
+            entity = self._entities_by_id.get(entity_id)
+        return entity
+
+    def get_covered_attributes(self, device_id: str) -> AbstractSet[str]:
+        """Return the device attributes that the device's entities represent."""
+        return self._device_covered_attrs.get(device_id, frozenset())
 
     def add_event_emitters(self, emitters: list[M]) -> None:
         """Add event emitters to this hub."""
@@ -259,7 +443,7 @@ class Hub(HasId):
 
     def remove_device_listeners(self, device_id: str) -> None:
         """Remove all listeners for a specific device."""
-        self._device_listeners[device_id] = []
+        self._device_listeners[device_id] = {}
         self._hub_device_listeners = []
 
     async def set_mode(self, mode: str) -> None:
@@ -280,9 +464,40 @@ class Hub(HasId):
         self._temperature_unit = temp_unit
 
     def stop(self) -> None:
-        """Stop the hub."""
+        """Stop the hub.
+
+        The device cache is saved in the background. Use async_stop when the
+        config entry may be set up again, so a late save can't overwrite the
+        cache written by the new setup.
+        """
+        if self._is_connected:
+            self._device_cache.async_delay_save(
+                self._hub.export_state, DEVICE_CACHE_SAVE_DELAY
+            )
+        self._stop()
+
+    async def async_stop(self) -> None:
+        """Stop the hub, saving the device cache and waiting for the event
+        server to shut down before returning."""
+        if self._is_connected:
+            await self._device_cache.async_save(self._hub.export_state())
+        if self._hub:
+            await self._hub.async_stop()
+        self._stop()
+
+    def _stop(self) -> None:
+        """Stop receiving events and release the hub's resources."""
         if self._hub:
             self._hub.stop()
+        if self._webhook_id:
+            webhook.async_unregister(self.hass, self._webhook_id)
+            self._webhook_id = None
+        for pending in self._pending_confirmations.values():
+            pending.cancel()
+        self._pending_confirmations = {}
+        if self._probe_unsub is not None:
+            self._probe_unsub()
+            self._probe_unsub = None
         self._device_listeners = {}
         self._hub_device_listeners = []
 
@@ -301,6 +516,7 @@ class Hub(HasId):
         for emitter in self.event_emitters:
             await emitter.async_will_remove_from_hass()
         self.unsub_config_listener()
+        self._unsub_entity_registry_listener()
 
         # Cancel retry task if it's still running
         self.cancel_retry_task()
@@ -313,6 +529,8 @@ class Hub(HasId):
             ATTR_HIDDEN: True,
             CONF_TEMPERATURE_UNIT: self.temperature_unit,
         }
+        if self._optimistic:
+            attrs.update(self._confirmation_stats.as_dict())
         return attrs
 
     @staticmethod
@@ -342,6 +560,10 @@ class Hub(HasId):
         if url == "":
             url = None
 
+        server_mode = _get_server_mode(entry)
+        if server_mode == ServerMode.WEBHOOK:
+            url = _get_webhook_url(hass, entry, url)
+
         ssl_cert = cast(
             str | None,
             entry.options.get(
@@ -365,6 +587,18 @@ class Hub(HasId):
         )
         app_id = cast(str, entry.data.get(H_CONF_APP_ID))
         token = cast(str, entry.data.get(CONF_ACCESS_TOKEN))
+        load_concurrency = cast(
+            int | None,
+            entry.options.get(
+                H_CONF_LOAD_CONCURRENCY, entry.data.get(H_CONF_LOAD_CONCURRENCY)
+            ),
+        )
+        event_batch_window = cast(
+            int | None,
+            entry.options.get(
+                H_CONF_EVENT_BATCH_WINDOW, entry.data.get(H_CONF_EVENT_BATCH_WINDOW)
+            ),
+        )
 
         _LOGGER.debug(
             "Initializing Hubitat hub with event server on port %s with SSL %s",
@@ -378,34 +612,15 @@ class Hub(HasId):
             port=port,
             event_url=url,
             ssl_context=ssl_context,
+            load_concurrency=load_concurrency or DEFAULT_LOAD_CONCURRENCY,
+            event_server_mode=_EVENT_SERVER_MODES[server_mode],
+            event_batch_window=(event_batch_window or 0) / 1000,
         )
         await hubitat_hub.start()
 
         # setup proxy Device representing the hub that can be used for linked
         # entities
-        device = Device(
-            {
-                "id": get_hub_short_id(hubitat_hub),
-                "name": HUB_DEVICE_NAME,
-                "label": HUB_DEVICE_NAME,
-                "model": "Cx",
-                "manufacturer": HUB_NAME,
-                "attributes": [
-                    {
-                        "name": "mode",
-                        "currentValue": hubitat_hub.mode,
-                        "dataType": "ENUM",
-                    },
-                    {
-                        "name": "hsm_status",
-                        "currentValue": hubitat_hub.hsm_status,
-                        "dataType": "ENUM",
-                    },
-                ],
-                "capabilities": [],
-                "commands": [],
-            }
-        )
+        device = Device(_get_hub_device_properties(hubitat_hub))
 
         hub = Hub(hass, entry, index, hubitat_hub, device)
         hub._is_connected = True
@@ -417,27 +632,17 @@ class Hub(HasId):
         # matches a trigger condition.
         for device_id in hubitat_hub.devices:
             hubitat_hub.add_device_listener(device_id, hub.handle_event)
+        hubitat_hub.add_batch_listener(hub._write_pending_states)
+        hubitat_hub.add_circuit_listener(hub._handle_circuit_change)
 
-        # Update device identifiers to include the Maker API instance ID to
-        # ensure that devices coming from separate hubs (or Maker API installs)
-        # are handled properly.
-        if hub.id:
-            _update_device_ids(hub.id, hass)
-
-        # Migrate entity unique IDs from old token-hash format to new hub-id format
-        _migrate_entity_unique_ids(hass, hub.id, token)
+        await hub.async_migrate_registries()
 
         # Initialize entities
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
         _LOGGER.debug("Registered platforms")
 
-        should_update_rooms = cast(
-            bool | None,
-            entry.options.get(H_CONF_SYNC_AREAS, entry.data.get(H_CONF_SYNC_AREAS)),
-        )
-        if should_update_rooms:
-            _update_device_rooms(hub, hass)
+        await hub.async_update_device_rooms()
 
         # Create an entity for the Hubitat hub with basic hub information
         hass.states.async_set(
@@ -449,18 +654,20 @@ class Hub(HasId):
         if hub.mode_supported:
 
             def handle_mode_event(event: Event):
-                device.update_attr(DeviceAttribute.MODE, cast(str, event.value), None)
+                _ = device.update_attr(
+                    DeviceAttribute.MODE, cast(str, event.value), None
+                )
                 for listener in hub._hub_device_listeners:
                     listener(event)
 
             hub._hub.add_mode_listener(handle_mode_event)
             if hub.mode:
-                hub.device.update_attr(DeviceAttribute.MODE, hub.mode, None)
+                _ = hub.device.update_attr(DeviceAttribute.MODE, hub.mode, None)
 
         if hub.hsm_supported:
 
             def handle_hsm_status_event(event: Event):
-                device.update_attr(
+                _ = device.update_attr(
                     DeviceAttribute.HSM_STATUS, cast(str, event.value), None
                 )
                 for listener in hub._hub_device_listeners:
@@ -468,7 +675,9 @@ class Hub(HasId):
 
             hub._hub.add_hsm_listener(handle_hsm_status_event)
             if hub.hsm_status:
-                hub.device.update_attr(DeviceAttribute.HSM_STATUS, hub.hsm_status, None)
+                _ = hub.device.update_attr(
+                    DeviceAttribute.HSM_STATUS, hub.hsm_status, None
+                )
 
         return hub
 
@@ -501,6 +710,10 @@ class Hub(HasId):
         if url == "":
             url = None
 
+        server_mode = _get_server_mode(entry)
+        if server_mode == ServerMode.WEBHOOK:
+            url = _get_webhook_url(hass, entry, url)
+
         ssl_cert = cast(
             str | None,
             entry.options.get(
@@ -524,6 +737,18 @@ class Hub(HasId):
         )
         app_id = cast(str, entry.data.get(H_CONF_APP_ID))
         token = cast(str, entry.data.get(CONF_ACCESS_TOKEN))
+        load_concurrency = cast(
+            int | None,
+            entry.options.get(
+                H_CONF_LOAD_CONCURRENCY, entry.data.get(H_CONF_LOAD_CONCURRENCY)
+            ),
+        )
+        event_batch_window = cast(
+            int | None,
+            entry.options.get(
+                H_CONF_EVENT_BATCH_WINDOW, entry.data.get(H_CONF_EVENT_BATCH_WINDOW)
+            ),
+        )
 
         _LOGGER.debug("Creating offline Hubitat hub instance")
 
@@ -535,21 +760,14 @@ class Hub(HasId):
             port=port,
             event_url=url,
             ssl_context=ssl_context,
+            load_concurrency=load_concurrency or DEFAULT_LOAD_CONCURRENCY,
+            event_server_mode=_EVENT_SERVER_MODES[server_mode],
+            event_batch_window=(event_batch_window or 0) / 1000,
         )
 
-        # Create a placeholder device for the hub
-        device = Device(
-            {
-                "id": "unknown",
-                "name": HUB_DEVICE_NAME,
-                "label": HUB_DEVICE_NAME,
-                "model": "Cx",
-                "manufacturer": HUB_NAME,
-                "attributes": [],
-                "capabilities": [],
-                "commands": [],
-            }
-        )
+        # Create the device representing the hub; its attributes are filled
+        # in when the hub connects
+        device = Device(_get_hub_device_properties(hubitat_hub))
 
         hub = Hub(hass, entry, index, hubitat_hub, device)
         hub._is_connected = False
@@ -565,6 +783,145 @@ class Hub(HasId):
 
         return hub
 
+    async def async_setup_from_cache(self) -> bool:
+        """Create entities from the last known device data.
+
+        Returns False if no device data has been cached. Otherwise, entities
+        are created immediately and will be updated when the hub connects.
+        """
+        data = await self._device_cache.async_load()
+        if not data or not data.get("devices"):
+            _LOGGER.debug("No cached device data")
+            return False
+
+        self._hub.restore_state(data)
+        self.device.update_state(_get_hub_device_properties(self._hub))
+        self._cached_device_ids = set(self._hub.devices)
+        self._device_index = DeviceIndex(self._hub.devices)
+
+        await self.async_migrate_registries()
+
+        await self.hass.config_entries.async_forward_entry_setups(
+            self.config_entry, PLATFORMS
+        )
+        self._platforms_setup = True
+
+        _LOGGER.debug(
+            "Created entities for %d cached devices", len(self._cached_device_ids)
+        )
+        return True
+
+    async def async_migrate_registries(self) -> None:
+        """Migrate this hub's devices and entities from older identifier
+        formats.
+
+        The migrations only look at this hub's config entry, and they run
+        once. After that a stored version marker skips them.
+        """
+        state = await self._async_load_registry_state()
+        if state.get("migration_version", 0) >= REGISTRY_MIGRATION_VERSION:
+            return
+
+        # Update device identifiers to include the Maker API instance ID to
+        # ensure that devices coming from separate hubs (or Maker API installs)
+        # are handled properly.
+        entry_id = self.config_entry.entry_id
+        if self.id:
+            _update_device_ids(self.id, self.hass, entry_id)
+
+        # Migrate entity unique IDs from old token-hash format to new hub-id format
+        _migrate_entity_unique_ids(self.hass, self.id, self.token, entry_id)
+
+        state["migration_version"] = REGISTRY_MIGRATION_VERSION
+        await self._registry_store.async_save(self._get_registry_data())
+        _LOGGER.debug("Migrated registries to version %d", REGISTRY_MIGRATION_VERSION)
+
+    async def async_update_device_rooms(self) -> None:
+        """Update the areas of Home Assistant devices to match their Hubitat
+        rooms.
+
+        The rooms that were last applied are stored with a hash. Nothing is
+        done if the current rooms have the same hash. Otherwise only devices
+        whose rooms changed are updated.
+        """
+        if not self._sync_rooms:
+            return
+
+        state = await self._async_load_registry_state()
+        rooms = {device_id: device.room for device_id, device in self.devices.items()}
+        if state.get("rooms_hash") == _get_rooms_hash(rooms):
+            _LOGGER.debug("Device rooms are unchanged")
+            return
+
+        _LOGGER.debug("Synchronizing device rooms...")
+        applied = cast(dict[str, str | None], state.get("rooms") or {})
+        state["rooms"] = {
+            device_id: room for device_id, room in applied.items() if device_id in rooms
+        }
+        self._update_device_rooms(
+            device_id
+            for device_id, room in rooms.items()
+            if device_id not in applied or applied[device_id] != room
+        )
+
+    async def _async_load_registry_state(self) -> dict[str, Any]:
+        """Return the stored registry state, loading it if necessary."""
+        if self._registry_state is None:
+            self._registry_state = await self._registry_store.async_load() or {}
+        return self._registry_state
+
+    def _get_registry_data(self) -> dict[str, Any]:
+        """Return the registry state to be stored."""
+        state = self._registry_state or {}
+        if "rooms" in state:
+            state["rooms_hash"] = _get_rooms_hash(state["rooms"])
+        return state
+
+    def _update_device_rooms(self, device_ids: Iterable[str]) -> None:
+        """Update the areas of Home Assistant devices to match their Hubitat
+        rooms, and record the rooms that were applied.
+
+        The registry state must already be loaded.
+        """
+        state = cast(dict[str, Any], self._registry_state)
+        applied = cast(dict[str, str | None], state.setdefault("rooms", {}))
+        dreg = device_registry.async_get(self.hass)
+        areg = area_registry.async_get(self.hass)
+        area_ids: dict[str, str] = {}
+
+        for device_id in device_ids:
+            device = self.devices.get(device_id)
+            if device is None:
+                continue
+
+            # if the device area from Hubitat is defined and differs from
+            # Home Assistant, update the device area ID
+            hass_device = dreg.async_get_device(
+                identifiers=get_device_identifiers(self.id, device_id)
+            )
+            if not hass_device:
+                _LOGGER.debug(
+                    "Skipping room check for %s because no HA device", device.name
+                )
+                continue
+
+            if device.room:
+                if device.room not in area_ids:
+                    area_ids[device.room] = areg.async_get_or_create(device.room).id
+                area_id = area_ids[device.room]
+                if hass_device.area_id != area_id:
+                    _ = dreg.async_update_device(hass_device.id, area_id=area_id)
+                    _LOGGER.debug("Updated location of %s to %s", device.name, area_id)
+            elif hass_device.area_id:
+                _ = dreg.async_clear_area_id(hass_device.id)
+                _LOGGER.debug("Cleared location of %s", device.name)
+
+            applied[device_id] = device.room
+
+        self._registry_store.async_delay_save(
+            self._get_registry_data, REGISTRY_STATE_SAVE_DELAY
+        )
+
     async def async_connect(self) -> None:
         """Connect to the Hubitat hub.
 
@@ -576,49 +933,42 @@ class Hub(HasId):
 
         _LOGGER.debug("Connecting to Hubitat hub...")
 
-        # Force refresh if devices were partially loaded from a previous failed
-        # connection attempt
-        force_refresh = len(self._hub.devices) > 0
+        # If devices were cached or partially loaded by a previous failed
+        # connection attempt, only reload the ones that changed
+        loaded_device_ids = set(self._hub.devices)
+
+        # Clear listeners left behind by an attempt that timed out
+        for device_id in self._hub.devices:
+            self._hub.remove_device_listeners(device_id)
+        self._hub.remove_mode_listeners()
+        self._hub.remove_hsm_status_listeners()
+        self._hub.remove_batch_listeners()
+        self._hub.remove_circuit_listeners()
+
+        self._hub.add_batch_listener(self._write_pending_states)
+        self._hub.add_circuit_listener(self._handle_circuit_change)
+
+        # Listen to known devices before starting so that attribute changes
+        # found by the refresh reach existing entities
+        known_device_ids = set(self._hub.devices) if self._platforms_setup else set()
+        for device_id in known_device_ids:
+            self._hub.add_device_listener(device_id, self.handle_event)
 
         try:
             # Start the hub (this will raise ConnectionError if it fails)
-            await self._hub.start(force_refresh=force_refresh)
+            await self._hub.start(sync=len(loaded_device_ids) > 0)
+            self._remove_devices(loaded_device_ids.difference(self._hub.devices))
 
             # Update the device with hub info
-            self.device = Device(
-                {
-                    "id": get_hub_short_id(self._hub),
-                    "name": HUB_DEVICE_NAME,
-                    "label": HUB_DEVICE_NAME,
-                    "model": "Cx",
-                    "manufacturer": HUB_NAME,
-                    "attributes": [
-                        {
-                            "name": "mode",
-                            "currentValue": self._hub.mode,
-                            "dataType": "ENUM",
-                        },
-                        {
-                            "name": "hsm_status",
-                            "currentValue": self._hub.hsm_status,
-                            "dataType": "ENUM",
-                        },
-                    ],
-                    "capabilities": [],
-                    "commands": [],
-                }
-            )
+            self.device.update_state(_get_hub_device_properties(self._hub))
+            self._device_index = DeviceIndex(self._hub.devices)
 
-            # Add listeners for all devices
+            # Add listeners for any devices that weren't already known
             for device_id in self._hub.devices:
-                self._hub.add_device_listener(device_id, self.handle_event)
-
-            # Update device identifiers
-            if self.id:
-                _update_device_ids(self.id, self.hass)
+                if device_id not in known_device_ids:
+                    self._hub.add_device_listener(device_id, self.handle_event)
 
-            # Migrate entity unique IDs from old token-hash format to new hub-id format
-            _migrate_entity_unique_ids(self.hass, self.id, self.token)
+            await self.async_migrate_registries()
 
             # Initialize entities (only once - this is not idempotent)
             if not self._platforms_setup:
@@ -629,19 +979,12 @@ class Hub(HasId):
 
             _LOGGER.debug("Registered platforms")
 
-            should_update_rooms = cast(
-                bool | None,
-                self.config_entry.options.get(
-                    H_CONF_SYNC_AREAS, self.config_entry.data.get(H_CONF_SYNC_AREAS)
-                ),
-            )
-            if should_update_rooms:
-                _update_device_rooms(self, self.hass)
+            await self.async_update_device_rooms()
 
             if self.mode_supported:
 
                 def handle_mode_event(event: Event):
-                    self.device.update_attr(
+                    _ = self.device.update_attr(
                         DeviceAttribute.MODE, cast(str, event.value), None
                     )
                     for listener in self._hub_device_listeners:
@@ -649,12 +992,12 @@ class Hub(HasId):
 
                 self._hub.add_mode_listener(handle_mode_event)
                 if self.mode:
-                    self.device.update_attr(DeviceAttribute.MODE, self.mode, None)
+                    _ = self.device.update_attr(DeviceAttribute.MODE, self.mode, None)
 
             if self.hsm_supported:
 
                 def handle_hsm_status_event(event: Event):
-                    self.device.update_attr(
+                    _ = self.device.update_attr(
                         DeviceAttribute.HSM_STATUS, cast(str, event.value), None
                     )
                     for listener in self._hub_device_listeners:
@@ -662,15 +1005,44 @@ class Hub(HasId):
 
                 self._hub.add_hsm_listener(handle_hsm_status_event)
                 if self.hsm_status:
-                    self.device.update_attr(
+                    _ = self.device.update_attr(
                         DeviceAttribute.HSM_STATUS, self.hsm_status, None
                     )
 
+            if known_device_ids:
+                # Entities created from cached data need to pick up the current
+                # mode and HSM status
+                for name in (DeviceAttribute.MODE, DeviceAttribute.HSM_STATUS):
+                    attr = self.device.attributes.get(name)
+                    if attr is None or attr.value is None:
+                        continue
+                    event = Event(
+                        {
+                            "deviceId": self.device.id,
+                            "name": name,
+                            "value": attr.value,
+                            "type": EVENT_TYPE_REFRESH,
+                        }
+                    )
+                    for listener in self._hub_device_listeners:
+                        listener(event)
+
             self._is_connected = True
             _LOGGER.debug("Hub connection complete")
 
-        except Exception:
-            # If connection fails, clean up to allow clean retry
+            await self._device_cache.async_save(self._hub.export_state())
+
+            if self._cached_device_ids is not None and not set(
+                self._hub.devices
+            ).issubset(self._cached_device_ids):
+                # Entities for new devices are only created by platform setup
+                _LOGGER.info("New Hubitat devices found; reloading integration")
+                self.hass.config_entries.async_schedule_reload(
+                    self.config_entry.entry_id
+                )
+
+        except BaseException:
+            # If connection fails or times out, clean up to allow clean retry
             # Stop the event server to avoid "address in use" errors
             self._hub.stop()
 
@@ -786,10 +1158,30 @@ class Hub(HasId):
         await self._hub.refresh_device(device_id)
 
     async def send_command(
-        self, device_id: str, command: str, arg: str | int | None
+        self,
+        device_id: str,
+        command: str,
+        arg: str | int | None,
+        expected: Mapping[DeviceAttribute, str | float] | None = None,
     ) -> None:
-        """Send a device command to Hubitat."""
-        _ = await self._hub.send_command(device_id, command, arg)
+        """Send a device command to Hubitat.
+
+        expected holds the attribute values the command should produce. If
+        optimistic updates are enabled, they're applied right away and rolled
+        back if the hub doesn't report them within OPTIMISTIC_CONFIRM_TIMEOUT
+        seconds.
+        """
+        if not self._optimistic or not expected:
+            _ = await self._hub.send_command(device_id, command, arg)
+            return
+
+        self._apply_optimistic(device_id, expected)
+        try:
+            _ = await self._hub.send_command(device_id, command, arg)
+        except Exception:
+            for name in expected:
+                self._expire_confirmation(device_id, name)
+            raise
 
     async def set_host(self, host: str) -> None:
         """Set the host address that the Hubitat hub is accessible at."""
@@ -814,15 +1206,310 @@ class Hub(HasId):
         _LOGGER.debug("Setting event server URL to %s", url)
         await self._hub.set_event_url(url)
 
+    def async_schedule_state_write(self, entity: UpdateableEntity) -> None:
+        """Schedule an entity's state to be written to HA.
+
+        Writes requested while a batch of events is being dispatched are
+        deferred until the end of the batch, so each entity is written at most
+        once per batch.
+        """
+        if self._hub.in_batch:
+            self._pending_writes[entity.entity_id] = entity
+        else:
+            entity.async_schedule_update_ha_state()
+
+    def _apply_optimistic(
+        self, device_id: str, expected: Mapping[DeviceAttribute, str | float]
+    ) -> None:
+        """Apply the expected results of a command before the hub reports
+        them."""
+        device = self._hub.devices.get(device_id)
+        if device is None:
+            return
+
+        for name, value in expected.items():
+            attr = device.attributes.get(name)
+            if attr is None:
+                continue
+
+            # A value that's replacing an unconfirmed one rolls back to the
+            # last value the hub reported
+            key = (device_id, name)
+            previous = attr.value
+            if key in self._pending_confirmations:
+                pending = self._pending_confirmations.pop(key)
+                pending.cancel()
+                previous = pending.previous
+
+            self._pending_confirmations[key] = _PendingConfirmation(
+                value,
+                previous,
+                async_call_later(
+                    self.hass,
+                    OPTIMISTIC_CONFIRM_TIMEOUT,
+                    partial(self._expire_confirmation, device_id, name),
+                ),
+            )
+            if device.update_attr(name, value, attr.unit):
+                self._notify_attr(device, name)
+
+    def _confirm(self, event: Event) -> None:
+        """Resolve an optimistic value using an event reported by the hub.
+
+        The hub's value has already been applied to the device, so there's
+        nothing to roll back if it differs from the expected value.
+        """
+        key = (event.device_id, event.attribute)
+        pending = self._pending_confirmations.pop(key, None)
+        if pending is None:
+            return
+
+        pending.cancel()
+        latency = time.monotonic() - pending.sent_at
+        if _values_match(event.value, pending.value):
+            self._confirmation_stats.add_confirmed(latency)
+        else:
+            _LOGGER.debug(
+                "Hub reported %s=%s for %s instead of %s",
+                event.attribute,
+                event.value,
+                event.device_id,
+                pending.value,
+            )
+            self._confirmation_stats.add_corrected(latency)
+        self._update_state_attributes()
+
+    @callback
+    def _expire_confirmation(
+        self, device_id: str, name: DeviceAttribute, _now: Any = None
+    ) -> None:
+        """Roll back an optimistic value that the hub didn't confirm."""
+        pending = self._pending_confirmations.pop((device_id, name), None)
+        if pending is None:
+            return
+
+        pending.cancel()
+        self._confirmation_stats.rolled_back += 1
+        self._update_state_attributes()
+
+        device = self._hub.devices.get(device_id)
+        attr = device.attributes.get(name) if device else None
+        if device is None or attr is None:
+            return
+
+        # Leave the attribute alone if something else has changed it since
+        if not _values_match(attr.value, pending.value):
+            return
+
+        _LOGGER.warning(
+            "Hub didn't confirm %s=%s for %s; restoring %s",
+            name,
+            pending.value,
+            device_id,
+            pending.previous,
+        )
+        if device.update_attr(name, pending.previous, attr.unit):
+            self._notify_attr(device, name)
+
+    def _notify_attr(self, device: Device, name: DeviceAttribute) -> None:
+        """Tell a device's listeners that an attribute was changed locally."""
+        attr = device.attributes[name]
+        self.handle_event(
+            Event(
+                {
+                    "deviceId": device.id,
+                    "displayName": device.label,
+                    "name": name,
+                    "value": attr.value,
+                    "unit": attr.unit,
+                    "type": EVENT_TYPE_REFRESH,
+                }
+            )
+        )
+
+    def _update_state_attributes(self) -> None:
+        """Refresh the hub entity's attributes."""
+        state = self.hass.states.get(self.entity_id)
+        if state is not None:
+            self.hass.states.async_set(
+                self.entity_id, state.state, self.get_state_attributes()
+            )
+
+    def _handle_circuit_change(self, state: CircuitState) -> None:
+        """Handle a change in whether Maker API requests are being sent."""
+        if self.device.update_attr(DeviceAttribute.CIRCUIT_STATE, state, None):
+            event = Event(
+                {
+                    "deviceId": self.device.id,
+                    "name": DeviceAttribute.CIRCUIT_STATE,
+                    "value": state,
+                    "type": EVENT_TYPE_REFRESH,
+                }
+            )
+            for listener in self._hub_device_listeners:
+                listener(event)
+
+        # Reconnecting an unconnected hub is handled by the setup retry loop
+        if not self._is_connected:
+            return
+
+        if state == CircuitState.OPEN:
+            if self._probe_unsub is None:
+                _LOGGER.warning("Hubitat hub is unreachable; pausing requests")
+                self._set_hub_state("unavailable")
+            self._schedule_probe()
+        elif state == CircuitState.CLOSED:
+            if self._probe_unsub is not None:
+                self._probe_unsub()
+                self._probe_unsub = None
+            self._set_hub_state("connected")
+            _ = self.hass.async_create_task(self._async_refresh_devices())
+
+    def _schedule_probe(self) -> None:
+        """Check whether the hub has recovered once the circuit allows it."""
+        if self._probe_unsub is not None:
+            self._probe_unsub()
+        self._probe_unsub = async_call_later(
+            self.hass, self._hub.circuit_retry_in, self._async_probe
+        )
+
+    async def _async_probe(self, _now: Any) -> None:
+        """Send a request to see whether the hub is reachable again.
+
+        The result is reported through _handle_circuit_change.
+        """
+        try:
+            await self._hub.check_config()
+        except (
+            TimeoutError,
+            ClientError,
+            HubitatConnectionError,
+            RequestError,
+        ) as e:
+            _LOGGER.debug("Hubitat hub is still unreachable: %s", e)
+            if self._hub.circuit_state == CircuitState.OPEN:
+                self._schedule_probe()
+
+    async def _async_refresh_devices(self) -> None:
+        """Reload device state after the hub was unreachable, since events
+        sent in the meantime may have been lost."""
+        known_device_ids = set(self._hub.devices)
+        try:
+            self._remove_devices(await self._hub.sync_devices())
+            self._device_index = None
+            _LOGGER.info("Refreshed Hubitat devices after reconnecting")
+        except (
+            TimeoutError,
+            ClientError,
+            HubitatConnectionError,
+            RequestError,
+        ) as e:
+            _LOGGER.warning("Unable to refresh Hubitat devices: %s", e)
+            return
+
+        await self.async_update_device_rooms()
+
+        if not known_device_ids.issuperset(self._hub.devices):
+            # Entities for new devices are only created by platform setup
+            _LOGGER.info("New Hubitat devices found; reloading integration")
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
+    def _remove_devices(self, device_ids: Iterable[str]) -> None:
+        """Remove devices that were deleted from the hub.
+
+        Removing a device from the device registry also removes its entities.
+        """
+        device_ids = set(device_ids)
+        if not device_ids:
+            return
+
+        self.entities = [e for e in self.entities if e.device_id not in device_ids]
+        self._device_index = None
+        for device_id in device_ids:
+            _ = self._device_entities.pop(device_id, None)
+            _ = self._device_covered_attrs.pop(device_id, None)
+        self._entity_ids_stale = True
+
+        dreg = device_registry.async_get(self.hass)
+        for device_id in device_ids:
+            _ = self._device_listeners.pop(device_id, None)
+            device = dreg.async_get_device(
+                identifiers=get_device_identifiers(self.id, device_id)
+            )
+            if device is not None:
+                dreg.async_remove_device(device.id)
+            _LOGGER.info("Removed device %s, which was deleted from the hub", device_id)
+
+    def _index_entity_ids(self, entities: list[UpdateableEntity] | None = None) -> None:
+        """Add entities to the entity ID map, or rebuild the map from all
+        entities if none are given.
+
+        Entities without IDs, such as disabled entities, are kept aside and
+        only checked again when a lookup misses.
+        """
+        if entities is None:
+            entities = self.entities
+            self._entities_by_id = {}
+            self._entity_ids_stale = False
+
+        unindexed: list[UpdateableEntity] = []
+        for entity in entities:
+            entity_id = cast(str | None, getattr(entity, "entity_id", None))
+            if entity_id:
+                self._entities_by_id[entity_id] = entity
+            else:
+                unindexed.append(entity)
+        self._unindexed_entities = unindexed
+
+    @callback
+    def _handle_entity_registry_update(
+        self, event: HassEvent[entity_registry.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Update the entity ID map when one of this hub's entities is renamed
+        or removed."""
+        data = event.data
+        if data["action"] == "update" and "old_entity_id" in data:
+            # Home Assistant re-adds the entity with its new ID shortly after
+            # this, but it can be found by the new ID right away
+            entity = self._entities_by_id.pop(data["old_entity_id"], None)
+            if entity is not None:
+                self._entities_by_id[data["entity_id"]] = entity
+        elif data["action"] == "remove":
+            _ = self._entities_by_id.pop(data["entity_id"], None)
+
+    def _set_hub_state(self, state: str) -> None:
+        """Set the state of the hub entity."""
+        self.hass.states.async_set(self.entity_id, state, self.get_state_attributes())
+
+    def _write_pending_states(self) -> None:
+        """Write the states of entities updated during a batch of events."""
+        pending = self._pending_writes
+        self._pending_writes = {}
+        for entity in pending.values():
+            entity.async_schedule_update_ha_state()
+
+    async def _handle_webhook(
+        self, hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> None:
+        """Handle an event posted by the hub to this hub's webhook."""
+        event = cast(dict[str, Any], decode_json(await request.read()))
+        self._hub.process_event(event)
+
     def handle_event(self, event: Event) -> None:
         """Handle events received from the Hubitat hub."""
-        if self._device_listeners[event.device_id]:
-            for listener in self._device_listeners[event.device_id]:
+        if self._pending_confirmations and event.type != EVENT_TYPE_REFRESH:
+            self._confirm(event)
+        listeners = self._device_listeners.get(event.device_id)
+        if listeners:
+            for listener in (
+                *listeners.get(event.attribute, ()),
+                *listeners.get(_ANY_ATTRIBUTE, ()),
+            ):
                 try:
                     listener(event)
                 except Exception as e:
                     _LOGGER.warning(f"Error handling event {event}: {e}")
-        if event.attribute in _TRIGGER_ATTRS:
+        if event.attribute in _TRIGGER_ATTRS and event.type != EVENT_TYPE_REFRESH:
             evt: dict[str, Any] = dict(event)
             evt[ATTR_ATTRIBUTE] = _TRIGGER_ATTR_MAP[event.attribute]
             evt[ATTR_HUB] = self.id
@@ -835,12 +1522,164 @@ async def _update_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     _ = await hass.config_entries.async_reload(config_entry.entry_id)
 
 
+class DeviceIndex:
+    """A hub's devices grouped by capability and attribute.
+
+    The index is built in a single pass over the devices so that each entity
+    type only needs to check the devices that could have it, rather than
+    every device.
+    """
+
+    def __init__(self, devices: Mapping[str, Device]) -> None:
+        self._devices: Mapping[str, Device] = devices
+        self._order: dict[str, int] = {}
+        self._by_capability: dict[str, list[Device]] = {}
+        self._by_attribute: dict[str, list[Device]] = {}
+
+        for order, (device_id, device) in enumerate(devices.items()):
+            self._order[device_id] = order
+            for capability in device.capability_set:
+                self._by_capability.setdefault(capability, []).append(device)
+            for attribute in device.attributes:
+                self._by_attribute.setdefault(attribute, []).append(device)
+
+    def get_devices(
+        self,
+        capabilities: Iterable[str] = (),
+        attribute: str | None = None,
+        device_ids: Iterable[str] = (),
+    ) -> list[Device]:
+        """Return the devices with any of the given capabilities or the given
+        attribute, along with the devices with the given IDs.
+
+        Devices are returned in hub order.
+        """
+        found: dict[str, Device] = {}
+        for capability in capabilities:
+            for device in self._by_capability.get(capability, ()):
+                found[device.id] = device
+        if attribute is not None:
+            for device in self._by_attribute.get(attribute, ()):
+                found[device.id] = device
+        for device_id in device_ids:
+            if device_id in self._devices:
+                found[device_id] = self._devices[device_id]
+        return sorted(found.values(), key=lambda d: self._order.get(d.id, 0))
+
+
+class _PendingConfirmation:
+    """An optimistic attribute value waiting to be confirmed by the hub."""
+
+    def __init__(
+        self, value: str | float, previous: Any, cancel: CALLBACK_TYPE
+    ) -> None:
+        self.value: str | float = value
+        self.previous: Any = previous
+        self.cancel: CALLBACK_TYPE = cancel
+        self.sent_at: float = time.monotonic()
+
+
+class _ConfirmationStats:
+    """Counters for optimistic attribute values."""
+
+    def __init__(self) -> None:
+        self.confirmed: int = 0
+        self.corrected: int = 0
+        self.rolled_back: int = 0
+        self.last_latency: float | None = None
+        self._total_latency: float = 0.0
+
+    def add_confirmed(self, latency: float) -> None:
+        self.confirmed += 1
+        self._add_latency(latency)
+
+    def add_corrected(self, latency: float) -> None:
+        self.corrected += 1
+        self._add_latency(latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as hub entity attributes."""
+        reported = self.confirmed + self.corrected
+        return {
+            "commands_confirmed": self.confirmed,
+            "commands_corrected": self.corrected,
+            "commands_rolled_back": self.rolled_back,
+            "confirmation_latency_ms": _to_ms(self.last_latency),
+            "mean_confirmation_latency_ms": (
+                _to_ms(self._total_latency / reported) if reported else None
+            ),
+        }
+
+    def _add_latency(self, latency: float) -> None:
+        self.last_latency = latency
+        self._total_latency += latency
+
+
+def _to_ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _values_match(a: Any, b: Any) -> bool:
+    """Return True if two attribute values are the same.
+
+    Numbers are compared numerically since the hub may report a commanded
+    value in a different form, such as "72" for 72.0.
+    """
+    try:
+        return float(a) == float(b)
+    except (TypeError, ValueError):
+        return str(a) == str(b)
+
+
 def get_hub(hass: HomeAssistant, config_entry_id: str) -> Hub:
     """Get the Hub device associated with a given config entry."""
     domain_data = get_domain_data(hass)
     return domain_data[config_entry_id]
 
 
+def _get_server_mode(entry: ConfigEntry) -> ServerMode:
+    """Return how a config entry's hub should receive events."""
+    mode = cast(
+        str | None,
+        entry.options.get(H_CONF_SERVER_MODE, entry.data.get(H_CONF_SERVER_MODE)),
+    )
+    return ServerMode(mode) if mode else ServerMode.THREAD
+
+
+def _get_webhook_id(entry: ConfigEntry) -> str:
+    """Return the ID of the webhook a config entry's hub posts events to.
+
+    The ID is stable across restarts so the hub's post URL stays valid, and is
+    derived from the access token so it can't be guessed.
+    """
+    token = cast(str, entry.data.get(CONF_ACCESS_TOKEN))
+    hasher = sha256()
+    hasher.update(f"{entry.entry_id}:{token}".encode())
+    return f"{DOMAIN}_{hasher.hexdigest()}"
+
+
+def _get_webhook_url(
+    hass: HomeAssistant, entry: ConfigEntry, base_url: str | None
+) -> str:
+    """Return the URL the hub should post events to in webhook mode.
+
+    If a server URL was configured, it's used as the base URL of Home
+    Assistant. Otherwise Home Assistant's internal URL is used. Setup is
+    retried later if Home Assistant doesn't have a URL yet.
+    """
+    webhook_id = _get_webhook_id(entry)
+    if base_url:
+        return f"{base_url.rstrip('/')}{webhook.async_generate_path(webhook_id)}"
+    try:
+        return webhook.async_generate_url(
+            hass, webhook_id, allow_ip=True, prefer_external=False
+        )
+    except NoURLAvailableError as e:
+        raise ConfigEntryNotReady(
+            "Unable to determine a Home Assistant URL for the event webhook"
+        ) from e
+
+
 def _create_ssl_context(ssl_cert: str | None, ssl_key: str | None) -> SSLContext | None:
     if (
         ssl_cert is not None
@@ -856,7 +1695,7 @@ def _create_ssl_context(ssl_cert: str | None, ssl_key: str | None) -> SSLContext
 
 
 def _migrate_entity_unique_ids(
-    hass: HomeAssistant, hub_id: str, old_token: str
+    hass: HomeAssistant, hub_id: str, old_token: str, config_entry_id: str
 ) -> None:
     """Migrate entity unique IDs from old token-hash format to new hub-id format.
 
@@ -869,8 +1708,8 @@ def _migrate_entity_unique_ids(
 
     entities_to_update: list[tuple[str, str]] = []
 
-    for entity_id in ereg.entities:
-        entity = ereg.entities[entity_id]
+    for entity in entity_registry.async_entries_for_config_entry(ereg, config_entry_id):
+        entity_id = entity.entity_id
         if not entity.unique_id:
             _LOGGER.warning("Skipping entity %s with no unique_id", entity.entity_id)
             continue
@@ -895,12 +1734,11 @@ def _migrate_entity_unique_ids(
         _LOGGER.info("Migrated entity %s unique_id to %s", entity_id, new_unique_id)
 
 
-def _update_device_ids(hub_id: str, hass: HomeAssistant) -> None:
+def _update_device_ids(hub_id: str, hass: HomeAssistant, config_entry_id: str) -> None:
     dreg = device_registry.async_get(hass)
-    all_devices = [dreg.devices[id] for id in dreg.devices]
 
     hubitat_devices: list[DeviceEntry] = []
-    for dev in all_devices:
+    for dev in device_registry.async_entries_for_config_entry(dreg, config_entry_id):
         ids = list(dev.identifiers)
         if len(ids) != 1:
             continue
@@ -987,47 +1825,40 @@ def _update_device_ids(hub_id: str, hass: HomeAssistant) -> None:
             )
 
 
-def _update_device_rooms(hub: Hub, hass: HomeAssistant) -> None:
-    """Update the area ID of devices in Home Assistant to match the room from
-    Hubitat
-    """
-
-    _LOGGER.debug("Synchronizing device rooms...")
-
-    dreg = device_registry.async_get(hass)
-    all_devices = [dreg.devices[id] for id in dreg.devices]
-    hubitat_devices: list[DeviceEntry] = []
-    for dev in all_devices:
-        ids = list(dev.identifiers)
-        if len(ids) != 1:
-            continue
-        id_set = ids[0]
-        if id_set[0] == DOMAIN and dev.name != HUB_NAME:
-            hubitat_devices.append(dev)
+def _get_rooms_hash(rooms: dict[str, str | None]) -> str:
+    """Return a hash of a mapping of device IDs to rooms."""
+    data = json.dumps(rooms, sort_keys=True, separators=(",", ":"))
+    return sha256(data.encode()).hexdigest()
 
-    areg = area_registry.async_get(hass)
 
-    for device_id in hub.devices:
-        # if the device area from Hubitat is defined and differs from
-        # Home Assistant, update the device area ID
-        device = hub.devices[device_id]
-        identifiers = get_device_identifiers(hub.id, device.id)
-        hass_device = dreg.async_get_device(identifiers)
-
-        if not hass_device:
-            _LOGGER.debug(
-                "Skipping room check for %s because no HA device", device.name
-            )
-            continue
-
-        if device.room:
-            area = areg.async_get_or_create(device.room)
-            if hass_device.area_id != area.id:
-                _ = dreg.async_update_device(hass_device.id, area_id=area.id)
-                _LOGGER.debug("Updated location of %s to %s", device.name, area.id)
-        elif hass_device.area_id:
-            _ = dreg.async_clear_area_id(hass_device.id)
-            _LOGGER.debug("Cleared location of %s", device.name)
+def _get_hub_device_properties(hub: HubitatHub) -> dict[str, Any]:
+    """Return the properties of the proxy Device representing a hub."""
+    return {
+        "id": get_hub_short_id(hub),
+        "name": HUB_DEVICE_NAME,
+        "label": HUB_DEVICE_NAME,
+        "model": "Cx",
+        "manufacturer": HUB_NAME,
+        "attributes": [
+            {
+                "name": "mode",
+                "currentValue": hub.mode,
+                "dataType": "ENUM",
+            },
+            {
+                "name": "hsm_status",
+                "currentValue": hub.hsm_status,
+                "dataType": "ENUM",
+            },
+            {
+                "name": "circuit_state",
+                "currentValue": hub.circuit_state,
+                "dataType": "ENUM",
+            },
+        ],
+        "capabilities": [],
+        "commands": [],
+    }
 
 
 def get_domain_data(hass: HomeAssistant) -> dict[str, Hub]:
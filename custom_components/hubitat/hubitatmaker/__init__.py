@@ -2,33 +2,51 @@ __version__ = "0.6.1"
 
 from .const import (
     DEFAULT_FAN_SPEEDS,
+    EVENT_TYPE_REFRESH,
     ID_HSM_STATUS,
     ID_MODE,
+    CircuitState,
     DeviceAttribute,
     DeviceCapability,
     DeviceCommand,
     DeviceState,
+    EventServerMode,
     HubitatColorMode,
 )
-from .error import ConnectionError, InvalidConfig, InvalidToken, RequestError
-from .hub import Hub
+from .decoder import decode_json, get_json_decoder, set_json_decoder
+from .error import (
+    CircuitOpenError,
+    ConnectionError,
+    InvalidConfig,
+    InvalidToken,
+    RequestError,
+)
+from .hub import DEFAULT_LOAD_CONCURRENCY, Hub
 from .types import Attribute, Device, Event
 
 __all__ = [
     "Attribute",
+    "CircuitOpenError",
+    "CircuitState",
     "HubitatColorMode",
     "ConnectionError",
     "DEFAULT_FAN_SPEEDS",
+    "DEFAULT_LOAD_CONCURRENCY",
     "Device",
     "DeviceAttribute",
     "DeviceCapability",
     "DeviceCommand",
     "DeviceState",
+    "EVENT_TYPE_REFRESH",
     "Event",
+    "EventServerMode",
     "Hub",
     "ID_HSM_STATUS",
     "ID_MODE",
     "InvalidConfig",
     "InvalidToken",
     "RequestError",
+    "decode_json",
+    "get_json_decoder",
+    "set_json_decoder",
 ]
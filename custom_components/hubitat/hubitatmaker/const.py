@@ -84,6 +84,7 @@ class DeviceAttribute(StrEnum):
     CARBON_DIOXIDE_LEVEL = "carbonDioxide-Level"
     CARBON_MONOXIDE = "carbonMonoxide"
     CARBON_MONOXIDE_LEVEL = "carbonMonoxide-Level"
+    CIRCUIT_STATE = "circuit_state"
     CLIP = "clip"
     CODE_CHANGED = "codeChanged"
     CODE_LENGTH = "codeLength"
@@ -309,9 +310,42 @@ class HubitatColorMode(StrEnum):
     CT = "CT"
 
 
+class EventServerMode(StrEnum):
+    """How events POSTed by the hub are received."""
+
+    # An event server running in a background thread with its own event loop
+    THREAD = "thread"
+    # An event server running on the event loop the Hub was started on
+    LOOP = "loop"
+    # Events are received by the caller and passed to Hub.process_event
+    EXTERNAL = "external"
+
+
+class CircuitState(StrEnum):
+    """The state of a hub's request circuit breaker."""
+
+    # Requests are sent normally
+    CLOSED = "closed"
+    # The hub is failing, so requests fail without being sent
+    OPEN = "open"
+    # A single request is being sent to see whether the hub has recovered
+    HALF_OPEN = "half_open"
+
+
 ID_MODE = "hub_mode"
 ID_HSM_STATUS = "hub_hsm_status"
 
+# The event type of events generated when a device refresh changes an attribute
+EVENT_TYPE_REFRESH = "refresh"
+
+# Attributes that report momentary actions rather than state
+MOMENTARY_ATTRIBUTES = (
+    DeviceAttribute.DOUBLE_TAPPED,
+    DeviceAttribute.HELD,
+    DeviceAttribute.PUSHED,
+    DeviceAttribute.RELEASED,
+)
+
 DEFAULT_FAN_SPEEDS = [
     "low",
     "medium-low",
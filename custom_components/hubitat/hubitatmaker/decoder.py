@@ -0,0 +1,58 @@
+"""JSON decoding for Maker API responses and event bodies.
+
+orjson is used when it's installed, since it's considerably faster for large
+payloads such as devices/all snapshots. Otherwise the standard library decoder
+is used. Both decode bytes directly, so response bodies don't need to be
+converted to text first.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+JsonDecoder = Callable[[bytes | str], Any]
+
+DECODERS: dict[str, JsonDecoder] = {"stdlib": json.loads}
+
+try:
+    import orjson
+
+    DECODERS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+_decoder_name = "orjson" if "orjson" in DECODERS else "stdlib"
+_decoder = DECODERS[_decoder_name]
+
+
+def decode_json(data: bytes | str) -> Any:
+    """Decode a JSON document.
+
+    Invalid documents raise a ValueError (json.JSONDecodeError) whichever
+    decoder is in use.
+    """
+    return _decoder(data)
+
+
+def get_json_decoder() -> str:
+    """Return the name of the decoder in use."""
+    return _decoder_name
+
+
+def set_json_decoder(decoder: str | JsonDecoder) -> None:
+    """Set the decoder used for all Maker API JSON.
+
+    decoder:
+      The name of an available decoder ("orjson" or "stdlib"), or a function
+      that decodes a JSON document from bytes or a string.
+    """
+    global _decoder, _decoder_name
+
+    if isinstance(decoder, str):
+        if decoder not in DECODERS:
+            raise ValueError(f"JSON decoder '{decoder}' is not available")
+        _decoder_name = decoder
+        _decoder = DECODERS[decoder]
+    else:
+        _decoder_name = getattr(decoder, "__name__", "custom")
+        _decoder = decoder
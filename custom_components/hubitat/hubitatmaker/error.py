@@ -5,6 +5,10 @@ class ConnectionError(Exception):
     """Error when hub isn't responding."""
 
 
+class CircuitOpenError(ConnectionError):
+    """Error when a request wasn't sent because the hub has been failing."""
+
+
 class InvalidToken(Exception):
     """Error for invalid access token."""
 
@@ -23,5 +27,8 @@ class InvalidMode(Exception):
 class RequestError(Exception):
     """An error indicating that a request failed."""
 
+    status: int
+
     def __init__(self, resp: ClientResponse, **kwargs: object):
         super().__init__(f"{resp.method} {resp.url} - [{resp.status}] {resp.reason}")
+        self.status = resp.status
@@ -2,8 +2,12 @@
 
 import asyncio
 import json
+import random
+import re
 import socket
-from collections.abc import Iterator, Mapping
+import time
+from collections import deque
+from collections.abc import Hashable, Iterator, Mapping
 from contextlib import contextmanager
 from logging import getLogger
 from ssl import SSLContext
@@ -17,18 +21,61 @@ from aiohttp.client_exceptions import (
     ContentTypeError,
 )
 
-from .const import ID_HSM_STATUS, ID_MODE, DeviceAttribute
-from .error import InvalidConfig, InvalidMode, InvalidToken, RequestError
-from .server import Server, create_server
+from .const import (
+    EVENT_TYPE_REFRESH,
+    ID_HSM_STATUS,
+    ID_MODE,
+    MOMENTARY_ATTRIBUTES,
+    CircuitState,
+    DeviceAttribute,
+    DeviceCommand,
+    EventServerMode,
+)
+from .decoder import decode_json
+from .error import (
+    CircuitOpenError,
+    InvalidConfig,
+    InvalidMode,
+    InvalidToken,
+    RequestError,
+)
+from .metrics import HubMetrics
+from .server import (
+    DEFAULT_MAX_QUEUED_EVENTS,
+    EventReceiver,
+    async_add_shared_receiver,
+    async_remove_shared_receiver,
+    remove_shared_receiver,
+)
 from .types import Device, Event, Mode
 
 Listener = Callable[[Event], None]
+BatchListener = Callable[[], None]
+CircuitListener = Callable[[CircuitState], None]
 
 MAX_REQUEST_ATTEMPT_COUNT = 3
 REQUEST_RETRY_DELAY_INTERVAL = 0.5
+MAX_REQUEST_RETRY_DELAY = 4.0
+
+# Circuit breaker settings: the number of consecutive failed requests that open
+# the circuit, and the bounds on how long it stays open before a probe
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_MIN_OPEN_TIME = 1.0
+CIRCUIT_MAX_OPEN_TIME = 15.0
+
+# Connection pool settings for Maker API requests
+DEFAULT_CONNECTION_LIMIT = 16
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 8
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+# Number of device requests that may be in flight while loading devices
+DEFAULT_LOAD_CONCURRENCY = 4
 
 _LOGGER = getLogger(__name__)
 
+# Tasks closing sessions of stopped hubs
+_closing_tasks: set[asyncio.Task[None]] = set()
+
 
 class Hub:
     """A representation of a Hubitat hub.
@@ -45,7 +92,8 @@ class Hub:
     token: str
     mac: str
 
-    _server: Server | None = None
+    _receiver: EventReceiver | None = None
+    _session: aiohttp.ClientSession | None = None
 
     def __init__(
         self,
@@ -55,6 +103,14 @@ class Hub:
         port: int | None = None,
         event_url: str | None = None,
         ssl_context: SSLContext | None = None,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        connection_limit_per_host: int = DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        load_concurrency: int = DEFAULT_LOAD_CONCURRENCY,
+        bulk_load: bool = True,
+        event_server_mode: EventServerMode = EventServerMode.THREAD,
+        event_batch_window: float = 0,
+        max_queued_events: int = DEFAULT_MAX_QUEUED_EVENTS,
     ):
         """Initialize a Hubitat hub interface.
 
@@ -68,12 +124,48 @@ class Hub:
           The access token for the Maker API instance
         port:
           The port to listen on for events (optional). Defaults to a random open port.
+          Hubs listening on the same port, including hubs using the default, share
+          one event server, which routes events to each hub by URL path.
         event_url:
           The URL that Hubitat should send events to (optional). Defaults the server's
-          actual address and port.
+          actual address and port, and a path for this hub. Events posted to a URL
+          without the hub's path are routed by the address they came from.
         ssl_context:
           The SSLContext the event listener server will use. Passing in a SSLContext
           object will make the event listener server HTTPS only.
+        connection_limit:
+          The maximum number of simultaneous connections in the Maker API
+          connection pool.
+        connection_limit_per_host:
+          The maximum number of simultaneous connections to the hub.
+        keepalive_timeout:
+          The number of seconds an idle connection to the hub is kept open for
+          reuse.
+        load_concurrency:
+          The maximum number of device requests that may be in flight while
+          loading devices. The effective limit shrinks while the hub reports
+          that it is overloaded.
+        bulk_load:
+          If True (the default), load all devices with a single devices/all
+          request, falling back to per-device requests for devices whose
+          entries are incomplete.
+        event_server_mode:
+          How events are received. THREAD (the default) runs the event server
+          in a background thread, LOOP runs it on the event loop the hub is
+          started on, and EXTERNAL starts no server; the caller must receive
+          events itself and pass them to process_event. In EXTERNAL mode,
+          event_url should be the address of the caller's receiver.
+        event_batch_window:
+          The number of seconds to collect events for before dispatching them
+          (optional). Within a window, repeated events for the same device
+          attribute are coalesced so listeners only see the latest value;
+          momentary events such as button pushes are never coalesced. The
+          default of 0 dispatches every event as soon as it's received.
+        max_queued_events:
+          The maximum number of events a THREAD mode event server holds while
+          waiting for the event loop to process them. When the limit is
+          reached, a new event replaces the queued event for the same device
+          attribute, or else the oldest queued event is dropped.
         """
         if not host or not app_id or not access_token:
             raise InvalidConfig()
@@ -91,6 +183,25 @@ class Hub:
         self.token = access_token
         self.mac = ""
         self.ssl_context: SSLContext | None = ssl_context
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.load_concurrency = max(1, load_concurrency)
+        self.bulk_load = bulk_load
+        self._bulk_supported: bool | None = None
+        self._device_markers: dict[str, str] = {}
+        self.event_server_mode = event_server_mode
+        self.event_batch_window = event_batch_window
+        self.max_queued_events = max_queued_events
+        self._batch_listeners: list[BatchListener] = []
+        self._pending_events: dict[Hashable, dict[str, Any]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._in_batch = False
+        self._command_queues: dict[str, deque[_QueuedCommand]] = {}
+        self._command_workers: dict[str, asyncio.Task[None]] = {}
+        self._circuit_listeners: list[CircuitListener] = []
+        self._circuit = _CircuitBreaker(self._notify_circuit_listeners)
+        self._metrics = HubMetrics()
 
         self.set_host(host)
 
@@ -131,6 +242,57 @@ class Hub:
     def hsm_supported(self) -> bool | None:
         return self._hsm_supported
 
+    @property
+    def circuit_state(self) -> CircuitState:
+        """The state of the circuit breaker for Maker API requests."""
+        return self._circuit.state
+
+    @property
+    def circuit_retry_in(self) -> float:
+        """Seconds until a request may be sent to check whether the hub has
+        recovered, or 0 if the circuit is closed."""
+        return self._circuit.retry_in
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Request, retry, payload size, event, and listener timing metrics.
+
+        Request metrics are grouped by endpoint, and event counts by device
+        and attribute.
+        """
+        return self._metrics.as_dict()
+
+    @property
+    def metrics_summary(self) -> dict[str, int | float | None]:
+        """Request and event totals, which are cheaper to compute than the
+        full metrics."""
+        return self._metrics.summary()
+
+    @property
+    def event_stats(self) -> dict[str, int]:
+        """Counters for events received by the event server, including
+        events coalesced or dropped because the event queue was full."""
+        if self._receiver is None:
+            return {}
+        return self._receiver.stats
+
+    @property
+    def in_batch(self) -> bool:
+        """True while a batch of events is being dispatched to listeners."""
+        return self._in_batch
+
+    def add_batch_listener(self, listener: BatchListener) -> None:
+        """Listen for the end of each batch of events.
+
+        Listeners for events dispatched as part of a batch (while in_batch is
+        True) may defer work until the batch listeners are called.
+        """
+        self._batch_listeners.append(listener)
+
+    def add_circuit_listener(self, listener: CircuitListener) -> None:
+        """Listen for changes to the request circuit breaker's state."""
+        self._circuit_listeners.append(listener)
+
     def add_device_listener(self, device_id: str, listener: Listener) -> None:
         """Listen for updates for a particular device."""
         if device_id not in self._listeners:
@@ -149,6 +311,14 @@ class Hub:
             self._listeners[ID_HSM_STATUS] = []
         self._listeners[ID_HSM_STATUS].append(listener)
 
+    def remove_batch_listeners(self) -> None:
+        """Remove all listeners for the end of event batches."""
+        self._batch_listeners = []
+
+    def remove_circuit_listeners(self) -> None:
+        """Remove all listeners for circuit breaker changes."""
+        self._circuit_listeners = []
+
     def remove_device_listeners(self, device_id: str) -> None:
         """Remove all listeners for a particular device."""
         self._listeners[device_id] = []
@@ -175,14 +345,32 @@ class Hub:
     async def load_devices(self, force_refresh: bool = False) -> None:
         """Load the current state of all devices."""
         if force_refresh or len(self._devices) == 0:
-            devices = cast(list[dict[str, Any]], await self._api_request("devices"))
-            _LOGGER.debug("Loaded device list")
+            _ = await self._load_listed_devices(lambda _entry: True)
+
+    async def sync_devices(self) -> list[str]:
+        """Bring the known devices up to date with the hub.
 
-            # load devices sequentially to avoid overloading the hub
-            for dev in devices:
-                await self._load_device(cast(str, dev["id"]), force_refresh)
+        Only devices that are new, or whose last activity time has changed
+        since they were last loaded, are downloaded, and devices that the hub
+        no longer lists are dropped. When reconnecting after a brief outage
+        this costs far fewer requests than a forced refresh. Devices are
+        always reloaded if the hub doesn't report their activity times.
 
-    async def start(self, force_refresh: bool = False) -> None:
+        Returns the IDs of the dropped devices.
+        """
+        listed = await self._load_listed_devices(self._is_device_stale)
+
+        removed = [id for id in self._devices if id not in listed]
+        for device_id in removed:
+            del self._devices[device_id]
+            _ = self._listeners.pop(device_id, None)
+            _ = self._device_markers.pop(device_id, None)
+
+        if removed:
+            _LOGGER.info("Dropped %d devices removed from the hub", len(removed))
+        return removed
+
+    async def start(self, force_refresh: bool = False, sync: bool = False) -> None:
         """Download initial state data, and start an event server if requested.
 
         Hub and device data will not be available until this method has
@@ -193,15 +381,25 @@ class Hub:
           If True, force a refresh of all device data even if devices have
           already been loaded. This is useful when reconnecting after a
           failed initialization.
+        sync:
+          If True, update already loaded devices with sync_devices rather
+          than reloading all of them. This is useful when reconnecting after
+          the hub was briefly unreachable.
         """
 
         self._mode_supported = None
         self._hsm_supported = None
 
+        # Open the pooled session used for all Maker API requests
+        _ = self._get_session()
+
         # First verify we can connect to the hub by loading devices
         # Don't start the event server until we know the hub is reachable
         try:
-            await self.load_devices(force_refresh=force_refresh)
+            if sync:
+                _ = await self.sync_devices()
+            else:
+                await self.load_devices(force_refresh=force_refresh)
             _LOGGER.debug("Connected to Hubitat hub at %s", self.host)
         except aiohttp.ClientError as e:
             raise ConnectionError(str(e))
@@ -224,11 +422,74 @@ class Hub:
         await self._start_server()
 
     def stop(self) -> None:
-        """Remove all listeners and stop the event server (if running)."""
-        if self._server:
-            self._server.stop()
-            _LOGGER.debug("Stopped event server")
+        """Remove all listeners, stop the event server (if running), and close
+        the Maker API session."""
+        if self._receiver:
+            remove_shared_receiver(self._receiver)
+            self._receiver = None
+            _LOGGER.debug("Stopped receiving events")
         self._listeners = {}
+        self._batch_listeners = []
+        self._circuit_listeners = []
+
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_events = {}
+
+        for worker in self._command_workers.values():
+            _ = worker.cancel()
+        for queue in self._command_queues.values():
+            for queued in queue:
+                queued.cancel()
+        self._command_workers = {}
+        self._command_queues = {}
+
+        if self._session:
+            session = self._session
+            self._session = None
+            _schedule_close(session)
+            _LOGGER.debug("Closed Maker API session")
+
+    async def async_stop(self) -> None:
+        """Stop the hub, waiting for the event server to shut down if no other
+        hub is using it, so its port can be reused right away."""
+        await self._stop_server()
+        self.stop()
+
+    def export_state(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the hub's device, mode, and
+        HSM data."""
+        return {
+            "devices": [d.properties for d in self._devices.values()],
+            "modes": [dict(m) for m in self._modes],
+            "hsm_status": self._hsm_status,
+            "device_markers": dict(self._device_markers),
+        }
+
+    def restore_state(self, state: Mapping[str, Any]) -> None:
+        """Seed device, mode, and HSM data from a snapshot created by
+        export_state.
+
+        Restored data is refreshed from the hub when the hub is started with
+        force_refresh or sync. Attributes whose values changed are reported to device
+        listeners as refresh events.
+        """
+        for properties in cast(list[dict[str, Any]], state.get("devices", [])):
+            device = Device(properties)
+            self._devices[device.id] = device
+        self._device_markers.update(
+            cast(dict[str, str], state.get("device_markers") or {})
+        )
+
+        modes = cast(list[dict[str, Any]], state.get("modes") or [])
+        self._modes = [Mode(m) for m in modes]
+        self._mode_supported = len(self._modes) > 0
+
+        self._hsm_status = cast(str | None, state.get("hsm_status"))
+        self._hsm_supported = self._hsm_status is not None
+
+        _LOGGER.debug("Restored %d devices", len(self._devices))
 
     async def refresh_device(self, device_id: str) -> None:
         """Refresh a device's state."""
@@ -237,7 +498,73 @@ class Hub:
     async def send_command(
         self, device_id: str, command: str, arg: str | int | None
     ) -> dict[str, Any]:
-        """Send a device command to the hub."""
+        """Send a device command to the hub.
+
+        Commands for a device are sent one at a time, in the order they were
+        issued, while commands for different devices are sent concurrently.
+        If a single-value setter like setLevel is the last command waiting to
+        be sent when the same setter is issued again for the device, the
+        queued command is given the new value and all of its callers receive
+        the result. A setter with other commands queued after it is left
+        alone, so commands are never reordered.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._command_queues.setdefault(device_id, deque())
+        waiter: asyncio.Future[dict[str, Any]] = loop.create_future()
+
+        if queue and queue[-1].command == command and _is_last_write_wins(command, arg):
+            queued = queue[-1]
+            _LOGGER.debug(
+                "Replaced queued command %s(%s) for %s with %s(%s)",
+                command,
+                queued.arg,
+                device_id,
+                command,
+                arg,
+            )
+            queued.arg = arg
+        else:
+            queued = _QueuedCommand(command, arg)
+            queue.append(queued)
+        queued.waiters.append(waiter)
+
+        if device_id not in self._command_workers:
+            self._command_workers[device_id] = loop.create_task(
+                self._run_commands(device_id, queue)
+            )
+
+        return await waiter
+
+    async def _run_commands(
+        self, device_id: str, queue: deque["_QueuedCommand"]
+    ) -> None:
+        """Send a device's queued commands until its queue is empty."""
+        try:
+            while queue:
+                queued = queue.popleft()
+                try:
+                    result = await self._send_command(
+                        device_id, queued.command, queued.arg
+                    )
+                except asyncio.CancelledError:
+                    queued.cancel()
+                    raise
+                except Exception as e:
+                    queued.reject(e)
+                else:
+                    queued.resolve(result)
+        finally:
+            # The hub may have been stopped and restarted while this worker
+            # was sending
+            if self._command_workers.get(device_id) is asyncio.current_task():
+                del self._command_workers[device_id]
+                if not queue:
+                    _ = self._command_queues.pop(device_id, None)
+
+    async def _send_command(
+        self, device_id: str, command: str, arg: str | int | None
+    ) -> dict[str, Any]:
+        """Make a device command request."""
         path = f"devices/{device_id}/{command}"
         if arg:
             path += f"/{arg}"
@@ -246,11 +573,12 @@ class Hub:
 
     async def set_event_url(self, event_url: str | None) -> None:
         """Set the URL that Hubitat will POST device events to."""
-        if not self._server:
+        if self._receiver:
+            if not event_url:
+                event_url = self._receiver.url
+        elif self.event_server_mode != EventServerMode.EXTERNAL or not event_url:
             return
 
-        if not event_url:
-            event_url = self._server.url
         url = quote(str(event_url), safe="")
         _LOGGER.info("Setting event update URL to %s", url)
         await self._api_request(f"postURL/{url}")
@@ -295,8 +623,7 @@ class Hub:
         """
         self.port = port
         _LOGGER.info("Setting port to %s", port)
-        if self._server:
-            self._server.stop()
+        await self._stop_server()
         await self._start_server()
 
     async def set_ssl_context(self, ssl_context: SSLContext | None) -> None:
@@ -313,8 +640,7 @@ class Hub:
         else:
             _LOGGER.debug("Enabling SSL for event listener server")
 
-        if self._server:
-            self._server.stop()
+        await self._stop_server()
         await self._start_server()
 
     async def _check_api(self) -> None:
@@ -324,27 +650,71 @@ class Hub:
         """
         await self._api_request("devices")
 
-    def _process_event(self, event: dict[str, Any]) -> None:
-        """Process an event received from the hub."""
+    def process_event(self, event: dict[str, Any]) -> None:
+        """Process an event POSTed by the hub.
+
+        This is called by the hub's own event server, or by the caller when
+        the event_server_mode is EXTERNAL.
+        """
         try:
             content = cast(dict[str, Any], event["content"])
             _LOGGER.debug("Received event: %s", content)
+            self._metrics.record_event(content.get("deviceId"), content.get("name"))
         except KeyError:
             _LOGGER.warning("Received invalid event: %s", event)
             return
 
+        if self.event_batch_window <= 0:
+            self._dispatch_event(content)
+            return
+
+        # A coalesced event moves to the end of the batch so that events are
+        # dispatched in the order their latest values arrived
+        key = _get_coalesce_key(content)
+        _ = self._pending_events.pop(key, None)
+        self._pending_events[key] = content
+
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.event_batch_window, self._flush_events
+            )
+
+    def _flush_events(self) -> None:
+        """Dispatch the events collected during a batch window."""
+        self._flush_handle = None
+        events = list(self._pending_events.values())
+        self._pending_events = {}
+        _LOGGER.debug("Dispatching batch of %d events", len(events))
+
+        self._in_batch = True
+        try:
+            for content in events:
+                self._dispatch_event(content)
+        finally:
+            self._in_batch = False
+
+        for listener in self._batch_listeners:
+            listener()
+
+    def _dispatch_event(self, content: dict[str, Any]) -> None:
+        """Apply an event to the hub state and notify listeners."""
         if content["deviceId"] is not None:
             device_id = cast(str, content["deviceId"])
             name = cast(DeviceAttribute, content["name"])
             value = cast(int | str, content["value"])
             unit = cast(str, content["unit"])
-            self._update_device_attr(device_id, name, value, unit)
+            changed = self._update_device_attr(device_id, name, value, unit)
 
-            evt = Event(content)
+            # Repeated momentary events are distinct actions, not repeated
+            # values
+            evt = Event(content, changed or name in MOMENTARY_ATTRIBUTES)
 
-            if device_id in self._listeners:
-                for listener in self._listeners[device_id]:
+            listeners = self._listeners.get(device_id)
+            if listeners:
+                start = time.perf_counter()
+                for listener in listeners:
                     listener(evt)
+                self._metrics.record_fanout(time.perf_counter() - start)
         elif content["name"] == "mode":
             name = cast(str, content["value"])
             mode_set = False
@@ -363,14 +733,18 @@ class Hub:
 
             evt = Event(content)
 
+            start = time.perf_counter()
             for listener in self._listeners.get(ID_MODE, []):
                 listener(evt)
+            self._metrics.record_fanout(time.perf_counter() - start)
 
         elif content["name"] == "hsmStatus":
             self._hsm_status = content["value"]
             evt = Event(content)
+            start = time.perf_counter()
             for listener in self._listeners.get(ID_HSM_STATUS, []):
                 listener(evt)
+            self._metrics.record_fanout(time.perf_counter() - start)
 
     def _update_device_attr(
         self,
@@ -378,8 +752,11 @@ class Hub:
         attr_name: DeviceAttribute,
         value: int | str,
         value_unit: str,
-    ) -> None:
-        """Update a device attribute value."""
+    ) -> bool:
+        """Update a device attribute value.
+
+        Return False if the attribute already had the given value and unit.
+        """
         _LOGGER.debug(
             "Setting %s to %s (%s) for device %s from api %s at hub %s",
             attr_name,
@@ -398,10 +775,10 @@ class Hub:
                 self.app_id,
                 self.host,
             )
-            return
+            return True
 
         try:
-            dev.update_attr(attr_name, value, value_unit)
+            return dev.update_attr(attr_name, value, value_unit)
         except KeyError:
             _LOGGER.warning(
                 "Tried to update unknown attribute %s from api %s at hub %s",
@@ -409,21 +786,194 @@ class Hub:
                 self.app_id,
                 self.host,
             )
+            return True
 
     async def _load_device(self, device_id: str, force_refresh: bool = False) -> None:
         """Return full info for a specific device."""
         if force_refresh or device_id not in self._devices:
-            _LOGGER.debug("Loading device %s", device_id)
-            data = cast(dict[str, Any], await self._api_request(f"devices/{device_id}"))
+            data = await self._fetch_device(device_id)
+            self._store_device(device_id, data)
+
+    async def _load_listed_devices(
+        self, should_load: Callable[[dict[str, Any]], bool]
+    ) -> set[str]:
+        """Load the devices in the hub's device list that should_load accepts.
+
+        Returns the IDs of all the listed devices.
+        """
+        if self.bulk_load and self._bulk_supported is not False:
             try:
-                if device_id in self._devices:
-                    self._devices[device_id].update_state(data)
-                else:
-                    self._devices[device_id] = Device(data)
-            except Exception as e:
-                _LOGGER.error("Invalid device info: %s", data)
-                raise e
-            _LOGGER.debug("Loaded device %s", device_id)
+                listed = await self._load_devices_bulk(should_load)
+                self._bulk_supported = True
+                return listed
+            except RequestError as e:
+                if e.status >= 500 or e.status == 408:
+                    raise
+                # Older hub firmware doesn't provide devices/all
+                _LOGGER.info("Bulk device loading is unavailable: %s", e)
+                self._bulk_supported = False
+
+        entries = cast(list[dict[str, Any]], await self._api_request("devices"))
+        _LOGGER.debug("Loaded device list")
+
+        device_ids = [str(entry.get("id")) for entry in entries if should_load(entry)]
+        results = await self._fetch_devices(device_ids)
+
+        # Store devices in the order the hub listed them
+        for device_id in device_ids:
+            self._store_device(device_id, results[device_id])
+
+        return self._update_device_markers(entries)
+
+    async def _load_devices_bulk(
+        self, should_load: Callable[[dict[str, Any]], bool]
+    ) -> set[str]:
+        """Load devices from a single devices/all snapshot.
+
+        Devices whose snapshot entries are missing information are loaded
+        individually. Returns the IDs of all the listed devices.
+        """
+        entries = cast(list[dict[str, Any]], await self._api_request("devices/all"))
+        _LOGGER.debug("Loaded device snapshot")
+
+        device_ids: list[str] = []
+        results: dict[str, dict[str, Any]] = {}
+        incomplete: list[str] = []
+
+        for entry in entries:
+            if not should_load(entry):
+                continue
+            device_id = str(entry.get("id"))
+            device_ids.append(device_id)
+            properties = _bulk_device_properties(entry, self._devices.get(device_id))
+            if properties is None:
+                incomplete.append(device_id)
+            else:
+                results[device_id] = properties
+
+        if incomplete:
+            _LOGGER.debug("Loading %d incomplete devices", len(incomplete))
+            results.update(await self._fetch_devices(incomplete))
+
+        # Store devices in the order the hub listed them
+        for device_id in device_ids:
+            self._store_device(device_id, results[device_id])
+
+        return self._update_device_markers(entries)
+
+    def _is_device_stale(self, entry: dict[str, Any]) -> bool:
+        """Return True if a device list entry may differ from the loaded
+        device."""
+        device_id = str(entry.get("id"))
+        marker = entry.get("date")
+        return (
+            device_id not in self._devices
+            or marker is None
+            or str(marker) != self._device_markers.get(device_id)
+        )
+
+    def _update_device_markers(self, entries: list[dict[str, Any]]) -> set[str]:
+        """Record the last activity times of listed devices.
+
+        Events don't carry activity times, so a device that sends events
+        after this will be reloaded by the next sync. Returns the IDs of the
+        listed devices.
+        """
+        listed: set[str] = set()
+        for entry in entries:
+            device_id = str(entry.get("id"))
+            listed.add(device_id)
+            marker = entry.get("date")
+            if marker is None:
+                _ = self._device_markers.pop(device_id, None)
+            else:
+                self._device_markers[device_id] = str(marker)
+        return listed
+
+    async def _fetch_devices(self, device_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Download the full info for several devices.
+
+        Requests run through a bounded window so that a large hub doesn't
+        take a serial round trip per device, but also isn't flooded.
+        """
+        window = _LoadWindow(self.load_concurrency)
+        results: dict[str, dict[str, Any]] = {}
+
+        async def fetch(device_id: str) -> None:
+            async with window:
+                results[device_id] = await self._fetch_device(
+                    device_id, on_throttle=window.throttle
+                )
+                window.grow()
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for device_id in device_ids:
+                    _ = group.create_task(fetch(device_id))
+        except ExceptionGroup as e:
+            # Surface the first failure so callers see the same errors as
+            # they would from a single request
+            raise e.exceptions[0] from e
+
+        return results
+
+    async def _fetch_device(
+        self, device_id: str, on_throttle: Callable[[], None] | None = None
+    ) -> dict[str, Any]:
+        """Download the full info for a specific device."""
+        _LOGGER.debug("Loading device %s", device_id)
+        return cast(
+            dict[str, Any],
+            await self._api_request(f"devices/{device_id}", on_throttle=on_throttle),
+        )
+
+    def _store_device(self, device_id: str, data: dict[str, Any]) -> None:
+        """Create or update a device from downloaded device info."""
+        try:
+            if device_id in self._devices:
+                device = self._devices[device_id]
+                previous = {
+                    name: (attr.value, attr.unit)
+                    for name, attr in device.attributes.items()
+                }
+                device.update_state(data)
+                self._notify_changed_attrs(device, previous)
+            else:
+                self._devices[device_id] = Device(data)
+        except Exception as e:
+            _LOGGER.error("Invalid device info: %s", data)
+            raise e
+        _LOGGER.debug("Loaded device %s", device_id)
+
+    def _notify_changed_attrs(
+        self,
+        device: Device,
+        previous: Mapping[DeviceAttribute, tuple[Any, str | None]],
+    ) -> None:
+        """Send refresh events to a device's listeners for any attributes
+        that differ from their previous values."""
+        listeners = self._listeners.get(device.id)
+        if not listeners:
+            return
+
+        for name, attr in device.attributes.items():
+            if name == DeviceAttribute.LAST_UPDATE or name in MOMENTARY_ATTRIBUTES:
+                continue
+            if previous.get(name) == (attr.value, attr.unit):
+                continue
+
+            evt = Event(
+                {
+                    "deviceId": device.id,
+                    "displayName": device.label,
+                    "name": name,
+                    "value": attr.value,
+                    "unit": attr.unit,
+                    "type": EVENT_TYPE_REFRESH,
+                }
+            )
+            for listener in listeners:
+                listener(evt)
 
     async def _load_hsm_status(self) -> None:
         """Load the current hub HSM status."""
@@ -438,25 +988,64 @@ class Hub:
         self._modes = [Mode(m) for m in modes]
 
     async def _api_request(  # pyright: ignore[reportAny]
-        self, path: str, method: Literal["GET", "POST"] = "GET"
+        self,
+        path: str,
+        method: Literal["GET", "POST"] = "GET",
+        on_throttle: Callable[[], None] | None = None,
+    ) -> Any:
+        """Make a Maker API request.
+
+        on_throttle is called whenever the hub responds with a server error or
+        a request timeout, before the request is retried.
+
+        If recent requests have failed because the hub is down or overloaded,
+        a CircuitOpenError is raised without sending the request.
+        """
+        self._circuit.check()
+        try:
+            data = await self._send_request(path, method, on_throttle)  # pyright: ignore[reportAny]
+        except asyncio.CancelledError:
+            self._circuit.release()
+            raise
+        except Exception as e:
+            if _is_hub_failure(e):
+                self._circuit.record_failure()
+            else:
+                # The hub responded, so it's reachable
+                self._circuit.record_success()
+            raise
+        self._circuit.record_success()
+        return data  # pyright: ignore[reportAny]
+
+    async def _send_request(  # pyright: ignore[reportAny]
+        self,
+        path: str,
+        method: Literal["GET", "POST"],
+        on_throttle: Callable[[], None] | None,
     ) -> Any:
-        """Make a Maker API request."""
+        """Send a Maker API request, retrying on transient failures."""
         params = {"access_token": self.token}
 
+        session = self._get_session()
+
         attempt = 0
         while attempt <= MAX_REQUEST_ATTEMPT_COUNT:
             attempt += 1
-            conn = aiohttp.TCPConnector(ssl=False)
+            start = time.perf_counter()
             try:
-                async with aiohttp.request(
+                async with session.request(
                     method,
                     f"{self.api_url}/{path}",
                     params=params,
-                    connector=conn,
                 ) as resp:
                     if resp.status >= 400:
+                        self._metrics.record_request(
+                            path, time.perf_counter() - start, 0, resp.status
+                        )
                         # retry on server errors or request timeout w/ increasing delay
                         if resp.status >= 500 or resp.status == 408:
+                            if on_throttle:
+                                on_throttle()
                             if attempt < MAX_REQUEST_ATTEMPT_COUNT:
                                 _LOGGER.debug(
                                     "%s request to %s failed with code %d: %s."
@@ -466,9 +1055,8 @@ class Hub:
                                     resp.status,
                                     resp.reason,
                                 )
-                                await asyncio.sleep(
-                                    attempt * REQUEST_RETRY_DELAY_INTERVAL
-                                )
+                                self._metrics.record_retry(path)
+                                await asyncio.sleep(_get_retry_delay(attempt))
                                 continue
 
                         if resp.status == 401:
@@ -479,8 +1067,11 @@ class Hub:
                         # Manually parse the response as JSON because Hubitat
                         # sometimes mis-reports the content type as text/html
                         # even though the data is JSON
-                        text = await resp.text()
-                        data = json.loads(text)  # pyright: ignore[reportAny]
+                        body = await resp.read()
+                        self._metrics.record_request(
+                            path, time.perf_counter() - start, len(body), resp.status
+                        )
+                        data = decode_json(body)  # pyright: ignore[reportAny]
                         if "error" in data and data["error"]:
                             raise RequestError(resp)
                         return data  # pyright: ignore[reportAny]
@@ -493,10 +1084,12 @@ class Hub:
                 asyncio.TimeoutError,
                 ContentTypeError,
             ) as e:
+                self._metrics.record_request(path, time.perf_counter() - start, 0, None)
                 # Don't retry on connection errors - if we can't reach the hub,
-                # retrying immediately won't help. Higher-level retry logic will
-                # handle reconnection attempts. Do retry on timeouts and content
-                # errors as those might be transient.
+                # retrying immediately won't help. The circuit breaker and
+                # higher-level retry logic will handle reconnection attempts.
+                # Do retry on timeouts and content errors as those might be
+                # transient.
                 if (
                     not isinstance(e, ClientConnectionError)
                     and attempt < MAX_REQUEST_ATTEMPT_COUNT
@@ -507,35 +1100,346 @@ class Hub:
                         path,
                         str(e),
                     )
-                    await asyncio.sleep(attempt * REQUEST_RETRY_DELAY_INTERVAL)
+                    self._metrics.record_retry(path)
+                    await asyncio.sleep(_get_retry_delay(attempt))
                     continue
                 else:
                     raise e
-            finally:
-                await conn.close()
+
+    def _notify_circuit_listeners(self, state: CircuitState) -> None:
+        """Tell listeners that the circuit breaker changed state."""
+        for listener in self._circuit_listeners:
+            listener(state)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled Maker API session, creating it if necessary.
+
+        Connections to the hub are kept alive between requests so that
+        commands and device loads don't pay for a new TCP handshake.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=False,
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            _LOGGER.debug(
+                "Opened Maker API session (limit=%d, limit_per_host=%d)",
+                self.connection_limit,
+                self.connection_limit_per_host,
+            )
+        return self._session
 
     async def _start_server(self) -> None:
-        """Start an event listener server."""
+        """Start receiving events on the shared event listener server for this
+        hub's port, starting the server if necessary."""
+        # A connection attempt that was cancelled may have left a receiver
+        # registered
+        await self._stop_server()
+
+        if self.event_server_mode == EventServerMode.EXTERNAL:
+            await self.set_event_url(self.event_url)
+            return
+
         # First, figure out what address to listen on. Open a connection to
         # the Hubitat hub and see what address it used. This assumes this
-        # machine and the Hubitat hub are on the same network.
+        # machine and the Hubitat hub are on the same network. The host may
+        # include a port, which isn't needed here. The hub's resolved address
+        # identifies events posted without this hub's path.
+        hostname = urlparse(f"//{self.host}").hostname or self.host
         with _open_socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-            s.connect((self.host, 80))
+            s.connect((hostname, 80))
             address = cast(str, s.getsockname()[0])
+            remote = cast(str, s.getpeername()[0])
 
-        self._server = create_server(
-            self._process_event, address, self.port or 0, self.ssl_context
+        self._receiver = await async_add_shared_receiver(
+            _get_event_path(self.host, self.app_id),
+            self.process_event,
+            address,
+            self.port or 0,
+            self.ssl_context,
+            self.event_server_mode == EventServerMode.LOOP,
+            remote,
+            self.max_queued_events,
+            _get_event_key,
         )
-        self._server.start()
         _LOGGER.debug(
-            "Listening on %s:%d with SSL %s",
-            address,
-            self._server.port,
+            "Listening on %s with SSL %s",
+            self._receiver.url,
             "disabled" if self.ssl_context is None else "enabled",
         )
 
         await self.set_event_url(self.event_url)
 
+    async def _stop_server(self) -> None:
+        """Stop receiving events, stopping the event listener server if no
+        other hub is using it."""
+        if self._receiver:
+            await async_remove_shared_receiver(self._receiver)
+            self._receiver = None
+
+
+# Characters that aren't used as-is in event server paths
+_UNSAFE_PATH_CHARS = re.compile(r"[^0-9A-Za-z]+")
+
+# Attributes whose units are needed to interpret their values; devices/all
+# doesn't report attribute units
+_UNIT_ATTRIBUTES = (
+    DeviceAttribute.DEW_POINT,
+    DeviceAttribute.PRESSURE,
+    DeviceAttribute.TEMPERATURE,
+)
+
+# Setters whose argument replaces a single device value, so only the latest
+# queued call needs to be sent. Commands like setCode, whose argument selects
+# what is being set, must not be collapsed.
+_LAST_WRITE_WINS_COMMANDS = frozenset(
+    (
+        DeviceCommand.SET_COLOR,
+        DeviceCommand.SET_COLOR_TEMP,
+        DeviceCommand.SET_COOLING_SETPOINT,
+        DeviceCommand.SET_FAN_MODE,
+        DeviceCommand.SET_HEATING_SETPOINT,
+        DeviceCommand.SET_HUE,
+        DeviceCommand.SET_LEVEL,
+        DeviceCommand.SET_POSITION,
+        DeviceCommand.SET_SAT,
+        DeviceCommand.SET_SPEED,
+        DeviceCommand.SET_THERMOSTAT_MODE,
+    )
+)
+
+
+def _bulk_device_properties(
+    entry: dict[str, Any], existing: Device | None
+) -> dict[str, Any] | None:
+    """Convert a devices/all entry into devices/{id} form.
+
+    None is returned if the entry doesn't contain enough information to build
+    a device, in which case the device should be loaded individually.
+    """
+    for key in ("id", "name", "label", "type"):
+        if key not in entry:
+            return None
+
+    raw_attrs = entry.get("attributes")
+    raw_caps = entry.get("capabilities")
+    raw_cmds = entry.get("commands")
+    if not isinstance(raw_caps, list) or not isinstance(raw_cmds, list):
+        return None
+
+    attributes: list[dict[str, Any]] = []
+    if isinstance(raw_attrs, list):
+        # Full attribute records, the same as devices/{id}
+        for attr in cast(list[Any], raw_attrs):
+            if (
+                not isinstance(attr, dict)
+                or "name" not in attr
+                or "dataType" not in attr
+            ):
+                return None
+            attributes.append(cast(dict[str, Any], attr))
+    elif isinstance(raw_attrs, dict):
+        # A flat name -> value map. Maker API also leaks the metadata of one
+        # attribute into this map as "dataType" and "values" keys.
+        for name, value in cast(dict[str, Any], raw_attrs).items():
+            if name in ("dataType", "values"):
+                continue
+
+            unit: str | None = None
+            if existing and name in existing.attributes:
+                unit = existing.attributes[cast(DeviceAttribute, name)].unit
+            elif name in _UNIT_ATTRIBUTES:
+                return None
+
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                data_type = "STRING"
+                if isinstance(value, (dict, list)):
+                    data_type = "JSON_OBJECT"
+                    value = json.dumps(value)
+            else:
+                data_type = "NUMBER"
+
+            attributes.append(
+                {
+                    "name": name,
+                    "currentValue": value,
+                    "dataType": data_type,
+                    "unit": unit,
+                }
+            )
+    else:
+        return None
+
+    commands: list[str] = []
+    for cmd in cast(list[Any], raw_cmds):
+        if isinstance(cmd, dict):
+            cmd = cast(dict[str, Any], cmd).get("command")
+        if isinstance(cmd, str):
+            commands.append(cmd)
+
+    properties = {
+        key: value
+        for key, value in entry.items()
+        if key not in ("attributes", "commands")
+    }
+    properties["attributes"] = attributes
+    properties["commands"] = commands
+    return properties
+
+
+class _LoadWindow:
+    """An adaptive limit on the number of in-flight device requests.
+
+    The window starts at its maximum size. It's halved each time the hub
+    reports that it's overloaded and grows by one after each successful
+    request, up to the maximum.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size: int = max(1, max_size)
+        self.size: int = self.max_size
+        self._in_flight: int = 0
+        self._condition: asyncio.Condition = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._condition:
+            _ = await self._condition.wait_for(lambda: self._in_flight < self.size)
+            self._in_flight += 1
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def throttle(self) -> None:
+        """Shrink the window after the hub reported an overload."""
+        size = max(1, self.size // 2)
+        if size != self.size:
+            _LOGGER.debug("Reducing device load concurrency to %d", size)
+        self.size = size
+
+    def grow(self) -> None:
+        """Widen the window after a successful request."""
+        if self.size < self.max_size:
+            self.size += 1
+
+
+class _CircuitBreaker:
+    """Stops sending requests to a hub that keeps failing.
+
+    The circuit opens after several consecutive requests fail. While it's
+    open, requests fail without being sent. Once the open time has passed, the
+    next request is sent as a probe: if it succeeds the circuit closes,
+    otherwise it opens again for twice as long, up to a maximum. Open times are
+    jittered so that clients of a rebooting hub don't all return at once.
+    """
+
+    def __init__(self, on_change: CircuitListener):
+        self.state: CircuitState = CircuitState.CLOSED
+        self._on_change: CircuitListener = on_change
+        self._failures: int = 0
+        self._open_time: float = 0.0
+        self._retry_at: float = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until a probe may be sent."""
+        if self.state == CircuitState.CLOSED:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def check(self) -> None:
+        """Raise a CircuitOpenError if a request shouldn't be sent now."""
+        if self.state == CircuitState.CLOSED:
+            return
+        if self.state == CircuitState.OPEN and time.monotonic() >= self._retry_at:
+            # Let this request through to see if the hub has recovered
+            self._set_state(CircuitState.HALF_OPEN)
+            return
+        raise CircuitOpenError(f"Hub is unavailable; retrying in {self.retry_in:.1f}s")
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._open_time = 0.0
+        if self.state != CircuitState.CLOSED:
+            _LOGGER.info("Hub is reachable again")
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        if self.state == CircuitState.OPEN:
+            # A request sent before the circuit opened
+            return
+
+        self._failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self._failures >= CIRCUIT_FAILURE_THRESHOLD
+        ):
+            self._open_time = min(
+                CIRCUIT_MAX_OPEN_TIME, self._open_time * 2 or CIRCUIT_MIN_OPEN_TIME
+            )
+            delay = random.uniform(self._open_time / 2, self._open_time)
+            self._retry_at = time.monotonic() + delay
+            _LOGGER.debug("Pausing hub requests for %.1fs", delay)
+            self._set_state(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Handle a request that was cancelled before it finished."""
+        if self.state == CircuitState.HALF_OPEN:
+            # Let the next request probe instead
+            self._retry_at = time.monotonic()
+            self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self.state:
+            self.state = state
+            self._on_change(state)
+
+
+class _QueuedCommand:
+    """A device command waiting to be sent, and the callers waiting on it."""
+
+    def __init__(self, command: str, arg: str | int | None):
+        self.command: str = command
+        self.arg: str | int | None = arg
+        self.waiters: list[asyncio.Future[dict[str, Any]]] = []
+
+    def resolve(self, result: dict[str, Any]) -> None:
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    def reject(self, error: Exception) -> None:
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_exception(error)
+
+    def cancel(self) -> None:
+        for waiter in self.waiters:
+            _ = waiter.cancel()
+
+
+def _schedule_close(session: aiohttp.ClientSession) -> None:
+    """Close a client session without blocking the caller.
+
+    If no event loop is running the session is left for the garbage
+    collector, which is the best that can be done from synchronous code.
+    """
+    if session.closed:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    # Keep a reference to the task so it isn't garbage collected before the
+    # session is closed
+    task = loop.create_task(session.close())
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_tasks.discard)
+
 
 @contextmanager
 def _open_socket(
@@ -550,6 +1454,58 @@ def _open_socket(
         s.close()
 
 
+def _get_event_path(host: str, app_id: str) -> str:
+    """Return the event server path that a hub's events are posted to."""
+    host_part = _UNSAFE_PATH_CHARS.sub("-", host)
+    app_part = _UNSAFE_PATH_CHARS.sub("-", app_id)
+    return f"/hubitat/{host_part}/{app_part}"
+
+
+def _get_coalesce_key(content: Mapping[str, Any]) -> Hashable:
+    """Return the key an event shares with the events it replaces in a batch."""
+    if content.get("name") in MOMENTARY_ATTRIBUTES:
+        # Every momentary action is significant
+        return object()
+    return (content.get("deviceId"), content.get("name"))
+
+
+def _get_event_key(event: Mapping[str, Any]) -> Hashable | None:
+    """Return the key a received event shares with the older events it
+    supersedes, or None if it doesn't supersede any."""
+    content = event.get("content")
+    if not isinstance(content, dict) or content.get("deviceId") is None:
+        return None
+    content = cast(dict[str, Any], content)
+    if content.get("name") in MOMENTARY_ATTRIBUTES:
+        return None
+    return (content.get("deviceId"), content.get("name"))
+
+
+def _get_retry_delay(attempt: int) -> float:
+    """Return a jittered, exponentially increasing delay before a retry."""
+    delay = min(
+        MAX_REQUEST_RETRY_DELAY, REQUEST_RETRY_DELAY_INTERVAL * 2 ** (attempt - 1)
+    )
+    return random.uniform(delay / 2, delay)
+
+
+def _is_hub_failure(error: Exception) -> bool:
+    """Return True if a request error means the hub is down or overloaded."""
+    if isinstance(error, RequestError):
+        return error.status >= 500 or error.status == 408
+    return isinstance(error, (ClientConnectionError, asyncio.TimeoutError))
+
+
+def _is_last_write_wins(command: str, arg: str | int | None) -> bool:
+    """Return True if a command replaces earlier queued calls to the same
+    command.
+
+    Single-value setters that are given a value only need their latest value
+    sent.
+    """
+    return command in _LAST_WRITE_WINS_COMMANDS and arg is not None
+
+
 def _get_event_port(port: int | None, event_url: str | None) -> int | None:
     """Given an optional port and event URL, return the event port"""
     if port is not None:
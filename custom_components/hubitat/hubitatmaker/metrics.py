@@ -0,0 +1,198 @@
+"""Request and event metrics for a Hubitat hub.
+
+Metrics are cheap counters and fixed-bucket histograms, so they can stay on in
+production where debug logging would be too expensive.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds of latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Upper bounds of listener fan-out histogram buckets, in milliseconds
+FANOUT_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+# Key for events that don't belong to a device, like mode and HSM changes
+HUB_EVENTS = "hub"
+
+_NUMERIC_SEGMENT = re.compile(r"^\d+$")
+
+
+class Histogram:
+    """A histogram with fixed bucket bounds."""
+
+    __slots__ = ("bounds", "count", "counts", "max", "total")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # The last bucket holds values above the largest bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the bucket bound that pct percent of values fall within.
+
+        Values above the largest bound are reported as the maximum value.
+        """
+        if self.count == 0:
+            return None
+        target = pct / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {f"le_{bound:g}": n for bound, n in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "p95": self.percentile(95),
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class EndpointMetrics:
+    """Metrics for requests to one Maker API endpoint."""
+
+    __slots__ = (
+        "bytes_received",
+        "errors",
+        "latency",
+        "max_bytes",
+        "requests",
+        "retries",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.max_bytes = 0
+        self.latency = Histogram(LATENCY_BUCKETS_MS)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "max_bytes": self.max_bytes,
+            "latency_ms": self.latency.as_dict(),
+        }
+
+
+class HubMetrics:
+    """Request, retry, payload, and event metrics for a hub."""
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.events: dict[str, dict[str, int]] = {}
+        self.events_received = 0
+        self.fanout = Histogram(FANOUT_BUCKETS_MS)
+
+    def record_request(
+        self, path: str, seconds: float, size: int, status: int | None
+    ) -> None:
+        """Record a request attempt.
+
+        A status of None means the request failed without a response.
+        """
+        endpoint = self._get_endpoint(path)
+        endpoint.requests += 1
+        if status is None or status >= 400:
+            endpoint.errors += 1
+        endpoint.bytes_received += size
+        endpoint.max_bytes = max(endpoint.max_bytes, size)
+        endpoint.latency.record(seconds * 1000)
+
+    def record_retry(self, path: str) -> None:
+        """Record that a failed request will be retried."""
+        self._get_endpoint(path).retries += 1
+
+    def record_event(self, device_id: str | None, attribute: str | None) -> None:
+        """Record an event received from the hub."""
+        self.events_received += 1
+        attrs = self.events.setdefault(device_id or HUB_EVENTS, {})
+        key = attribute or ""
+        attrs[key] = attrs.get(key, 0) + 1
+
+    def record_fanout(self, seconds: float) -> None:
+        """Record the time taken to pass an event to its listeners."""
+        self.fanout.record(seconds * 1000)
+
+    def summary(self) -> dict[str, int | float | None]:
+        """Return totals across all endpoints."""
+        latency = Histogram(LATENCY_BUCKETS_MS)
+        requests = errors = retries = 0
+        for endpoint in self.endpoints.values():
+            requests += endpoint.requests
+            errors += endpoint.errors
+            retries += endpoint.retries
+            latency.count += endpoint.latency.count
+            latency.total += endpoint.latency.total
+            latency.max = max(latency.max, endpoint.latency.max)
+            for i, count in enumerate(endpoint.latency.counts):
+                latency.counts[i] += count
+        return {
+            "requests": requests,
+            "request_errors": errors,
+            "request_retries": retries,
+            "request_latency_p95_ms": latency.percentile(95),
+            "events_received": self.events_received,
+            "event_fanout_p95_ms": self.fanout.percentile(95),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "summary": self.summary(),
+            "endpoints": {
+                name: endpoint.as_dict()
+                for name, endpoint in sorted(self.endpoints.items())
+            },
+            "events": {
+                device_id: dict(sorted(attrs.items()))
+                for device_id, attrs in sorted(self.events.items())
+            },
+            "event_fanout_ms": self.fanout.as_dict(),
+        }
+
+    def _get_endpoint(self, path: str) -> EndpointMetrics:
+        name = get_endpoint_name(path)
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            endpoint = self.endpoints[name] = EndpointMetrics()
+        return endpoint
+
+
+def get_endpoint_name(path: str) -> str:
+    """Return the endpoint a Maker API path belongs to.
+
+    IDs and command arguments are replaced with placeholders so that, for
+    example, every device load is counted under "devices/{id}", while device
+    commands are counted per command.
+    """
+    parts = path.split("/")
+    if parts[0] == "postURL":
+        return "postURL"
+    if parts[0] == "devices" and len(parts) > 1 and parts[1] != "all":
+        parts[1] = "{id}"
+        if len(parts) > 3:
+            parts[3:] = ["{arg}"]
+        return "/".join(parts)
+    return "/".join("{id}" if _NUMERIC_SEGMENT.match(p) else p for p in parts)
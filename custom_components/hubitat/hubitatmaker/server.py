@@ -1,50 +1,150 @@
 import asyncio
 import threading
 from asyncio.base_events import Server as AsyncioServer
+from collections.abc import Hashable
+from logging import getLogger
 from ssl import SSLContext
 from typing import Any, Callable, cast
 
 from aiohttp import web
 
+from .decoder import decode_json
+
 EventCallback = Callable[[dict[str, Any]], None]
 
+# Returns the key an event shares with older events it supersedes, or None if
+# the event never supersedes another
+EventKey = Callable[[dict[str, Any]], Hashable | None]
+
+# The maximum number of events waiting to be handed to the main event loop
+DEFAULT_MAX_QUEUED_EVENTS = 5000
+
+_LOGGER = getLogger(__name__)
+
 
 class Server:
-    """A handle to a running server."""
+    """A handle to a running server.
+
+    By default the server runs in a background thread with its own event loop,
+    and events are passed back to the loop the server was created on. A server
+    created with in_loop=True instead runs on the creating loop and calls the
+    event handler directly; it must be started with async_start and stopped
+    with async_stop.
+
+    A server can pass events to several receivers, such as one for each hub.
+    An event goes to the receiver registered for the request path, or else to
+    the receiver registered for the address the request came from. A server
+    created with an event handler has a receiver for the root path.
+
+    Events received by a background server wait in a bounded queue until the
+    main loop handles them, so a stalled main loop can't make them pile up
+    without limit. When the queue is full, a new event replaces the queued
+    event with the same key, or else the oldest queued event is dropped.
+    """
 
     host: str
     port: int
-    handle_event: EventCallback
+    handle_event: EventCallback | None
     ssl_context: SSLContext | None
+    in_loop: bool
     _main_loop: asyncio.AbstractEventLoop
 
     def __init__(
         self,
-        handle_event: EventCallback,
+        handle_event: EventCallback | None,
         host: str,
         port: int,
         ssl_context: SSLContext | None = None,
+        in_loop: bool = False,
+        max_queued_events: int = DEFAULT_MAX_QUEUED_EVENTS,
+        get_event_key: EventKey | None = None,
     ):
         """Initialize a Server."""
         self.host = host
         self.port = port
         self.handle_event = handle_event
         self.ssl_context = ssl_context
+        self.in_loop = in_loop
         self._main_loop = asyncio.get_event_loop()
+        # Receivers are looked up on the server thread, so these are replaced
+        # rather than modified
+        self._receivers: dict[str, EventReceiver] = {}
+        self._remote_receivers: dict[str, EventReceiver] = {}
+        self._start_task: asyncio.Future[None] | None = None
         self._runner: web.AppRunner
         self._startup_event: threading.Event
         self._server_loop: asyncio.AbstractEventLoop
 
+        if handle_event is not None:
+            _ = self.add_receiver(
+                "/", handle_event, None, max_queued_events, get_event_key
+            )
+
     @property
     def url(self) -> str:
         scheme = "http" if self.ssl_context is None else "https"
         return f"{scheme}://{self.host}:{self.port}"
 
+    @property
+    def receivers(self) -> list["EventReceiver"]:
+        return list(self._receivers.values())
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters for received, coalesced, and dropped events, totalled
+        across all receivers."""
+        totals: dict[str, int] = {}
+        for receiver in self._receivers.values():
+            for name, value in receiver.stats.items():
+                if name == "high_water":
+                    totals[name] = max(totals.get(name, 0), value)
+                else:
+                    totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def add_receiver(
+        self,
+        path: str,
+        handle_event: EventCallback,
+        remote: str | None = None,
+        max_queued_events: int = DEFAULT_MAX_QUEUED_EVENTS,
+        get_event_key: EventKey | None = None,
+    ) -> "EventReceiver":
+        """Pass events POSTed to a path to an event handler.
+
+        remote:
+          The address of the event source (optional). Events from this address
+          that don't match a receiver's path are passed to this receiver, for
+          sources that post to an event URL without the receiver's path.
+        """
+        if path in self._receivers:
+            raise ValueError(f"An event receiver is already registered for {path}")
+
+        receiver = EventReceiver(
+            self, path, handle_event, remote, max_queued_events, get_event_key
+        )
+        self._receivers = {**self._receivers, path: receiver}
+        if remote:
+            self._remote_receivers = {**self._remote_receivers, remote: receiver}
+        return receiver
+
+    def remove_receiver(self, receiver: "EventReceiver") -> None:
+        """Stop passing events to a receiver."""
+        if self._receivers.get(receiver.path) is not receiver:
+            return
+        self._receivers = {
+            path: r for path, r in self._receivers.items() if r is not receiver
+        }
+        self._remote_receivers = {
+            remote: r
+            for remote, r in self._remote_receivers.items()
+            if r is not receiver
+        }
+        receiver.clear()
+
     def start(self) -> None:
         """Start a new server running in a background thread."""
-        app = web.Application()
-        app.add_routes([web.post("/", self._handle_request)])
-        self._runner = web.AppRunner(app)
+        self._runner = self._create_runner()
 
         self._startup_event = threading.Event()
         self._server_loop = asyncio.new_event_loop()
@@ -54,8 +154,31 @@ class Server:
         # Wait for server to startup
         self._startup_event.wait()
 
+    async def async_start(self) -> None:
+        """Start a new server running on the current event loop."""
+        self._runner = self._create_runner()
+        await self._start_site()
+
+    async def async_ensure_started(self) -> None:
+        """Start the server if it hasn't been started yet, or wait for it to
+        finish starting."""
+        if self._start_task is None:
+            self._start_task = asyncio.ensure_future(self._start_once())
+        await asyncio.shield(self._start_task)
+
     def stop(self) -> None:
         """Gracefully stop a running server."""
+        self._start_task = None
+
+        if self.in_loop:
+            # Nothing needs to wait for an in-loop server to finish shutting
+            # down, so let it stop in the background
+            _ = self._main_loop.create_task(self._stop())
+            return
+
+        for receiver in self._receivers.values():
+            receiver.clear()
+
         # Call the server shutdown functions and wait for them to finish. These
         # must be called on the server thread's event loop.
         future = asyncio.run_coroutine_threadsafe(self._stop(), self._server_loop)
@@ -64,23 +187,61 @@ class Server:
         # Stop the server thread's event loop
         self._server_loop.call_soon_threadsafe(self._server_loop.stop)
 
+    async def async_stop(self) -> None:
+        """Gracefully stop a running server, waiting for it to finish."""
+        if self.in_loop:
+            self._start_task = None
+            await self._stop()
+        else:
+            await asyncio.get_running_loop().run_in_executor(None, self.stop)
+
+    def _create_runner(self) -> web.AppRunner:
+        """Create a runner for the event receiver app."""
+        app = web.Application()
+        app.add_routes([web.post("/{path:.*}", self._handle_request)])
+        return web.AppRunner(app)
+
+    async def _start_once(self) -> None:
+        """Start the server in the way its mode requires."""
+        if self.in_loop:
+            await self.async_start()
+        else:
+            self.start()
+
     async def _handle_request(self, request: web.Request) -> web.Response:
         """Handle an incoming request."""
-        event = cast(dict[str, Any], await request.json())
-        # This handler will be called on the server thread. Call the external
-        # handler on the app thread.
-        self._main_loop.call_soon_threadsafe(self.handle_event, event)
+        receiver = self._get_receiver(request.path, request.remote)
+        if receiver is None:
+            _LOGGER.warning(
+                "Ignoring event from %s for unknown path %s",
+                request.remote,
+                request.path,
+            )
+            return web.Response(status=404, text="Not Found")
+
+        receiver.receive(cast(dict[str, Any], decode_json(await request.read())))
         return web.Response(text="OK")
 
-    def _run(self) -> None:
-        """Execute the server in its own thread with its own event loop."""
-        asyncio.set_event_loop(self._server_loop)
-        self._server_loop.run_until_complete(self._runner.setup())
+    def _get_receiver(self, path: str, remote: str | None) -> "EventReceiver | None":
+        """Return the receiver for a request's path or source address."""
+        receivers = self._receivers
+        receiver = receivers.get(path) or receivers.get(path.rstrip("/"))
+        if receiver is None and remote:
+            receiver = self._remote_receivers.get(remote)
+        if receiver is None and len(receivers) == 1:
+            # With a single receiver there's no ambiguity about where an
+            # event should go
+            receiver = next(iter(receivers.values()))
+        return receiver
+
+    async def _start_site(self) -> None:
+        """Set up the runner and start listening."""
+        await self._runner.setup()
 
         site = web.TCPSite(
             self._runner, self.host, self.port, ssl_context=self.ssl_context
         )
-        self._server_loop.run_until_complete(site.start())
+        await site.start()
 
         # If the Server was initialized with port 0, determine what port the
         # underlying server ended up listening on
@@ -94,6 +255,10 @@ class Server:
             socket = sockets[0]
             self.port = socket.getsockname()[1]
 
+    def _run(self) -> None:
+        """Execute the server in its own thread with its own event loop."""
+        asyncio.set_event_loop(self._server_loop)
+        self._server_loop.run_until_complete(self._start_site())
         self._startup_event.set()
         self._server_loop.run_forever()
 
@@ -103,11 +268,266 @@ class Server:
         await self._runner.cleanup()
 
 
+class EventReceiver:
+    """A route on a server that passes events to one event handler.
+
+    Events are handled on the loop the receiver was created on.
+    """
+
+    def __init__(
+        self,
+        server: Server,
+        path: str,
+        handle_event: EventCallback,
+        remote: str | None,
+        max_queued_events: int,
+        get_event_key: EventKey | None,
+    ):
+        self.server = server
+        self.path = path
+        self.handle_event = handle_event
+        self.remote = remote
+        self._main_loop = asyncio.get_event_loop()
+        self._queue = _IngestQueue(max(1, max_queued_events), get_event_key)
+
+    @property
+    def url(self) -> str:
+        """The URL events for this receiver should be POSTed to."""
+        return f"{self.server.url}{self.path}"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters for received, coalesced, and dropped events."""
+        return self._queue.stats()
+
+    def receive(self, event: dict[str, Any]) -> None:
+        """Handle an event received by the server."""
+        if self.server.in_loop:
+            self._queue.received += 1
+            self.handle_event(event)
+        elif self._queue.put(event):
+            # This will be called on the server thread. Have the main loop
+            # drain the queue, unless it's already been asked to.
+            self._main_loop.call_soon_threadsafe(self._drain)
+
+    def clear(self) -> None:
+        """Discard queued events."""
+        self._queue.clear()
+
+    def _drain(self) -> None:
+        """Pass queued events to the event handler on the main loop."""
+        for event in self._queue.take():
+            self.handle_event(event)
+
+
+class _IngestQueue:
+    """A bounded, thread-safe queue of received events.
+
+    Events are queued by the server thread and taken by the main loop.
+    """
+
+    def __init__(self, max_size: int, get_key: EventKey | None):
+        self._max_size = max_size
+        self._get_key = get_key
+        self._lock = threading.Lock()
+        # Queued events and their keys, by queue entry ID
+        self._events: dict[int, tuple[Hashable | None, dict[str, Any]]] = {}
+        # The queue entry holding the latest event for each event key
+        self._latest: dict[Hashable, int] = {}
+        self._next_id = 0
+        self._drain_pending = False
+        self._overflowing = False
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def put(self, event: dict[str, Any]) -> bool:
+        """Queue an event.
+
+        Returns True if the queue needs to be drained, meaning it was empty
+        and no drain is pending.
+        """
+        key = self._get_key(event) if self._get_key else None
+
+        with self._lock:
+            self.received += 1
+
+            if len(self._events) >= self._max_size:
+                if not self._overflowing:
+                    self._overflowing = True
+                    _LOGGER.warning(
+                        "Event queue is full (%d events); compacting events",
+                        self._max_size,
+                    )
+
+                if key is not None and key in self._latest:
+                    # Replace the device attribute's queued value. The new
+                    # event goes to the end so events stay in arrival order.
+                    del self._events[self._latest.pop(key)]
+                    self.coalesced += 1
+                else:
+                    oldest = next(iter(self._events))
+                    oldest_key, _ = self._events.pop(oldest)
+                    if (
+                        oldest_key is not None
+                        and self._latest.get(oldest_key) == oldest
+                    ):
+                        del self._latest[oldest_key]
+                    self.dropped += 1
+
+            entry = self._next_id
+            self._next_id += 1
+            self._events[entry] = (key, event)
+            if key is not None:
+                self._latest[key] = entry
+            self.high_water = max(self.high_water, len(self._events))
+
+            if self._drain_pending:
+                return False
+            self._drain_pending = True
+            return True
+
+    def take(self) -> list[dict[str, Any]]:
+        """Remove and return all queued events."""
+        with self._lock:
+            events = [event for _, event in self._events.values()]
+            self._events = {}
+            self._latest = {}
+            self._drain_pending = False
+            if self._overflowing:
+                self._overflowing = False
+                _LOGGER.info(
+                    "Event queue drained (%d coalesced, %d dropped so far)",
+                    self.coalesced,
+                    self.dropped,
+                )
+            return events
+
+    def clear(self) -> None:
+        """Discard all queued events."""
+        _ = self.take()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "received": self.received,
+                "queued": len(self._events),
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "high_water": self.high_water,
+            }
+
+
 def create_server(
     handle_event: EventCallback,
     host: str = "0.0.0.0",
     port: int = 0,
     ssl_context: SSLContext | None = None,
+    in_loop: bool = False,
+    max_queued_events: int = DEFAULT_MAX_QUEUED_EVENTS,
+    get_event_key: EventKey | None = None,
 ) -> Server:
     """Create a new server."""
-    return Server(handle_event, host, port, ssl_context)
+    return Server(
+        handle_event,
+        host,
+        port,
+        ssl_context,
+        in_loop,
+        max_queued_events,
+        get_event_key,
+    )
+
+
+# Servers shared by everything listening on the same address and port, by
+# address, port, SSL context, and, for servers on random ports, mode
+_shared_servers: dict[tuple[str, int, SSLContext | None, bool | None], Server] = {}
+
+
+async def async_add_shared_receiver(
+    path: str,
+    handle_event: EventCallback,
+    host: str = "0.0.0.0",
+    port: int = 0,
+    ssl_context: SSLContext | None = None,
+    in_loop: bool = False,
+    remote: str | None = None,
+    max_queued_events: int = DEFAULT_MAX_QUEUED_EVENTS,
+    get_event_key: EventKey | None = None,
+) -> EventReceiver:
+    """Add a receiver to the server shared by everything listening on an
+    address and port, starting the server if it isn't already running.
+
+    All callers asking for port 0 in the same mode share one server on a
+    random port. A fixed port can only be shared by callers using the same
+    mode; a ValueError is raised otherwise. The server is stopped when its
+    last receiver is removed with remove_shared_receiver or
+    async_remove_shared_receiver.
+    """
+    # Servers on random ports never compete for an address, so they can be
+    # separated by mode
+    key = (host, port, ssl_context, in_loop if port == 0 else None)
+    server = _shared_servers.get(key)
+    if server is not None and server.in_loop != in_loop:
+        raise ValueError(
+            f"The event server on {host}:{port} is already running "
+            + ("in the event loop" if server.in_loop else "in a thread")
+            + "; hubs sharing a port must use the same event server mode"
+        )
+    if server is None:
+        server = _shared_servers[key] = create_server(
+            None, host, port, ssl_context, in_loop
+        )
+
+    receiver = server.add_receiver(
+        path, handle_event, remote, max_queued_events, get_event_key
+    )
+    try:
+        await server.async_ensure_started()
+    except Exception:
+        # The server never started, so there's nothing to stop
+        _ = _release_shared_server(receiver)
+        raise
+
+    _LOGGER.debug(
+        "Added event receiver %s to shared server %s (%d receivers)",
+        path,
+        server.url,
+        len(server.receivers),
+    )
+    return receiver
+
+
+def remove_shared_receiver(receiver: EventReceiver) -> None:
+    """Remove a receiver added by async_add_shared_receiver, stopping its
+    server if no receivers remain."""
+    server = _release_shared_server(receiver)
+    if server:
+        server.stop()
+
+
+async def async_remove_shared_receiver(receiver: EventReceiver) -> None:
+    """Remove a receiver added by async_add_shared_receiver, stopping its
+    server if no receivers remain and waiting for it to finish."""
+    server = _release_shared_server(receiver)
+    if server:
+        await server.async_stop()
+
+
+def _release_shared_server(receiver: EventReceiver) -> Server | None:
+    """Remove a receiver from its shared server, returning the server if it
+    has no receivers left and should be stopped."""
+    server = receiver.server
+    if receiver not in server.receivers:
+        return None
+
+    server.remove_receiver(receiver)
+    if server.receivers:
+        return None
+
+    for key, shared in list(_shared_servers.items()):
+        if shared is server:
+            del _shared_servers[key]
+    _LOGGER.debug("Last event receiver removed from shared server %s", server.url)
+    return server
@@ -1,10 +1,12 @@
 from collections.abc import Mapping, Sequence
+from copy import deepcopy
 from datetime import UTC, datetime
-from json import loads
+from sys import intern
 from types import MappingProxyType
-from typing import Any, Literal, NotRequired, TypedDict, cast, override
+from typing import Any, Literal, NotRequired, TypedDict, TypeVar, cast, override
 
 from custom_components.hubitat.hubitatmaker.const import DeviceAttribute
+from custom_components.hubitat.hubitatmaker.decoder import decode_json
 
 
 class AttributeData(TypedDict):
@@ -23,32 +25,65 @@ class AttributeData(TypedDict):
     values: NotRequired[list[str]]
 
 
+_S = TypeVar("_S", bound=str | None)
+
+# Marks a cached attribute value that hasn't been computed since the last
+# update
+_UNSET: Any = object()
+
+
 class Attribute:
-    _properties: AttributeData
+    """A device attribute.
+
+    The numeric and JSON forms of the current value are computed on first
+    use and cached until the value is next updated. Callers get their own
+    copy of the JSON form, so they may modify it.
+    """
+
+    __slots__ = (
+        "_float",
+        "_json",
+        "_name",
+        "_type",
+        "_unit",
+        "_value",
+        "_values",
+    )
 
     def __init__(self, properties: AttributeData):
-        self._properties = properties
+        self._name: str = _intern(properties["name"])
+        self._type: str = _intern(properties["dataType"])
+        self._value: str | float | datetime | None = properties.get("currentValue")
+        self._unit: str | None = _intern(properties.get("unit"))
+        self._values: tuple[str, ...] | None = (
+            tuple(properties["values"]) if "values" in properties else None
+        )
+        self._float: float | None = _UNSET
+        self._json: Any = _UNSET
 
     @property
     def name(self) -> str:
-        return self._properties["name"]
+        return self._name
 
     @property
     def type(self) -> str:
-        return self._properties["dataType"]
+        return self._type
 
     @property
     def value(self) -> str | float | datetime | None:
-        return self._properties["currentValue"]
+        return self._value
 
     @property
     def float_value(self) -> float | None:
-        val = self.value
-        if val is None:
-            return None
-        if isinstance(val, datetime):
-            return float(val.timestamp())
-        return float(val)
+        if self._float is _UNSET:
+            val = self._value
+            if val is None:
+                self._float = None
+            elif isinstance(val, datetime):
+                self._float = float(val.timestamp())
+            else:
+                self._float = float(val)
+        return self._float
 
     @property
     def int_value(self) -> int | None:
@@ -59,40 +94,65 @@ class Attribute:
 
     @property
     def str_value(self) -> str | None:
-        val = self.value
+        val = self._value
         if val is None:
             return None
         return str(val)
 
     @property
     def list_value(self) -> list[Any] | None:
-        val = self.str_value
-        if val is None:
-            return None
-        return cast(list[Any], loads(val))
+        return cast(list[Any] | None, deepcopy(self._json_value()))
 
     @property
     def dict_value(self) -> dict[str, Any] | None:
-        val = self.str_value
-        if val is None:
-            return None
-        return cast(dict[str, Any], loads(val))
+        return cast(dict[str, Any] | None, deepcopy(self._json_value()))
 
     @property
     def values(self) -> list[str] | None:
-        if "values" not in self._properties:
+        if self._values is None:
             return None
-        return self._properties["values"]
-
-    def update_value(
-        self, value: str | float | datetime, unit: str | None = None
-    ) -> None:
-        self._properties["currentValue"] = value
-        self._properties["unit"] = unit
+        return list(self._values)
 
     @property
     def unit(self) -> str | None:
-        return self._properties.get("unit")
+        return self._unit
+
+    def update_value(
+        self, value: str | float | datetime, unit: str | None = None
+    ) -> bool:
+        """Set the attribute's value and unit.
+
+        Return True if either differs from the previous value and unit. Values
+        are compared as strings since events report numbers as strings.
+        """
+        changed = str(value) != str(self._value) or (unit or None) != (
+            self._unit or None
+        )
+        self._value = value
+        self._unit = _intern(unit)
+        self._float = _UNSET
+        self._json = _UNSET
+        return changed
+
+    def as_data(self) -> AttributeData:
+        """Return the attribute in Maker API form."""
+        data: AttributeData = {
+            "name": cast(DeviceAttribute, self._name),
+            "dataType": cast(Any, self._type),
+            "currentValue": cast(str | float | datetime, self._value),
+            "unit": self._unit,
+        }
+        if self._values is not None:
+            data["values"] = list(self._values)
+        return data
+
+    def _json_value(self) -> Any:
+        """Return the decoded JSON value. The result is cached until the next
+        update, so it must not be modified."""
+        if self._json is _UNSET:
+            val = self.str_value
+            self._json = None if val is None else decode_json(val)
+        return self._json
 
     def __iter__(self):
         for key in "name", "type", "value", "unit":
@@ -107,44 +167,80 @@ class Attribute:
 
 
 class Device:
-    _properties: dict[str, Any]
-    _attributes_ro: MappingProxyType[DeviceAttribute, Attribute]
+    """A Hubitat device."""
+
+    __slots__ = (
+        "_attributes",
+        "_attributes_ro",
+        "_capabilities",
+        "_capability_set",
+        "_command_set",
+        "_commands",
+        "_id",
+        "_label",
+        "_manufacturer",
+        "_model",
+        "_name",
+        "_room",
+        "_type",
+    )
 
     def __init__(self, properties: dict[str, Any]):
         self.update_state(properties)
 
     @property
     def id(self) -> str:
-        return cast(str, self._properties["id"])
+        return cast(str, self._id)
 
     @property
     def name(self) -> str:
-        return cast(str, self._properties["name"])
+        return cast(str, self._name)
 
     @property
     def label(self) -> str:
-        return cast(str, self._properties["label"])
+        return cast(str, self._label)
 
     @property
     def type(self) -> str:
-        return cast(str, self._properties["type"])
+        return cast(str, self._type)
 
     @property
     def model(self) -> str | None:
-        return self._properties.get("model")
+        return self._model
 
     @property
     def manufacturer(self) -> str | None:
-        return self._properties.get("manufacturer")
+        return self._manufacturer
 
     @property
     def room(self) -> str | None:
-        return self._properties.get("room")
+        return self._room
 
     @property
     def attributes(self) -> Mapping[DeviceAttribute, Attribute]:
         return self._attributes_ro
 
+    @property
+    def properties(self) -> dict[str, Any]:
+        """A copy of the device data in Maker API form, including current
+        attribute values."""
+        return {
+            "id": self._id,
+            "name": self._name,
+            "label": self._label,
+            "type": self._type,
+            "model": self._model,
+            "manufacturer": self._manufacturer,
+            "room": self._room,
+            "attributes": [
+                attr.as_data()
+                for name, attr in self._attributes.items()
+                if name != DeviceAttribute.LAST_UPDATE
+            ],
+            "capabilities": list(self._capabilities),
+            "commands": list(self._commands),
+        }
+
     @property
     def capabilities(self) -> Sequence[str]:
         return self._capabilities
@@ -153,34 +249,58 @@ class Device:
     def commands(self) -> Sequence[str]:
         return self._commands
 
+    @property
+    def capability_set(self) -> frozenset[str]:
+        """The device's capabilities, for fast membership checks."""
+        return self._capability_set
+
+    @property
+    def command_set(self) -> frozenset[str]:
+        """The device's commands, for fast membership checks."""
+        return self._command_set
+
     def update_attr(
         self,
         attr_name: DeviceAttribute,
         value: str | int,
         value_unit: str | None,
-    ) -> None:
-        attr = self.attributes[attr_name]
-        attr.update_value(value, value_unit)
+    ) -> bool:
+        """Update an attribute, returning True if its value or unit changed."""
+        attr = self._attributes[attr_name]
+        changed = attr.update_value(value, value_unit)
 
         # Update a virtual hubitat_last_update attribute
-        self.attributes[DeviceAttribute.LAST_UPDATE].update_value(datetime.now(UTC))
+        _ = self._attributes[DeviceAttribute.LAST_UPDATE].update_value(
+            datetime.now(UTC)
+        )
+
+        return changed
 
     def update_state(self, properties: dict[str, Any]) -> None:
-        self._properties = properties
+        self._id: str | None = properties.get("id")
+        self._name: str | None = properties.get("name")
+        self._label: str | None = properties.get("label")
+        self._type: str | None = _intern(properties.get("type"))
+        self._model: str | None = _intern(properties.get("model"))
+        self._manufacturer: str | None = _intern(properties.get("manufacturer"))
+        self._room: str | None = _intern(properties.get("room"))
 
         self._attributes: dict[DeviceAttribute, Attribute] = {}
         self._attributes_ro = MappingProxyType(self._attributes)
         attrs = cast(list[AttributeData], properties.get("attributes", []))
         for attr in attrs:
-            self._attributes[attr["name"]] = Attribute(attr)
+            attribute = Attribute(attr)
+            self._attributes[cast(DeviceAttribute, attribute.name)] = attribute
 
         cap_list = cast(list[str | int], properties.get("capabilities", []))
-        caps: list[str] = [p for p in cap_list if isinstance(p, str)]
+        caps: list[str] = [_intern(p) for p in cap_list if isinstance(p, str)]
         self._capabilities: tuple[str, ...] = tuple(caps)
+        self._capability_set: frozenset[str] = frozenset(caps)
 
         cmd_list = cast(list[str | int], properties.get("commands", []))
-        commands: list[str] = [p for p in cmd_list if isinstance(p, str)]
+        commands: list[str] = [_intern(p) for p in cmd_list if isinstance(p, str)]
         self._commands: tuple[str, ...] = tuple(commands)
+        self._command_set: frozenset[str] = frozenset(commands)
 
         self._attributes[DeviceAttribute.LAST_UPDATE] = Attribute(
             {
@@ -217,8 +337,14 @@ class Device:
 class Event:
     _properties: dict[str, Any]
 
-    def __init__(self, properties: dict[str, Any]):
+    def __init__(self, properties: dict[str, Any], changed: bool = True):
         self._properties = properties
+        self._changed = changed
+
+    @property
+    def changed(self) -> bool:
+        """False if this event repeated an attribute's current value."""
+        return self._changed
 
     @property
     def device_id(self) -> str:
@@ -302,3 +428,8 @@ class Mode:
     @override
     def __str__(self) -> str:
         return f'<Mode id="{self.id}" name="{self.name}" active="{self.active}">'
+
+
+def _intern(value: _S) -> _S:
+    """Intern a string that many devices are likely to share."""
+    return cast(_S, intern(value)) if type(value) is str else value
@@ -95,13 +95,13 @@ class HubitatLight(LightEntity, HubitatEntity):
         if he_color_mode == HubitatColorMode.RGB:
             return ColorMode.HS
 
-        if DeviceCapability.COLOR_CONTROL in self._device.capabilities:
+        if DeviceCapability.COLOR_CONTROL in self._device.capability_set:
             return ColorMode.HS
 
-        if DeviceCapability.COLOR_TEMP in self._device.capabilities:
+        if DeviceCapability.COLOR_TEMP in self._device.capability_set:
             return ColorMode.COLOR_TEMP
 
-        if DeviceCapability.SWITCH_LEVEL in self._device.capabilities:
+        if DeviceCapability.SWITCH_LEVEL in self._device.capability_set:
             return ColorMode.BRIGHTNESS
 
         return ColorMode.ONOFF
@@ -144,7 +144,7 @@ class HubitatLight(LightEntity, HubitatEntity):
         return self.get_str_attr(DeviceAttribute.SWITCH) == "on"
 
     def _get_supported_color_modes(self) -> set[ColorMode] | set[str] | None:
-        caps = self._device.capabilities
+        caps = self._device.capability_set
         supported_modes: set[ColorMode] = set()
 
         if DeviceCapability.COLOR_CONTROL in caps:
@@ -162,7 +162,7 @@ class HubitatLight(LightEntity, HubitatEntity):
 
     def _get_supported_features(self) -> LightEntityFeature:
         """Return supported feature flags."""
-        cmds = self._device.commands
+        cmds = self._device.command_set
 
         # All lights support the Switch capability, which supports transition
         features = LightEntityFeature.TRANSITION
@@ -189,7 +189,7 @@ class HubitatLight(LightEntity, HubitatEntity):
         _LOGGER.debug(f"Turning on {self.name} with {kwargs}")
 
         props: dict[str, int | str] = {}
-        caps = self._device.capabilities
+        caps = self._device.capability_set
 
         if ATTR_BRIGHTNESS in kwargs and DeviceCapability.SWITCH_LEVEL in caps:
             props["level"] = round(100 * cast(float, kwargs[ATTR_BRIGHTNESS]) / 255)
@@ -302,18 +302,18 @@ def is_light(device: Device, overrides: dict[str, str] | None = None) -> bool:
     if is_definitely_light(device):
         return True
 
-    if DeviceCapability.SWITCH in device.capabilities and MATCH_LIGHT.search(
+    if DeviceCapability.SWITCH in device.capability_set and MATCH_LIGHT.search(
         device.label
     ):
         return True
 
-    if DeviceCapability.LIGHT in device.capabilities:
+    if DeviceCapability.LIGHT in device.capability_set:
         return True
 
     # A Cover may also have a SwitchLevel capability that can be used to set
     # the height of the cover. Fans may have SwitchLevel, but it seems to only
     # apply to light switches in that case.
-    if DeviceCapability.SWITCH_LEVEL in device.capabilities and not is_cover(device):
+    if DeviceCapability.SWITCH_LEVEL in device.capability_set and not is_cover(device):
         return True
 
     return False
@@ -323,7 +323,7 @@ def is_definitely_light(
     device: Device, _overrides: dict[str, str] | None = None
 ) -> bool:
     """Return True if the device has light-specific capabilities."""
-    return any(cap in device.capabilities for cap in LIGHT_CAPABILITIES)
+    return not device.capability_set.isdisjoint(LIGHT_CAPABILITIES)
 
 
 async def async_setup_entry(
@@ -333,7 +333,18 @@ async def async_setup_entry(
 ) -> None:
     """Initialize light devices."""
     _ = create_and_add_entities(
-        hass, config_entry, async_add_entities, "light", HubitatLight, is_light
+        hass,
+        config_entry,
+        async_add_entities,
+        "light",
+        HubitatLight,
+        is_light,
+        capabilities=(
+            *LIGHT_CAPABILITIES,
+            DeviceCapability.LIGHT,
+            DeviceCapability.SWITCH,
+            DeviceCapability.SWITCH_LEVEL,
+        ),
     )
 
 
@@ -68,10 +68,12 @@ class HubitatLock(LockEntity, HubitatEntity):
     def codes(self) -> str | dict[str, dict[str, str]] | None:
         try:
             codes = self.get_dict_attr(DeviceAttribute.LOCK_CODES)
-            if codes:
-                for id in codes:
-                    del codes[id]["code"]
-            return codes
+            if codes is None:
+                return None
+            return {
+                id: {key: value for key, value in code.items() if key != "code"}
+                for id, code in codes.items()
+            }
         except Exception:
             return self.get_str_attr(DeviceAttribute.LOCK_CODES)
 
@@ -114,7 +116,7 @@ class HubitatLock(LockEntity, HubitatEntity):
 
 def is_lock(device: Device, _overrides: dict[str, str] | None = None) -> bool:
     """Return True if device looks like a lock."""
-    return DeviceCapability.LOCK in device.capabilities
+    return DeviceCapability.LOCK in device.capability_set
 
 
 async def async_setup_entry(
@@ -124,7 +126,13 @@ async def async_setup_entry(
 ) -> None:
     """Initialize lock devices."""
     _ = create_and_add_entities(
-        hass, entry, async_add_entities, "lock", HubitatLock, is_lock
+        hass,
+        entry,
+        async_add_entities,
+        "lock",
+        HubitatLock,
+        is_lock,
+        capabilities=(DeviceCapability.LOCK,),
     )
 
 
@@ -4,7 +4,7 @@ import re
 from datetime import date, datetime
 from decimal import Decimal
 from logging import getLogger
-from typing import TYPE_CHECKING, Unpack, override
+from typing import TYPE_CHECKING, Unpack, cast, override
 
 from custom_components.hubitat.hubitatmaker.const import DeviceCapability
 from custom_components.hubitat.util import to_display_name
@@ -24,6 +24,7 @@ from homeassistant.const import (
     DEGREE,
     LIGHT_LUX,
     PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
@@ -31,6 +32,7 @@ from homeassistant.const import (
     UnitOfPressure,
     UnitOfSpeed,
     UnitOfTemperature,
+    UnitOfTime,
     UnitOfVolume,
     UnitOfVolumetricFlux,
 )
@@ -41,7 +43,7 @@ from homeassistant.helpers.typing import StateType
 from .device import HubitatEntity, HubitatEntityArgs
 from .entities import create_and_add_entities
 from .hub import get_hub
-from .hubitatmaker import DeviceAttribute
+from .hubitatmaker import CircuitState, DeviceAttribute
 from .hubitatmaker.types import Device
 
 _LOGGER = getLogger(__name__)
@@ -662,6 +664,9 @@ class HubitatUpdateSensor(HubitatSensor):
     device.
     """
 
+    # The update time changes with every event
+    _write_unchanged: bool = True
+
     def __init__(self, **kwargs: Unpack[HubitatEntityArgs]):
         """Initialize an hubitat last update status sensor."""
         super().__init__(
@@ -672,6 +677,12 @@ class HubitatUpdateSensor(HubitatSensor):
             **kwargs,
         )
 
+    @property
+    @override
+    def event_attrs(self) -> tuple[DeviceAttribute, ...] | None:
+        """Return None; every device event changes the last update time."""
+        return None
+
 
 class HubitatHsmSensor(HubitatSensor):
     """
@@ -702,6 +713,113 @@ class HubitatHubModeSensor(HubitatSensor):
         )
 
 
+class HubitatCircuitSensor(HubitatSensor):
+    """
+    A sensor that reports whether requests to a hub are being paused because
+    the hub is unreachable.
+    """
+
+    _attr_entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, **kwargs: Unpack[HubitatEntityArgs]):
+        """Initialize a circuit state sensor."""
+        super().__init__(
+            attribute=DeviceAttribute.CIRCUIT_STATE,
+            device_class=SensorDeviceClass.ENUM,
+            attribute_name="Maker API circuit",
+            options=[state.value for state in CircuitState],
+            **kwargs,
+        )
+
+
+class HubitatMetricSensor(HubitatSensor):
+    """
+    A sensor that reports one of a hub's Maker API request or event metrics.
+    Metric sensors are disabled by default.
+    """
+
+    _attr_entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        *,
+        metric: str,
+        metric_name: str,
+        unit: str | None = None,
+        device_class: SensorDeviceClass | None = None,
+        state_class: SensorStateClass,
+        **kwargs: Unpack[HubitatEntityArgs],
+    ):
+        """Initialize a metric sensor."""
+        self._metric: str = metric
+        super().__init__(
+            attribute=cast(DeviceAttribute, f"metric_{metric}"),
+            attribute_name=metric_name,
+            unit=unit,
+            device_class=device_class,
+            state_class=state_class,
+            enabled_default=False,
+            **kwargs,
+        )
+        # Metrics change with every request and event, so they're polled
+        # rather than updated by events
+        self._attr_should_poll: bool = True
+
+    @override
+    async def async_update(self) -> None:
+        """Load the current metric value."""
+        self.load_state()
+
+    @override
+    def _get_native_value(self) -> StateType | date | datetime | Decimal:
+        return self._hub.metrics_summary.get(self._metric)
+
+
+# Hub metrics reported by metric sensors, as (metric, name, unit, device class,
+# state class)
+_METRIC_SENSORS: tuple[
+    tuple[str, str, str | None, SensorDeviceClass | None, SensorStateClass],
+    ...,
+] = (
+    ("requests", "Maker API requests", None, None, SensorStateClass.TOTAL_INCREASING),
+    (
+        "request_errors",
+        "Maker API request errors",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    (
+        "request_retries",
+        "Maker API request retries",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    (
+        "request_latency_p95_ms",
+        "Maker API latency p95",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+    ),
+    (
+        "events_received",
+        "Events received",
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    (
+        "event_fanout_p95_ms",
+        "Event fan-out p95",
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+    ),
+)
+
+
 _SENSOR_ATTRS: tuple[
     tuple[DeviceAttribute, type[HubitatSensor], DeviceCapability | None], ...
 ] = (
@@ -777,12 +895,18 @@ async def async_setup_entry(
         def is_sensor(device: Device, _overrides: dict[str, str] | None = None) -> bool:
             if attr_name not in device.attributes:
                 return False
-            if capability is not None and capability not in device.capabilities:
+            if capability is not None and capability not in device.capability_set:
                 return False
             return True
 
         _ = create_and_add_entities(
-            hass, entry, async_add_entities, "sensor", Sensor, is_sensor
+            hass,
+            entry,
+            async_add_entities,
+            "sensor",
+            Sensor,
+            is_sensor,
+            attribute=attr_name,
         )
 
     # Create sensor entities for any attributes that don't correspond to known
@@ -792,12 +916,7 @@ async def async_setup_entry(
 
     for id in hub.devices:
         device = hub.devices[id]
-        device_entities = [e for e in hub.entities if e.device_id == id]
-        used_device_attrs: set[str] = set()
-        for entity in device_entities:
-            if entity.device_attrs is not None:
-                for attr in entity.device_attrs:
-                    used_device_attrs.add(attr)
+        used_device_attrs = hub.get_covered_attributes(id)
         for attr in device.attributes:
             if attr not in used_device_attrs:
                 unknown_entities.append(
@@ -835,6 +954,21 @@ def add_hub_entities(
     if hub.mode_supported:
         hub_entities.append(HubitatHubModeSensor(hub=hub, device=hub.device))
 
+    hub_entities.append(HubitatCircuitSensor(hub=hub, device=hub.device))
+
+    for metric, name, unit, device_class, state_class in _METRIC_SENSORS:
+        hub_entities.append(
+            HubitatMetricSensor(
+                hub=hub,
+                device=hub.device,
+                metric=metric,
+                metric_name=name,
+                unit=unit,
+                device_class=device_class,
+                state_class=state_class,
+            )
+        )
+
     if len(hub_entities) > 0:
         hub.add_entities(hub_entities)
         async_add_entities(hub_entities)
@@ -80,12 +80,10 @@ def async_register_services(
 
     def get_entity(service: ServiceCall) -> HubitatEntity:
         entity_id = cast(str, service.data.get(ATTR_ENTITY_ID))
-        domain_data = get_domain_data(hass)
-        hubs = domain_data.values()
-        for hub in hubs:
-            for entity in hub.entities:
-                if entity.entity_id == entity_id:
-                    return cast(HubitatEntity, entity)
+        for hub in get_domain_data(hass).values():
+            entity = hub.get_entity(entity_id)
+            if entity is not None:
+                return cast(HubitatEntity, entity)
         raise ValueError(f"Invalid or unknown entity '{entity_id}'")
 
     async def clear_code(service: ServiceCall) -> None:
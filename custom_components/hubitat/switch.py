@@ -19,7 +19,7 @@ from .const import DOMAIN, ICON_ALARM, ServiceName
 from .device import HubitatEntity, HubitatEntityArgs
 from .entities import create_and_add_entities, create_and_add_event_emitters
 from .fan import is_fan
-from .hubitatmaker import Device, DeviceCapability, DeviceCommand
+from .hubitatmaker import Device, DeviceCapability, DeviceCommand, DeviceState
 from .light import is_light
 
 _LOGGER = getLogger(__name__)
@@ -75,13 +75,17 @@ class HubitatSwitch(SwitchEntity, HubitatEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:  # pyright: ignore[reportAny]
         """Turn on the switch."""
         _LOGGER.debug(f"Turning on {self.name} with {kwargs}")
-        await self.send_command(DeviceCommand.ON)
+        await self.send_command(
+            DeviceCommand.ON, expected={DeviceAttribute.SWITCH: DeviceState.ON}
+        )
 
     @override
     async def async_turn_off(self, **kwargs: Any) -> None:  # pyright: ignore[reportAny]
         """Turn off the switch."""
         _LOGGER.debug(f"Turning off {self.name}")
-        await self.send_command("off")
+        await self.send_command(
+            DeviceCommand.OFF, expected={DeviceAttribute.SWITCH: DeviceState.OFF}
+        )
 
 
 class HubitatPowerMeterSwitch(HubitatSwitch):
@@ -125,7 +129,7 @@ def is_switch(device: Device, overrides: dict[str, str] | None = None) -> bool:
         return overrides[device.id] == "switch"
 
     return (
-        DeviceCapability.SWITCH in device.capabilities
+        DeviceCapability.SWITCH in device.capability_set
         and not is_light(device, overrides)
         and not is_fan(device, overrides)
     )
@@ -133,21 +137,21 @@ def is_switch(device: Device, overrides: dict[str, str] | None = None) -> bool:
 
 def is_energy_meter(device: Device, _overrides: dict[str, str] | None = None) -> bool:
     """Return True if device can measure power."""
-    return DeviceCapability.POWER_METER in device.capabilities
+    return DeviceCapability.POWER_METER in device.capability_set
 
 
 def is_alarm(device: Device, _overrides: dict[str, str] | None = None) -> bool:
     """Return True if the device is an alarm."""
-    return DeviceCapability.ALARM in device.capabilities
+    return DeviceCapability.ALARM in device.capability_set
 
 
 def is_button_controller(device: Device) -> bool:
     """Return true if the device is a stateless button controller."""
     return (
-        DeviceCapability.PUSHABLE_BUTTON in device.capabilities
-        or DeviceCapability.HOLDABLE_BUTTON in device.capabilities
-        or DeviceCapability.DOUBLE_TAPABLE_BUTTON in device.capabilities
-        or DeviceCapability.RELEASABLE_BUTTON in device.capabilities
+        DeviceCapability.PUSHABLE_BUTTON in device.capability_set
+        or DeviceCapability.HOLDABLE_BUTTON in device.capability_set
+        or DeviceCapability.DOUBLE_TAPABLE_BUTTON in device.capability_set
+        or DeviceCapability.RELEASABLE_BUTTON in device.capability_set
     )
 
 
@@ -173,6 +177,7 @@ async def async_setup_entry(
         "switch",
         HubitatSwitch,
         is_simple_switch,
+        capabilities=(DeviceCapability.SWITCH,),
     )
 
     _ = create_and_add_entities(
@@ -182,12 +187,19 @@ async def async_setup_entry(
         "switch",
         HubitatPowerMeterSwitch,
         is_smart_switch,
+        capabilities=(DeviceCapability.SWITCH,),
     )
 
     _ = create_and_add_event_emitters(hass, config_entry, is_button_controller)
 
     alarms = create_and_add_entities(
-        hass, config_entry, async_add_entities, "switch", HubitatAlarm, is_alarm
+        hass,
+        config_entry,
+        async_add_entities,
+        "switch",
+        HubitatAlarm,
+        is_alarm,
+        capabilities=(DeviceCapability.ALARM,),
     )
 
     if len(alarms) > 0:
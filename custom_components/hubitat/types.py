@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Protocol
 
+from .hubitatmaker import Event
+
 
 class UpdateableEntity(ABC):
     entity_id: str
@@ -10,12 +12,28 @@ class UpdateableEntity(ABC):
         """Load the Hubitat device state into the entity"""
         ...
 
+    @abstractmethod
+    def handle_event(self, event: Event) -> None:
+        """Update the entity for an event from its Hubitat device"""
+        ...
+
+    @abstractmethod
+    def async_schedule_update_ha_state(self) -> None:
+        """Schedule the entity's state to be written to HA"""
+        ...
+
     @property
     @abstractmethod
     def device_attrs(self) -> tuple[str, ...] | None:
         """Return the device attributes associated with this entity"""
         ...
 
+    @property
+    @abstractmethod
+    def event_attrs(self) -> tuple[str, ...] | None:
+        """Return the device attributes whose events affect this entity"""
+        ...
+
     @property
     @abstractmethod
     def device_id(self) -> str:
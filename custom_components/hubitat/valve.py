@@ -85,7 +85,7 @@ class HubitatValve(ValveEntity, HubitatEntity):
 
 def is_valve(device: Device, _overrides: dict[str, str] | None = None) -> bool:
     """Return True if device looks like a valve."""
-    return DeviceCapability.VALVE in device.capabilities
+    return DeviceCapability.VALVE in device.capability_set
 
 
 async def async_setup_entry(
@@ -102,6 +102,7 @@ async def async_setup_entry(
         "valve",
         HubitatValve,
         is_valve,
+        capabilities=(DeviceCapability.VALVE,),
     )
 
 
@@ -0,0 +1,269 @@
+import asyncio
+from typing import Any, Literal
+
+import pytest
+from aiohttp import ClientConnectionError
+from custom_components.hubitat.hubitatmaker.const import (
+    CircuitState,
+    EventServerMode,
+)
+from custom_components.hubitat.hubitatmaker.error import CircuitOpenError
+from custom_components.hubitat.hubitatmaker.hub import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MIN_OPEN_TIME,
+    Hub,
+)
+from custom_components.hubitat.hubitatmaker.server import (
+    _shared_servers,  # pyright: ignore[reportPrivateUsage]
+)
+
+
+class FakeCommandHub(Hub):
+    """A hub that records commands instead of sending them.
+
+    Commands wait for release() to be called, so tests can queue more
+    commands while one is in flight.
+    """
+
+    def __init__(self) -> None:
+        super().__init__("127.0.0.1", "1", "token")
+        self.sent: list[tuple[str, str | int | None]] = []
+        self._gate = asyncio.Event()
+
+    def release(self) -> None:
+        self._gate.set()
+
+    async def _send_command(
+        self, device_id: str, command: str, arg: str | int | None
+    ) -> dict[str, Any]:
+        self.sent.append((command, arg))
+        await self._gate.wait()
+        return {"command": command, "arg": arg}
+
+
+async def send_while_busy(
+    hub: FakeCommandHub, commands: list[tuple[str, str | int | None]]
+) -> list[dict[str, Any]]:
+    """Send an "on" command, queue commands behind it, then let them run."""
+    first = asyncio.ensure_future(hub.send_command("1", "on", None))
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.ensure_future(hub.send_command("1", command, arg))
+        for command, arg in commands
+    ]
+    await asyncio.sleep(0)
+    hub.release()
+    _ = await first
+    return list(await asyncio.gather(*tasks))
+
+
+def test_commands_are_sent_in_order() -> None:
+    async def run() -> None:
+        hub = FakeCommandHub()
+        _ = await send_while_busy(hub, [("off", None), ("refresh", None)])
+        assert hub.sent == [("on", None), ("off", None), ("refresh", None)]
+
+    asyncio.run(run())
+
+
+def test_repeated_setter_is_collapsed() -> None:
+    async def run() -> None:
+        hub = FakeCommandHub()
+        results = await send_while_busy(
+            hub, [("setLevel", 20), ("setLevel", 30), ("setLevel", 40)]
+        )
+        assert hub.sent == [("on", None), ("setLevel", 40)]
+        assert results == [{"command": "setLevel", "arg": 40}] * 3
+
+    asyncio.run(run())
+
+
+def test_setter_is_not_moved_past_later_commands() -> None:
+    async def run() -> None:
+        hub = FakeCommandHub()
+        _ = await send_while_busy(
+            hub, [("setLevel", 20), ("off", None), ("setLevel", 30)]
+        )
+        assert hub.sent == [
+            ("on", None),
+            ("setLevel", 20),
+            ("off", None),
+            ("setLevel", 30),
+        ]
+
+    asyncio.run(run())
+
+
+def test_multi_value_setter_is_not_collapsed() -> None:
+    async def run() -> None:
+        hub = FakeCommandHub()
+        results = await send_while_busy(
+            hub, [("setCode", "2,1234"), ("setCode", "3,5678")]
+        )
+        assert hub.sent == [
+            ("on", None),
+            ("setCode", "2,1234"),
+            ("setCode", "3,5678"),
+        ]
+        assert [r["arg"] for r in results] == ["2,1234", "3,5678"]
+
+    asyncio.run(run())
+
+
+class FakeRequestHub(Hub):
+    """A hub whose Maker API requests fail while the hub is down."""
+
+    def __init__(self) -> None:
+        super().__init__("127.0.0.1", "1", "token")
+        self.down = True
+        self.requests = 0
+        self.states: list[CircuitState] = []
+        self.add_circuit_listener(self.states.append)
+
+    async def _send_request(
+        self,
+        path: str,
+        method: Literal["GET", "POST"],
+        on_throttle: Any,
+    ) -> Any:
+        self.requests += 1
+        if self.down:
+            raise ClientConnectionError("hub is down")
+        return {}
+
+    def allow_probe(self) -> None:
+        """Skip the rest of the circuit's open time."""
+        self._circuit._retry_at = 0  # pyright: ignore[reportPrivateUsage]
+
+
+async def fail_requests(hub: FakeRequestHub, count: int) -> None:
+    for _ in range(count):
+        with pytest.raises(ClientConnectionError):
+            await hub._api_request("devices")  # pyright: ignore[reportPrivateUsage]
+
+
+def test_circuit_opens_after_repeated_failures() -> None:
+    async def run() -> None:
+        hub = FakeRequestHub()
+        await fail_requests(hub, CIRCUIT_FAILURE_THRESHOLD)
+        assert hub.circuit_state == CircuitState.OPEN
+        assert hub.states == [CircuitState.OPEN]
+
+        # Requests fail without being sent while the circuit is open
+        with pytest.raises(CircuitOpenError):
+            await hub._api_request("devices")  # pyright: ignore[reportPrivateUsage]
+        assert hub.requests == CIRCUIT_FAILURE_THRESHOLD
+        assert 0 < hub.circuit_retry_in <= CIRCUIT_MIN_OPEN_TIME
+
+    asyncio.run(run())
+
+
+def test_successful_probe_closes_circuit() -> None:
+    async def run() -> None:
+        hub = FakeRequestHub()
+        await fail_requests(hub, CIRCUIT_FAILURE_THRESHOLD)
+        hub.down = False
+        hub.allow_probe()
+
+        assert await hub._api_request("devices") == {}  # pyright: ignore[reportPrivateUsage]
+        assert hub.circuit_state == CircuitState.CLOSED
+        assert hub.states == [
+            CircuitState.OPEN,
+            CircuitState.HALF_OPEN,
+            CircuitState.CLOSED,
+        ]
+        assert hub.circuit_retry_in == 0
+
+    asyncio.run(run())
+
+
+def test_failed_probe_reopens_circuit_for_longer() -> None:
+    async def run() -> None:
+        hub = FakeRequestHub()
+        await fail_requests(hub, CIRCUIT_FAILURE_THRESHOLD)
+        hub.allow_probe()
+
+        # A single failed probe reopens the circuit
+        await fail_requests(hub, 1)
+        assert hub.circuit_state == CircuitState.OPEN
+
+        # Open times are jittered between half and all of the open time, which
+        # doubles after each failed probe
+        assert hub.circuit_retry_in > CIRCUIT_MIN_OPEN_TIME * 0.9
+        assert hub.circuit_retry_in <= 2 * CIRCUIT_MIN_OPEN_TIME
+
+    asyncio.run(run())
+
+
+class FakeEventHub(Hub):
+    """A hub that receives events without telling the Maker API where to send
+    them."""
+
+    def __init__(self, app_id: str = "1") -> None:
+        super().__init__(
+            "127.0.0.1", app_id, "token", event_server_mode=EventServerMode.LOOP
+        )
+        self.event_urls: list[str | None] = []
+
+    async def set_event_url(self, event_url: str | None) -> None:
+        self.event_urls.append(event_url)
+
+
+def test_restarting_event_server_replaces_receiver() -> None:
+    async def run() -> None:
+        hub = FakeEventHub()
+        await hub._start_server()  # pyright: ignore[reportPrivateUsage]
+
+        # A cancelled connection attempt may leave the receiver registered
+        await hub._start_server()  # pyright: ignore[reportPrivateUsage]
+        receiver = hub._receiver  # pyright: ignore[reportPrivateUsage]
+        assert receiver is not None
+        assert receiver.server.receivers == [receiver]
+
+        await hub.async_stop()
+        assert not _shared_servers
+
+    asyncio.run(run())
+
+
+def test_hubs_share_an_event_server() -> None:
+    async def run() -> None:
+        hub1 = FakeEventHub("1")
+        hub2 = FakeEventHub("2")
+        await hub1._start_server()  # pyright: ignore[reportPrivateUsage]
+        await hub2._start_server()  # pyright: ignore[reportPrivateUsage]
+        receiver1 = hub1._receiver  # pyright: ignore[reportPrivateUsage]
+        receiver2 = hub2._receiver  # pyright: ignore[reportPrivateUsage]
+        assert receiver1 is not None and receiver2 is not None
+        assert receiver1.server is receiver2.server
+        assert receiver1.url != receiver2.url
+
+        await hub1.async_stop()
+        assert receiver2.server.receivers == [receiver2]
+        await hub2.async_stop()
+        assert not _shared_servers
+
+    asyncio.run(run())
+
+
+def test_requests_share_a_pooled_session() -> None:
+    async def run() -> None:
+        hub = Hub("127.0.0.1", "1", "token", connection_limit=4)
+        session = hub._get_session()  # pyright: ignore[reportPrivateUsage]
+        assert hub._get_session() is session  # pyright: ignore[reportPrivateUsage]
+        assert session.connector is not None
+        assert session.connector.limit == 4
+
+        hub.stop()
+        # The session is closed in the background
+        await asyncio.sleep(0.01)
+        assert session.closed
+
+        # A stopped hub opens a new session if it's used again
+        new_session = hub._get_session()  # pyright: ignore[reportPrivateUsage]
+        assert new_session is not session
+        await hub.async_stop()
+        await asyncio.sleep(0.01)
+        assert new_session.closed
+
+    asyncio.run(run())
@@ -0,0 +1,148 @@
+import asyncio
+import socket
+from typing import Any
+
+import aiohttp
+import pytest
+from custom_components.hubitat.hubitatmaker.server import (
+    _IngestQueue,  # pyright: ignore[reportPrivateUsage]
+    async_add_shared_receiver,
+    async_remove_shared_receiver,
+)
+
+HOST = "127.0.0.1"
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+async def post_event(url: str, event: dict[str, Any]) -> int:
+    async with (
+        aiohttp.ClientSession() as session,
+        session.post(url, json={"content": event}) as resp,
+    ):
+        return resp.status
+
+
+def test_in_loop_receiver_handles_events_directly() -> None:
+    async def run() -> None:
+        events: list[dict[str, Any]] = []
+        receiver = await async_add_shared_receiver(
+            "/hub1", events.append, HOST, 0, in_loop=True
+        )
+        try:
+            assert await post_event(receiver.url, {"deviceId": "1"}) == 200
+        finally:
+            await async_remove_shared_receiver(receiver)
+        assert events == [{"content": {"deviceId": "1"}}]
+
+    asyncio.run(run())
+
+
+def test_shared_receivers_are_routed_by_path() -> None:
+    async def run() -> None:
+        events1: list[dict[str, Any]] = []
+        events2: list[dict[str, Any]] = []
+        receiver1 = await async_add_shared_receiver(
+            "/hub1", events1.append, HOST, 0, in_loop=True
+        )
+        receiver2 = await async_add_shared_receiver(
+            "/hub2", events2.append, HOST, 0, in_loop=True
+        )
+        try:
+            assert receiver1.server is receiver2.server
+            _ = await post_event(receiver2.url, {"deviceId": "2"})
+        finally:
+            await async_remove_shared_receiver(receiver1)
+            await async_remove_shared_receiver(receiver2)
+        assert events1 == []
+        assert events2 == [{"content": {"deviceId": "2"}}]
+
+    asyncio.run(run())
+
+
+def test_removing_last_receiver_frees_fixed_port() -> None:
+    async def run() -> None:
+        port = get_free_port()
+        receiver = await async_add_shared_receiver(
+            "/hub1", lambda _: None, HOST, port, in_loop=True
+        )
+        await async_remove_shared_receiver(receiver)
+
+        # A reload binds the same port again as soon as the old hub is stopped
+        receiver = await async_add_shared_receiver(
+            "/hub1", lambda _: None, HOST, port, in_loop=True
+        )
+        await async_remove_shared_receiver(receiver)
+
+    asyncio.run(run())
+
+
+def test_fixed_port_rejects_mixed_server_modes() -> None:
+    async def run() -> None:
+        port = get_free_port()
+        receiver = await async_add_shared_receiver(
+            "/hub1", lambda _: None, HOST, port, in_loop=True
+        )
+        try:
+            with pytest.raises(ValueError, match="same event server mode"):
+                _ = await async_add_shared_receiver(
+                    "/hub2", lambda _: None, HOST, port, in_loop=False
+                )
+        finally:
+            await async_remove_shared_receiver(receiver)
+
+    asyncio.run(run())
+
+
+def get_device_attr(event: dict[str, Any]) -> tuple[str, str]:
+    return (event["deviceId"], event["name"])
+
+
+def device_event(device_id: str, name: str, value: str) -> dict[str, Any]:
+    return {"deviceId": device_id, "name": name, "value": value}
+
+
+def test_ingest_queue_asks_for_one_drain_at_a_time() -> None:
+    queue = _IngestQueue(10, get_device_attr)
+    assert queue.put(device_event("1", "switch", "on"))
+    assert not queue.put(device_event("2", "switch", "on"))
+    assert len(queue.take()) == 2
+    assert queue.put(device_event("1", "switch", "off"))
+
+
+def test_full_ingest_queue_replaces_events_with_the_same_key() -> None:
+    queue = _IngestQueue(2, get_device_attr)
+    _ = queue.put(device_event("1", "level", "10"))
+    _ = queue.put(device_event("2", "switch", "on"))
+    _ = queue.put(device_event("1", "level", "20"))
+
+    # The newer value goes to the end, so events stay in arrival order
+    assert queue.take() == [
+        device_event("2", "switch", "on"),
+        device_event("1", "level", "20"),
+    ]
+    stats = queue.stats()
+    assert stats["coalesced"] == 1
+    assert stats["dropped"] == 0
+    assert stats["high_water"] == 2
+
+
+def test_full_ingest_queue_drops_the_oldest_event() -> None:
+    queue = _IngestQueue(2, get_device_attr)
+    _ = queue.put(device_event("1", "level", "10"))
+    _ = queue.put(device_event("2", "switch", "on"))
+    _ = queue.put(device_event("3", "switch", "on"))
+
+    assert queue.take() == [
+        device_event("2", "switch", "on"),
+        device_event("3", "switch", "on"),
+    ]
+    assert queue.stats()["dropped"] == 1
+
+    # The dropped event's key no longer refers to a queued event
+    _ = queue.put(device_event("1", "level", "20"))
+    assert queue.take() == [device_event("1", "level", "20")]
@@ -0,0 +1,35 @@
+from custom_components.hubitat.hubitatmaker.types import Attribute
+
+
+def create_attribute(value: str) -> Attribute:
+    return Attribute(
+        {"name": "lockCodes", "dataType": "STRING", "currentValue": value, "unit": None}
+    )
+
+
+def test_dict_value_returns_a_copy() -> None:
+    attr = create_attribute('{"1": {"name": "Alice", "code": "1234"}}')
+    codes = attr.dict_value
+    assert codes is not None
+    del codes["1"]["code"]
+
+    assert attr.dict_value == {"1": {"name": "Alice", "code": "1234"}}
+
+
+def test_list_value_returns_a_copy() -> None:
+    attr = create_attribute('["low", "medium", "high"]')
+    speeds = attr.list_value
+    assert speeds is not None
+    speeds.clear()
+
+    assert attr.list_value == ["low", "medium", "high"]
+
+
+def test_cached_values_follow_updates() -> None:
+    attr = create_attribute("10")
+    assert attr.float_value == 10.0
+
+    assert attr.update_value("20.5")
+    assert attr.float_value == 20.5
+    assert attr.int_value == 20
+    assert not attr.update_value(20.5)
@@ -0,0 +1,53 @@
+import json
+from unittest.mock import MagicMock
+
+from custom_components.hubitat.const import HassStateAttribute
+from custom_components.hubitat.hubitatmaker import Device
+from custom_components.hubitat.lock import HubitatLock
+
+LOCK_CODES = {
+    "1": {"name": "Alice", "code": "1234"},
+    "2": {"name": "Bob", "code": "5678"},
+}
+
+
+def create_lock() -> HubitatLock:
+    device = Device(
+        {
+            "id": "5",
+            "name": "Front Door",
+            "label": "Front Door",
+            "type": "Generic Z-Wave Lock",
+            "attributes": [
+                {
+                    "name": "lock",
+                    "dataType": "ENUM",
+                    "currentValue": "locked",
+                    "unit": None,
+                },
+                {
+                    "name": "lockCodes",
+                    "dataType": "JSON_OBJECT",
+                    "currentValue": json.dumps(LOCK_CODES),
+                    "unit": None,
+                },
+            ],
+            "capabilities": ["Lock", "LockCodes"],
+            "commands": ["lock", "unlock"],
+        }
+    )
+    hub = MagicMock()
+    hub.id = "1234abcd"
+    return HubitatLock(hub=hub, device=device)
+
+
+def test_codes_never_include_pins() -> None:
+    lock = create_lock()
+
+    # Each state write reads the codes again
+    for _ in range(2):
+        lock.load_state()
+        codes = lock.extra_state_attributes[HassStateAttribute.CODES]
+        assert codes == {"1": {"name": "Alice"}, "2": {"name": "Bob"}}
+        assert "1234" not in json.dumps(codes)
+        assert "5678" not in json.dumps(codes)
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Benchmark Hubitat event ingestion.
+
+A local fake hub POSTs synthetic Maker API events at a fixed rate through the
+Hubitat integration's event path:
+
+  hubitatmaker Server -> hubitatmaker Hub.process_event
+    -> integration Hub.handle_event -> entity load_state and state write
+
+The result is printed as JSON: throughput, event-to-state latency (from the
+fake hub sending an event to the entity scheduling its state write), process
+CPU time per event, and the time the JSON decoder takes to decode a snapshot
+of the benchmark devices. The fake hub runs in a separate process so its
+CPU time isn't counted.
+
+Run it with the Python environment Home Assistant runs in:
+  python3 tools/hubitat_event_bench.py --devices 50 --attributes 8 --rate 500
+Optional:
+  --duration SECONDS     how long to send events (default 10)
+  --server-mode MODE     thread or loop (default thread)
+  --batch-window MS      event batch window in milliseconds (default 0)
+  --json-decoder NAME    orjson or stdlib (default orjson if installed)
+  --output PATH          also write the JSON result to PATH
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from types import MappingProxyType
+from typing import Any
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+import aiohttp
+from custom_components.hubitat.const import DOMAIN, H_CONF_APP_ID
+from custom_components.hubitat.hub import Hub
+from custom_components.hubitat.hubitatmaker import (
+    Device,
+    Event,
+    EventServerMode,
+    decode_json,
+    get_json_decoder,
+    set_json_decoder,
+)
+from custom_components.hubitat.hubitatmaker import Hub as HubitatHub
+from custom_components.hubitat.hubitatmaker.decoder import DECODERS
+from custom_components.hubitat.hubitatmaker.server import create_server
+from custom_components.hubitat.sensor import HubitatSensor
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+# How long to wait for in-flight events after the fake hub stops sending
+DRAIN_TIMEOUT = 5.0
+
+# How many times to decode the device snapshot when timing the JSON decoder
+DECODE_ROUNDS = 20
+
+
+class Stats:
+    """Counters shared by the receiver and the benchmark entities."""
+
+    def __init__(self) -> None:
+        self.received = 0
+        self.state_writes = 0
+        self.latencies: list[float] = []
+        self.last_write = 0.0
+
+
+class BenchSensor(HubitatSensor):
+    """A sensor that records when its state would be written."""
+
+    def __init__(self, stats: Stats, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._stats = stats
+        self._sent_at: float | None = None
+
+    def handle_event(self, event: Event) -> None:
+        # The fake hub sends its send time as the event description
+        self._sent_at = float(event.description or 0) or None
+        super().handle_event(event)
+
+    def async_schedule_update_ha_state(self, force_refresh: bool = False) -> None:
+        now = time.time()
+        self._stats.state_writes += 1
+        self._stats.last_write = now
+        if self._sent_at is not None:
+            self._stats.latencies.append(now - self._sent_at)
+            self._sent_at = None
+
+
+def make_device(index: int, attributes: list[str]) -> dict[str, Any]:
+    return {
+        "id": str(index + 1),
+        "name": f"Benchmark Sensor {index + 1}",
+        "label": f"Benchmark Sensor {index + 1}",
+        "type": "Virtual Omni Sensor",
+        "attributes": [
+            {"name": attr, "currentValue": 0, "dataType": "NUMBER", "unit": None}
+            for attr in attributes
+        ],
+        "capabilities": ["Sensor"],
+        "commands": [],
+    }
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    return values[min(len(values) - 1, round(pct / 100 * (len(values) - 1)))]
+
+
+async def send_events(
+    url: str,
+    device_ids: list[str],
+    attributes: list[str],
+    rate: float,
+    duration: float,
+) -> dict[str, Any]:
+    """POST events to url at a fixed rate, cycling through devices and
+    attributes."""
+    total = int(rate * duration)
+    errors = 0
+
+    async def post(session: aiohttp.ClientSession, payload: dict[str, Any]) -> None:
+        nonlocal errors
+        try:
+            async with session.post(url, json=payload) as resp:
+                if resp.status != 200:
+                    errors += 1
+        except aiohttp.ClientError:
+            errors += 1
+
+    connector = aiohttp.TCPConnector(limit=64)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks: list[asyncio.Task[None]] = []
+        start = time.monotonic()
+        for i in range(total):
+            delay = start + i / rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            device_id = device_ids[i % len(device_ids)]
+            attr = attributes[(i // len(device_ids)) % len(attributes)]
+            payload = {
+                "content": {
+                    "deviceId": device_id,
+                    "displayName": f"Benchmark Sensor {device_id}",
+                    "name": attr,
+                    # Every value is new so no event is skipped as a repeat
+                    "value": str(i + 1),
+                    "unit": None,
+                    "descriptionText": repr(time.time()),
+                }
+            }
+            tasks.append(asyncio.create_task(post(session, payload)))
+        _ = await asyncio.gather(*tasks)
+        send_seconds = time.monotonic() - start
+
+    return {"sent": total, "errors": errors, "send_seconds": send_seconds}
+
+
+def run_sender(
+    queue: "multiprocessing.Queue[dict[str, Any]]",
+    url: str,
+    device_ids: list[str],
+    attributes: list[str],
+    rate: float,
+    duration: float,
+) -> None:
+    queue.put(asyncio.run(send_events(url, device_ids, attributes, rate, duration)))
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.json_decoder:
+        set_json_decoder(args.json_decoder)
+
+    stats = Stats()
+    attributes = [f"attribute{i}" for i in range(args.attributes)]
+    devices = [make_device(i, attributes) for i in range(args.devices)]
+
+    # Time decoding a device snapshot, which dominates startup with a large hub
+    snapshot = json.dumps(devices).encode()
+    decode_start = time.perf_counter()
+    for _ in range(DECODE_ROUNDS):
+        _ = decode_json(snapshot)
+    decode_seconds = (time.perf_counter() - decode_start) / DECODE_ROUNDS
+
+    hubitat_hub = HubitatHub(
+        "127.0.0.1",
+        "1",
+        "benchmark",
+        event_server_mode=EventServerMode(args.server_mode),
+        event_batch_window=args.batch_window / 1000,
+    )
+    hubitat_hub.restore_state({"devices": devices, "modes": [], "hsm_status": None})
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = ConfigEntry(
+            version=1,
+            minor_version=0,
+            domain=DOMAIN,
+            title="Hubitat (benchmark)",
+            data={
+                CONF_HOST: "127.0.0.1",
+                H_CONF_APP_ID: "1",
+                CONF_ACCESS_TOKEN: "benchmark",
+            },
+            source="user",
+            discovery_keys=MappingProxyType({}),
+            options=None,
+            unique_id=None,
+            subentries_data=None,
+        )
+        hub = Hub(
+            hass,
+            entry,
+            1,
+            hubitat_hub,
+            Device({"id": "benchmark", "attributes": []}),
+        )
+
+        for device_id, device in hubitat_hub.devices.items():
+            hubitat_hub.add_device_listener(device_id, hub.handle_event)
+            hub.add_entities(
+                [
+                    BenchSensor(stats, hub=hub, device=device, attribute=attr)
+                    for attr in attributes
+                ]
+            )
+        hubitat_hub.add_batch_listener(
+            hub._write_pending_states  # pyright: ignore[reportPrivateUsage]
+        )
+
+        def receive(event: dict[str, Any]) -> None:
+            stats.received += 1
+            hubitat_hub.process_event(event)
+
+        in_loop = args.server_mode == EventServerMode.LOOP
+        server = create_server(receive, "127.0.0.1", 0, None, in_loop)
+        if in_loop:
+            await server.async_start()
+        else:
+            server.start()
+
+        ctx = multiprocessing.get_context("spawn")
+        queue: multiprocessing.Queue[dict[str, Any]] = ctx.Queue()
+        sender = ctx.Process(
+            target=run_sender,
+            args=(
+                queue,
+                f"{server.url}/",
+                list(hubitat_hub.devices),
+                attributes,
+                args.rate,
+                args.duration,
+            ),
+        )
+
+        loop = asyncio.get_running_loop()
+        cpu_start = time.process_time()
+        wall_start = time.time()
+        sender.start()
+        sent = await loop.run_in_executor(None, queue.get)
+        await loop.run_in_executor(None, sender.join)
+
+        # Wait for events that were sent but not yet processed
+        drain_end = time.monotonic() + DRAIN_TIMEOUT + args.batch_window / 1000
+        while stats.received < sent["sent"] and time.monotonic() < drain_end:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(args.batch_window / 1000 + 0.05)
+
+        cpu_seconds = time.process_time() - cpu_start
+        queue_stats = server.stats
+        await server.async_stop()
+
+    latencies = sorted(stats.latencies)
+    elapsed = (stats.last_write or time.time()) - wall_start
+
+    def ms(value: float | None) -> float | None:
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "benchmark": "hubitat_event_ingest",
+        "generated_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "config": {
+            "devices": args.devices,
+            "attributes": args.attributes,
+            "rate": args.rate,
+            "duration": args.duration,
+            "server_mode": args.server_mode,
+            "batch_window_ms": args.batch_window,
+            "json_decoder": get_json_decoder(),
+        },
+        "events": {
+            "sent": sent["sent"],
+            "send_errors": sent["errors"],
+            "received": stats.received,
+            "state_writes": stats.state_writes,
+            "coalesced": queue_stats["coalesced"],
+            "dropped": queue_stats["dropped"],
+            "queue_high_water": queue_stats["high_water"],
+        },
+        "throughput_eps": round(stats.received / elapsed, 1) if elapsed > 0 else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p90": ms(percentile(latencies, 90)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1] if latencies else None),
+        },
+        "snapshot_decode_ms": ms(decode_seconds),
+        "cpu_ms_per_event": (
+            round(cpu_seconds * 1000 / stats.received, 4) if stats.received else None
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Hubitat event ingestion")
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--attributes", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=200, help="events per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument(
+        "--server-mode",
+        choices=[EventServerMode.THREAD.value, EventServerMode.LOOP.value],
+        default=EventServerMode.THREAD.value,
+    )
+    parser.add_argument("--batch-window", type=int, default=0, help="milliseconds")
+    parser.add_argument("--json-decoder", choices=sorted(DECODERS))
+    parser.add_argument("--output", help="also write the JSON result to this path")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    return 0 if result["events"]["received"] == result["events"]["sent"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Run a fake Hubitat Maker API for load and soak testing.
+
+The fake hub serves the Maker API endpoints the integration uses (devices,
+devices/all, devices/{id}, device commands, modes, hsm, and postURL) and
+POSTs device events to the registered event URL at a scripted rate. Requests
+can be slowed down or failed to exercise retry and throttling paths.
+
+Devices are seeded from a JSON dump, which may be:
+  - a list of Maker API devices/{id} or devices/all records
+  - a hubitatmaker export_state() snapshot ({"devices": [...], ...})
+  - the integration's device cache (.storage/hubitat.<entry_id>.devices)
+If no dump is given, synthetic sensor devices are generated.
+
+Run it with any Python that has aiohttp:
+  python3 tools/hubitat_fake_hub.py --devices 100 --events 50:60,500:10
+Point the integration (or hubitatmaker.Hub) at http://HOST:PORT with app ID
+and token matching --app-id and --token.
+
+Optional:
+  --seed-file PATH       JSON device dump to serve
+  --host HOST            address to listen on (default 127.0.0.1)
+  --port PORT            port to listen on (default 8080)
+  --latency MS           added latency per API request (default 0)
+  --jitter MS            random extra latency per API request (default 0)
+  --error-rate FRACTION  fraction of API requests that fail with a 5xx
+  --timeout-rate FRAC    fraction of API requests that fail with a 408
+  --events SCRIPT        event phases as RATE:SECONDS[,RATE:SECONDS...]
+  --repeat               repeat the event script until stopped
+  --event-url URL        POST events here without waiting for postURL
+  --random-seed N        seed for values, latency and faults
+
+Request and event counters are available at GET /stats and are printed as
+JSON on exit.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import sys
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Any
+from urllib.parse import unquote
+
+import aiohttp
+from aiohttp import web
+
+HSM_STATES = {
+    "armAway": "armedAway",
+    "armHome": "armedHome",
+    "armNight": "armedNight",
+    "disarm": "disarmed",
+    "disarmAll": "disarmed",
+    "armAll": "armedAway",
+    "cancelAlerts": "disarmed",
+}
+
+DEFAULT_MODES = ["Day", "Evening", "Night", "Away"]
+
+# Commands that set an attribute, as command -> (attribute, fixed value). A
+# value of None means the command's argument is the new value.
+COMMAND_ATTRIBUTES: dict[str, tuple[str, str | None]] = {
+    "on": ("switch", "on"),
+    "off": ("switch", "off"),
+    "lock": ("lock", "locked"),
+    "unlock": ("lock", "unlocked"),
+    "open": ("door", "open"),
+    "close": ("door", "closed"),
+    "setLevel": ("level", None),
+    "setPosition": ("position", None),
+    "setColorTemperature": ("colorTemperature", None),
+    "setHue": ("hue", None),
+    "setSaturation": ("saturation", None),
+    "setSpeed": ("speed", None),
+    "setHeatingSetpoint": ("heatingSetpoint", None),
+    "setCoolingSetpoint": ("coolingSetpoint", None),
+    "setThermostatMode": ("thermostatMode", None),
+    "setThermostatFanMode": ("thermostatFanMode", None),
+    "push": ("pushed", None),
+    "hold": ("held", None),
+}
+
+
+def load_devices(path: str) -> tuple[list[dict[str, Any]], list[str], str]:
+    """Load devices, modes, and HSM status from a JSON dump."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Home Assistant Store files wrap their content in a data key
+    if isinstance(data, dict) and "data" in data and "devices" not in data:
+        data = data["data"]
+
+    modes = DEFAULT_MODES
+    hsm = "disarmed"
+    if isinstance(data, dict):
+        if data.get("modes"):
+            modes = [m["name"] for m in data["modes"]]
+        hsm = data.get("hsm_status") or hsm
+        data = data.get("devices", [])
+
+    return [normalize_device(d) for d in data], modes, hsm
+
+
+def normalize_device(entry: dict[str, Any]) -> dict[str, Any]:
+    """Convert a devices/{id} or devices/all record to devices/{id} form."""
+    device = {
+        "id": str(entry["id"]),
+        "name": entry.get("name") or entry.get("label") or str(entry["id"]),
+        "label": entry.get("label") or entry.get("name") or str(entry["id"]),
+        "type": entry.get("type", "Virtual Device"),
+        "room": entry.get("room"),
+        "date": entry.get("date") or activity_time(),
+        "capabilities": entry.get("capabilities", []),
+        "commands": entry.get("commands", []),
+        "attributes": [],
+    }
+
+    attrs = entry.get("attributes", [])
+    if isinstance(attrs, dict):
+        # devices/all lists attributes as a flat name -> value map
+        for name, value in attrs.items():
+            if name in ("dataType", "values"):
+                continue
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            device["attributes"].append(
+                {
+                    "name": name,
+                    "currentValue": value,
+                    "dataType": "NUMBER" if is_number else "STRING",
+                }
+            )
+    else:
+        device["attributes"] = [dict(a) for a in attrs]
+
+    return device
+
+
+def make_devices(count: int) -> list[dict[str, Any]]:
+    """Generate synthetic multi-sensor devices."""
+    return [
+        {
+            "id": str(i + 1),
+            "name": f"Fake Sensor {i + 1}",
+            "label": f"Fake Sensor {i + 1}",
+            "type": "Virtual Omni Sensor",
+            "room": f"Room {i % 10 + 1}",
+            "date": activity_time(),
+            "capabilities": [
+                "Sensor",
+                "TemperatureMeasurement",
+                "RelativeHumidityMeasurement",
+                "IlluminanceMeasurement",
+                "MotionSensor",
+                "Switch",
+            ],
+            "commands": ["on", "off", "refresh"],
+            "attributes": [
+                {
+                    "name": "temperature",
+                    "currentValue": 20.0,
+                    "dataType": "NUMBER",
+                    "unit": "°C",
+                },
+                {
+                    "name": "humidity",
+                    "currentValue": 45,
+                    "dataType": "NUMBER",
+                    "unit": "%rh",
+                },
+                {
+                    "name": "illuminance",
+                    "currentValue": 100,
+                    "dataType": "NUMBER",
+                    "unit": "lx",
+                },
+                {
+                    "name": "motion",
+                    "currentValue": "inactive",
+                    "dataType": "ENUM",
+                    "values": ["active", "inactive"],
+                },
+                {
+                    "name": "switch",
+                    "currentValue": "off",
+                    "dataType": "ENUM",
+                    "values": ["on", "off"],
+                },
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def activity_time() -> str:
+    """Return the current time in the format Maker API reports activity."""
+    return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "+0000"
+
+
+def parse_script(script: str) -> list[tuple[float, float]]:
+    """Parse an event script like "50:60,500:10" into (rate, seconds)."""
+    phases: list[tuple[float, float]] = []
+    if not script:
+        return phases
+    for phase in script.split(","):
+        rate, _, seconds = phase.partition(":")
+        phases.append((float(rate), float(seconds or "inf")))
+    return phases
+
+
+class FakeHub:
+    """A fake Maker API and event source."""
+
+    def __init__(
+        self,
+        devices: list[dict[str, Any]],
+        modes: list[str],
+        hsm: str,
+        args: argparse.Namespace,
+    ) -> None:
+        self.devices = {d["id"]: d for d in devices}
+        self.modes = [
+            {"id": i + 1, "name": name, "active": i == 0}
+            for i, name in enumerate(modes)
+        ]
+        self.hsm = hsm
+        self.args = args
+        self.event_url: str | None = args.event_url
+        self.url_registered = asyncio.Event()
+        if self.event_url:
+            self.url_registered.set()
+        self.random = random.Random(args.random_seed)
+        self.stats: Counter[str] = Counter()
+        self._session: aiohttp.ClientSession | None = None
+        self._event_tasks: set[asyncio.Task[None]] = set()
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._api_middleware])
+        base = f"/apps/api/{self.args.app_id}"
+        app.add_routes(
+            [
+                web.get("/stats", self.handle_stats),
+                web.get(f"{base}/devices", self.handle_devices),
+                web.get(f"{base}/devices/all", self.handle_devices_all),
+                web.get(f"{base}/devices/{{id}}", self.handle_device),
+                web.get(f"{base}/devices/{{id}}/{{command}}", self.handle_command),
+                web.get(
+                    f"{base}/devices/{{id}}/{{command}}/{{arg}}", self.handle_command
+                ),
+                web.get(f"{base}/modes", self.handle_modes),
+                web.get(f"{base}/modes/{{id}}", self.handle_set_mode),
+                web.get(f"{base}/hsm", self.handle_hsm),
+                web.get(f"{base}/hsm/{{mode}}", self.handle_set_hsm),
+                web.get(f"{base}/postURL/{{url:.+}}", self.handle_post_url),
+            ]
+        )
+        return app
+
+    @web.middleware
+    async def _api_middleware(self, request: web.Request, handler: Any) -> Any:
+        """Check the access token and inject latency and failures."""
+        if request.path == "/stats":
+            return await handler(request)
+
+        self.stats["requests"] += 1
+
+        delay = self.args.latency + self.random.uniform(0, self.args.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if request.query.get("access_token") != self.args.token:
+            self.stats["status_401"] += 1
+            return web.json_response(
+                {"error": True, "type": "AccessDenied"}, status=401
+            )
+
+        roll = self.random.random()
+        if roll < self.args.error_rate:
+            status = self.random.choice((500, 502, 503))
+            self.stats[f"status_{status}"] += 1
+            return web.Response(status=status, text="Injected server error")
+        if roll < self.args.error_rate + self.args.timeout_rate:
+            self.stats["status_408"] += 1
+            return web.Response(status=408, text="Injected request timeout")
+
+        response = await handler(request)
+        self.stats[f"status_{response.status}"] += 1
+        return response
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    async def handle_devices(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {k: d[k] for k in ("id", "name", "label", "type", "room")}
+                for d in self.devices.values()
+            ]
+        )
+
+    async def handle_devices_all(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {
+                    **{k: d[k] for k in ("id", "name", "label", "type", "room")},
+                    "date": d["date"],
+                    "attributes": {
+                        a["name"]: a.get("currentValue") for a in d["attributes"]
+                    },
+                    "capabilities": d["capabilities"],
+                    "commands": d["commands"],
+                }
+                for d in self.devices.values()
+            ]
+        )
+
+    async def handle_device(self, request: web.Request) -> web.Response:
+        device = self.devices.get(request.match_info["id"])
+        if device is None:
+            raise web.HTTPNotFound()
+        return web.json_response(device)
+
+    async def handle_command(self, request: web.Request) -> web.Response:
+        device = self.devices.get(request.match_info["id"])
+        if device is None:
+            raise web.HTTPNotFound()
+
+        command = request.match_info["command"]
+        arg = request.match_info.get("arg")
+        self.stats["commands"] += 1
+
+        if command in COMMAND_ATTRIBUTES:
+            name, value = COMMAND_ATTRIBUTES[command]
+            if value is None:
+                value = arg
+            attr = get_attribute(device, name)
+            if attr is not None and value is not None:
+                self.set_attribute(device, attr, coerce(attr, value))
+
+        return web.json_response(device)
+
+    async def handle_modes(self, request: web.Request) -> web.Response:
+        return web.json_response(self.modes)
+
+    async def handle_set_mode(self, request: web.Request) -> web.Response:
+        mode_id = int(request.match_info["id"])
+        for mode in self.modes:
+            mode["active"] = mode["id"] == mode_id
+            if mode["active"]:
+                self.emit(
+                    {"deviceId": None, "name": "mode", "value": mode["name"]},
+                )
+        return web.json_response(self.modes)
+
+    async def handle_hsm(self, request: web.Request) -> web.Response:
+        return web.json_response({"hsm": self.hsm})
+
+    async def handle_set_hsm(self, request: web.Request) -> web.Response:
+        mode = request.match_info["mode"]
+        if mode not in HSM_STATES:
+            raise web.HTTPNotFound()
+        self.hsm = HSM_STATES[mode]
+        self.emit({"deviceId": None, "name": "hsmStatus", "value": self.hsm})
+        return web.json_response({"hsm": self.hsm})
+
+    async def handle_post_url(self, request: web.Request) -> web.Response:
+        self.event_url = unquote(request.match_info["url"])
+        self.url_registered.set()
+        print(f"Sending events to {self.event_url}", file=sys.stderr)
+        return web.json_response({"url": self.event_url})
+
+    def set_attribute(
+        self, device: dict[str, Any], attr: dict[str, Any], value: Any
+    ) -> None:
+        """Update an attribute and send an event for it."""
+        attr["currentValue"] = value
+        device["date"] = activity_time()
+        self.emit(
+            {
+                "deviceId": device["id"],
+                "displayName": device["label"],
+                "name": attr["name"],
+                "value": str(value),
+                "unit": attr.get("unit"),
+                "descriptionText": f"{device['label']} {attr['name']} is {value}",
+            }
+        )
+
+    def emit(self, content: dict[str, Any]) -> None:
+        """POST an event to the registered event URL in the background."""
+        if not self.event_url:
+            return
+        content = {"displayName": None, "unit": None, "type": None, **content}
+        task = asyncio.get_running_loop().create_task(self._post(content))
+        self._event_tasks.add(task)
+        task.add_done_callback(self._event_tasks.discard)
+
+    async def _post(self, content: dict[str, Any]) -> None:
+        assert self.event_url is not None
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ssl=False)
+            )
+        try:
+            async with self._session.post(
+                self.event_url, json={"content": content}
+            ) as resp:
+                if resp.status == 200:
+                    self.stats["events_sent"] += 1
+                else:
+                    self.stats["event_errors"] += 1
+        except aiohttp.ClientError:
+            self.stats["event_errors"] += 1
+
+    async def run_events(self, phases: list[tuple[float, float]]) -> None:
+        """Generate device events following an event script."""
+        candidates = [
+            (device, attr)
+            for device in self.devices.values()
+            for attr in device["attributes"]
+            if attr.get("dataType") == "NUMBER" or attr.get("values")
+        ]
+        if not candidates or not phases:
+            return
+
+        await self.url_registered.wait()
+
+        while True:
+            for rate, seconds in phases:
+                if rate <= 0:
+                    await asyncio.sleep(seconds)
+                    continue
+
+                print(f"Sending {rate:g} events/s for {seconds:g}s", file=sys.stderr)
+                start = time.monotonic()
+                i = 0
+                while (elapsed := time.monotonic() - start) < seconds:
+                    delay = i / rate - elapsed
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    device, attr = self.random.choice(candidates)
+                    self.set_attribute(device, attr, self.next_value(attr))
+                    i += 1
+
+            if not self.args.repeat:
+                return
+
+    def next_value(self, attr: dict[str, Any]) -> Any:
+        """Return a new value for an attribute."""
+        if attr.get("values"):
+            values = [v for v in attr["values"] if v != attr.get("currentValue")]
+            return self.random.choice(values or attr["values"])
+        current = float(attr.get("currentValue") or 0)
+        return round(current + self.random.uniform(-1, 1), 1)
+
+    async def close(self) -> None:
+        if self._event_tasks:
+            _ = await asyncio.gather(*self._event_tasks, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+
+
+def get_attribute(device: dict[str, Any], name: str) -> dict[str, Any] | None:
+    for attr in device["attributes"]:
+        if attr["name"] == name:
+            return attr
+    return None
+
+
+def coerce(attr: dict[str, Any], value: str) -> Any:
+    """Convert a command argument to an attribute's data type."""
+    if attr.get("dataType") == "NUMBER":
+        try:
+            return float(value) if "." in value else int(value)
+        except ValueError:
+            pass
+    return value
+
+
+async def run(args: argparse.Namespace) -> dict[str, int]:
+    if args.seed_file:
+        devices, modes, hsm = load_devices(args.seed_file)
+    else:
+        devices, modes, hsm = make_devices(args.devices), DEFAULT_MODES, "disarmed"
+
+    hub = FakeHub(devices, modes, hsm, args)
+    runner = web.AppRunner(hub.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, args.host, args.port)
+    await site.start()
+    print(
+        f"Serving {len(devices)} devices at http://{args.host}:{args.port}"
+        + f"/apps/api/{args.app_id}",
+        file=sys.stderr,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    events = loop.create_task(hub.run_events(parse_script(args.events)))
+    await stop.wait()
+
+    _ = events.cancel()
+    await hub.close()
+    await runner.cleanup()
+    return dict(hub.stats)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a fake Hubitat Maker API")
+    parser.add_argument("--seed-file", help="JSON device dump to serve")
+    parser.add_argument("--devices", type=int, default=20, help="synthetic devices")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--app-id", default="1")
+    parser.add_argument("--token", default="fake-token")
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds")
+    parser.add_argument("--jitter", type=float, default=0, help="milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--timeout-rate", type=float, default=0)
+    parser.add_argument("--events", default="", help="RATE:SECONDS[,...]")
+    parser.add_argument("--repeat", action="store_true")
+    parser.add_argument("--event-url")
+    parser.add_argument("--random-seed", type=int)
+    args = parser.parse_args()
+
+    if args.seed_file and not os.path.exists(args.seed_file):
+        parser.error(f"{args.seed_file} does not exist")
+
+    stats = asyncio.run(run(args))
+    print(json.dumps(stats, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())